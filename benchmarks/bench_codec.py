@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+JSON decoding cost of the large list endpoints.
+
+Builds synthetic organizations.inventory and organizations.device_statuses
+bodies and times the previous path (bytes decoded to text, then json.loads,
+what requests' Response.json() does) against every installed codec, checking
+that each codec returns exactly the same objects.
+
+    python benchmarks/bench_codec.py [devices]
+'''
+
+from __future__ import print_function
+
+import sys
+import json
+import time
+
+from meraki.codec import CODECS
+
+
+MODELS = ['MR42', 'MR33', 'MS220-8P', 'MS225-48LP', 'MX84', 'MX250', 'MV12W']
+
+
+def inventory(devices):
+    return [{
+        'mac': '00:18:0a:{:02x}:{:02x}:{:02x}'.format(i >> 16 & 255, i >> 8 & 255, i & 255),
+        'serial': 'Q2XX-{:04X}-{:04X}'.format(i >> 16, i & 0xffff),
+        'networkId': 'N_{}'.format(646829496481090000 + i // 40),
+        'model': MODELS[i % len(MODELS)],
+        'claimedAt': 1518365681.0 + i,
+        'publicIp': '123.123.{}.{}'.format(i >> 8 & 255, i & 255),
+        'name': 'device {}'.format(i)
+    } for i in range(devices)]
+
+
+def device_statuses(devices):
+    return [{
+        'name': 'device {}'.format(i),
+        'serial': 'Q2XX-{:04X}-{:04X}'.format(i >> 16, i & 0xffff),
+        'mac': '00:18:0a:{:02x}:{:02x}:{:02x}'.format(i >> 16 & 255, i >> 8 & 255, i & 255),
+        'status': 'online' if i % 13 else 'offline',
+        'lanIp': '10.{}.{}.{}'.format(i >> 16 & 255, i >> 8 & 255, i & 255),
+        'publicIp': '123.123.{}.{}'.format(i >> 8 & 255, i & 255),
+        'networkId': 'N_{}'.format(646829496481090000 + i // 40),
+        'usingCellularFailover': False,
+        'wan1Ip': None
+    } for i in range(devices)]
+
+
+def timed(func, content, repeat=5):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+def main():
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    for name, payload in (('inventory', inventory(devices)), ('deviceStatuses', device_statuses(devices))):
+        content = json.dumps(payload).encode('utf8')
+        baseline, expected = timed(lambda body: json.loads(body.decode('utf8')), content)
+
+        print('{} {} devices, {:.1f} MB'.format(name, devices, len(content) / 1e6))
+        print('  {:<8} {:8.1f} ms'.format('text', baseline * 1e3))
+
+        for codec_name in sorted(CODECS):
+            if CODECS[codec_name] is None:
+                continue
+
+            codec = CODECS[codec_name]()
+            elapsed, result = timed(codec.loads, content)
+            print('  {:<8} {:8.1f} ms  x{:.1f}  identical={}'.format(codec_name, elapsed * 1e3, baseline / elapsed, result == expected))
+
+
+if __name__ == '__main__':
+    main()
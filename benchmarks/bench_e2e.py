@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+End-to-end workloads against the local stand-in server.
+
+Starts meraki.standin in its own process with a synthetic organization,
+then runs every workload in a fresh process so their peak memory does not
+mix, and reports for each: wall time, calls per second, p99 call latency
+(from a Metrics histogram, retries and rate limit waits included) and
+peak RSS.
+
+    crawl           organizations.crawl depth 3: networks, devices, uplinks
+    crawl-async     the same on an AsyncDashboard
+    census          organizations.client_census, clients of every device
+    index           organizations.index: inventory, statuses, devices per network
+    history         devices.loss_and_latency_range over 90 days of every device of a network
+    batch           one tag update per device through dash.batch
+
+Save a run with --save and compare a later one with --baseline; the
+comparison exits 1 when a workload loses more than --threshold of its calls
+per second or its p99 or peak memory grows by more than that.
+
+    python benchmarks/bench_e2e.py --networks 50 --devices 20 --latency 0.005 --save base.json
+    python benchmarks/bench_e2e.py --networks 50 --devices 20 --latency 0.005 --baseline base.json
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import subprocess
+
+from meraki import Dashboard, AsyncDashboard
+from meraki.metrics import Metrics
+
+
+WORKLOADS = ('crawl', 'crawl-async', 'census', 'index', 'history', 'batch')
+
+# fine enough for a percentile: 100 µs to ~60 s in steps of 10%
+BUCKETS = tuple(0.0001 * 1.1 ** i for i in range(140))
+
+
+def percentile(metrics, q):
+    '''
+    Upper bound of the bucket holding the q quantile of every call
+    '''
+    counts = [0] * (len(metrics.buckets) + 1)
+
+    for endpoint in metrics.as_dict().values():
+        counts = [a + b for a, b in zip(counts, endpoint['durations'])]
+
+    total = sum(counts)
+    seen = 0
+
+    for bound, count in zip(metrics.buckets + (float('inf'),), counts):
+        seen += count
+
+        if total and seen >= q * total:
+            return bound
+
+    return 0.0
+
+
+def crawl(dash, org, workers):
+    for task in dash.organizations.crawl(org, depth=3, workers=workers):
+        pass
+
+
+async def crawl_async(dash, org, workers):
+    async for task in dash.organizations.crawl(org, depth=3, workers=workers):
+        pass
+
+
+def census(dash, org, workers):
+    dash.organizations.client_census(org, workers=workers)
+
+
+def index(dash, org, workers):
+    dash.organizations.index(org, workers=workers)
+
+
+def history(dash, org, workers):
+    network = dash.organizations.networks(org)[0]['id']
+    devices = [(network, device['serial']) for device in dash.networks.devices.list(network)]
+    now = int(time.time())
+
+    dash.networks.devices.loss_and_latency_range(devices, now - 90 * 86400, now, resolution=600, ip='8.8.8.8', workers=workers, as_arrays=True)
+
+
+def batch(dash, org, workers):
+    with dash.batch(org, interval=0.1) as writes:
+        for network in dash.organizations.networks(org):
+            for device in dash.networks.devices.list(network['id']):
+                writes.networks.devices.update(network['id'], device['serial'], update={'tags': 'bench'})
+
+    if not writes.result.ok:
+        raise RuntimeError(repr(writes.result))
+
+
+def run(workload, url, org, workers, rate_limit):
+    '''
+    One workload in this process, its figures as a dict
+    '''
+    metrics = Metrics(BUCKETS)
+    asynchronous = workload.endswith('-async')
+    func = globals()[workload.replace('-', '_')]
+    kwargs = dict(base_url=url, rate_limit=rate_limit, metrics=metrics)
+
+    start = time.perf_counter()
+
+    if asynchronous:
+        async def main():
+            async with AsyncDashboard('bench', **kwargs) as dash:
+                await func(dash, org, workers)
+
+        asyncio.run(main())
+    else:
+        dash = Dashboard('bench', **kwargs)
+
+        try:
+            func(dash, org, workers)
+        finally:
+            dash.close()
+
+    elapsed = time.perf_counter() - start
+    endpoints = metrics.as_dict().values()
+    calls = sum(endpoint['requests'] for endpoint in endpoints)
+
+    return {
+        'seconds': elapsed,
+        'calls': calls,
+        'calls_per_second': calls / elapsed,
+        'p99': percentile(metrics, 0.99),
+        'errors': sum(sum(endpoint['errors'].values()) for endpoint in endpoints),
+        'throttled': sum(endpoint['throttled'] for endpoint in endpoints),
+        # kilobytes on Linux, bytes on macOS
+        'peak_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 ** 2 if sys.platform == 'darwin' else 1024.0)
+    }
+
+
+def standin(args):
+    command = [
+        sys.executable, '-m', 'meraki.standin',
+        '--networks', str(args.networks),
+        '--devices', str(args.devices),
+        '--clients', str(args.clients),
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--shards', str(args.shards),
+        '--batch-delay', '0.2'
+    ]
+
+    if args.rate:
+        command += ['--rate', str(args.rate)]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True)
+    # meraki stand-in listening on <url> with organizations <id>
+    words = process.stdout.readline().split()
+
+    return process, words[4], words[-1]
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+
+    for workload, result in results.items():
+        base = baseline.get(workload)
+
+        if base is None:
+            continue
+
+        if result['calls_per_second'] < base['calls_per_second'] * (1 - threshold):
+            regressions.append('{}: {:.0f} calls/s, was {:.0f}'.format(workload, result['calls_per_second'], base['calls_per_second']))
+
+        if result['p99'] > base['p99'] * (1 + threshold):
+            regressions.append('{}: p99 {:.1f} ms, was {:.1f} ms'.format(workload, result['p99'] * 1000, base['p99'] * 1000))
+
+        if result['peak_mb'] > base['peak_mb'] * (1 + threshold):
+            regressions.append('{}: peak {:.1f} MB, was {:.1f} MB'.format(workload, result['peak_mb'], base['peak_mb']))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('workloads', nargs='*', default=WORKLOADS, help=', '.join(WORKLOADS))
+    parser.add_argument('--networks', type=int, default=50)
+    parser.add_argument('--devices', type=int, default=20, help='devices per network')
+    parser.add_argument('--clients', type=int, default=20, help='clients per device')
+    parser.add_argument('--latency', type=float, default=0.005, help='seconds the stand-in adds to every response')
+    parser.add_argument('--jitter', type=float, default=0.005)
+    parser.add_argument('--shards', type=int, default=1)
+    parser.add_argument('--rate', type=float, default=None, help='stand-in and client requests per second per organization, default unlimited')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare with the results saved in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.2, help='tolerated regression, 0.2 is 20%%')
+    parser.add_argument('--run', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--org', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    unknown = set(args.workloads) - set(WORKLOADS)
+
+    if unknown:
+        parser.error('unknown workloads: {}'.format(', '.join(sorted(unknown))))
+
+    if args.run:
+        # child process of a single workload
+        print(json.dumps(run(args.run, args.url, args.org, args.workers, args.rate)))
+        return
+
+    process, url, org = standin(args)
+    results = {}
+
+    print('{} networks x {} devices x {} clients, {:.0f} ms latency, {} shards, rate {}'.format(
+        args.networks, args.devices, args.clients, args.latency * 1000, args.shards, args.rate or 'unlimited'))
+    print('{:<14}{:>10}{:>8}{:>10}{:>10}{:>10}{:>8}'.format('workload', 'seconds', 'calls', 'calls/s', 'p99 ms', 'peak MB', '429s'))
+
+    try:
+        for workload in args.workloads:
+            output = subprocess.check_output([
+                sys.executable, os.path.abspath(__file__),
+                '--run', workload, '--url', url, '--org', org, '--workers', str(args.workers)
+            ] + (['--rate', str(args.rate)] if args.rate else []), universal_newlines=True)
+
+            result = results[workload] = json.loads(output)
+            print('{:<14}{:>10.2f}{:>8}{:>10.0f}{:>10.1f}{:>10.1f}{:>8}'.format(
+                workload, result['seconds'], result['calls'], result['calls_per_second'], result['p99'] * 1000, result['peak_mb'], result['throttled']))
+    finally:
+        process.terminate()
+        process.wait()
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+        for regression in regressions:
+            print('REGRESSION', regression)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
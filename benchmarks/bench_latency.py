@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Merging client latency histograms in Python loops and with LatencyReport.
+
+Builds latencyHistory responses for a number of clients (one day of 5 minute
+samples, four traffic categories) and computes the per-category p50/p95/p99
+overall, per network and per sample start, once summing the bucket dicts in
+Python and once through LatencyHistory series merged by LatencyReport.
+
+    python benchmarks/bench_latency.py [clients] [networks]
+'''
+
+from __future__ import print_function
+
+import sys
+import time
+import random
+
+from meraki.series import LatencyHistory
+from meraki.latency import LatencyReport
+
+
+BINS = ['0.5', '1.0', '2.0', '4.0', '8.0', '16.0', '32.0', '64.0', '128.0', '256.0', '512.0', '1024.0', '2048.0']
+CATEGORIES = ['backgroundTraffic', 'bestEffortTraffic', 'videoTraffic', 'voiceTraffic']
+SAMPLES = 288
+
+
+def history(seed):
+    rand = random.Random(seed)
+    return [{
+        't0': 1521072000 + 300 * i,
+        't1': 1521072300 + 300 * i,
+        'latencyBinsByCategory': {category: {label: rand.randint(0, 50) >> j for j, label in enumerate(BINS)} for category in CATEGORIES}
+    } for i in range(SAMPLES)]
+
+
+def percentiles(total):
+    packets = sum(total.values())
+    result = {}
+
+    for level in (50, 95, 99):
+        running = 0
+        for label in sorted(total, key=float):
+            running += total[label]
+            if running >= packets * level / 100.0:
+                result[level] = float(label)
+                break
+
+    return result
+
+
+def with_loops(histories, networks):
+    overall = {}
+    by_network = {}
+    by_time = {}
+
+    for i, samples in enumerate(histories):
+        network = by_network.setdefault(i % networks, {})
+
+        for sample in samples:
+            at = by_time.setdefault(sample['t0'], {})
+
+            for category, bins in sample['latencyBinsByCategory'].items():
+                for total in (overall.setdefault(category, {}), network.setdefault(category, {}), at.setdefault(category, {})):
+                    for label, count in bins.items():
+                        total[label] = total.get(label, 0) + count
+
+    return (
+        {category: percentiles(total) for category, total in overall.items()},
+        {network: {category: percentiles(total) for category, total in totals.items()} for network, totals in by_network.items()},
+        {t0: {category: percentiles(total) for category, total in totals.items()} for t0, totals in by_time.items()}
+    )
+
+
+def with_arrays(series, networks):
+    report = LatencyReport()
+
+    for i, history in enumerate(series):
+        report.add(i % networks, history)
+
+    return report.percentiles(), report.by_network(), {category: report.timeline(category) for category in CATEGORIES}
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    networks = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    histories = [history(seed) for seed in range(clients)]
+
+    start = time.perf_counter()
+    loops = with_loops(histories, networks)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    series = [LatencyHistory.from_samples(samples) for samples in histories]
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    arrays = with_arrays(series, networks)
+    merge = time.perf_counter() - start
+
+    print('{} clients in {} networks, {} samples x {} categories each'.format(clients, networks, SAMPLES, len(CATEGORIES)))
+    print('  python loops   {:8.1f} ms'.format(elapsed * 1e3))
+    print('  LatencyReport  {:8.1f} ms  ({:.1f} ms as_arrays decoding, {:.1f} ms merge and percentiles)  same: {}'.format(
+        (build + merge) * 1e3, build * 1e3, merge * 1e3, loops[:2] == arrays[:2]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Cost of recording calls in a Metrics registry and of rendering it.
+
+Records calls spread over a number of endpoints from several threads, as a
+busy client would, and reports the time per recorded call next to the
+time to render the Prometheus text.
+
+    python benchmarks/bench_metrics.py [calls] [endpoints] [threads]
+'''
+
+from __future__ import print_function
+
+import sys
+import time
+import random
+import threading
+
+from meraki.metrics import Metrics
+
+
+def record(metrics, names, calls, seed):
+    rand = random.Random(seed)
+
+    for i in range(calls):
+        name = names[i % len(names)]
+        metrics.observe(name, 'GET', status=200 if i % 50 else 429, seconds=rand.random() * 0.5, size=4096, retries=i % 50 == 0, waited=0.001)
+        metrics.decoded(name, 'GET', 0.0002)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    endpoints = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    names = ['networks.endpoint{}'.format(i) for i in range(endpoints)]
+    metrics = Metrics()
+    workers = [threading.Thread(target=record, args=(metrics, names, calls // threads, i)) for i in range(threads)]
+
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text = metrics.prometheus()
+    render = time.perf_counter() - start
+
+    print('{} calls, {} endpoints, {} threads'.format(calls, endpoints, threads))
+    print('  record  {:6.2f} us per call (observe + decoded)'.format(elapsed / calls * 1e6))
+    print('  render  {:6.1f} ms, {} lines, {:.0f} KB'.format(render * 1000, text.count('\n'), len(text) / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
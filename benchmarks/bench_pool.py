@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Connection reuse benchmark.
+
+Runs the same `networks.devices.list` loop against a local keep-alive HTTP
+server, once building endpoint objects per call (the pre-pool behaviour) and
+once through a single Dashboard, and reports calls/sec and the number of
+TCP connections the server accepted.
+
+    python benchmarks/bench_pool.py [calls] [threads]
+'''
+
+from __future__ import print_function
+
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    sys.exit('python 3.7+ required')
+
+from meraki import Dashboard
+from meraki.modules.networks import Networks
+from meraki.transport import Transport
+
+
+BODY = json.dumps([{'serial': 'Q2XX-XXXX-XXXX', 'model': 'MR42'}]).encode('utf8')
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(server, label, call, calls, threads):
+    server.connections = 0
+    start = time.time()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda i: call(), range(calls)))
+    elapsed = time.time() - start
+    print('{:<12} {:>6} calls {:>8.0f} calls/s {:>6} connections'.format(
+        label, calls, calls / elapsed, server.connections))
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    server = serve()
+    base_url = 'http://127.0.0.1:{}/api/v0'.format(server.server_address[1])
+
+    def unpooled():
+        # every attribute access used to build new endpoint objects and sessions
+        transport = Transport('bench', base_url=base_url, rate_limit=None)
+        try:
+            return Networks('bench', transport=transport).devices.list('N_1')
+        finally:
+            transport.close()
+
+    dash = Dashboard('bench', base_url=base_url, pool_size=threads, rate_limit=None)
+
+    def pooled():
+        return dash.networks.devices.list('N_1')
+
+    run(server, 'unpooled', unpooled, calls, threads)
+    run(server, 'pooled', pooled, calls, threads)
+
+    dash.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
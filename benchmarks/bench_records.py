@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Memory held by the large list endpoints as plain dicts and as records.
+
+Decodes synthetic inventory, deviceStatuses, device clients and network
+bodies, keeps either the dicts or the records built from them, and reports
+the retained Python heap measured by tracemalloc along with build time.
+
+    python benchmarks/bench_records.py [objects]
+'''
+
+from __future__ import print_function
+
+import gc
+import sys
+import json
+import time
+import tracemalloc
+
+from bench_codec import inventory, device_statuses
+from meraki.codec import get_codec
+from meraki.records import Device, DeviceStatus, Client, Network
+
+
+def clients(count):
+    return [{
+        'id': 'k{:06x}'.format(i),
+        'mac': 'f0:18:98:{:02x}:{:02x}:{:02x}'.format(i >> 16 & 255, i >> 8 & 255, i & 255),
+        'description': 'laptop-{}'.format(i),
+        'mdnsName': None,
+        'dhcpHostname': 'laptop-{}'.format(i),
+        'ip': '10.0.{}.{}'.format(i >> 8 & 255, i & 255),
+        'vlan': 10 + i % 4,
+        'switchport': str(1 + i % 48),
+        'usage': {'sent': 1024.5 + i, 'recv': 4096.25 + i}
+    } for i in range(count)]
+
+
+def networks(count):
+    return [{
+        'id': 'N_{}'.format(646829496481090000 + i),
+        'organizationId': '549236',
+        'name': 'site {}'.format(i),
+        'timeZone': 'America/Los_Angeles',
+        'tags': ' branch ',
+        'type': 'combined',
+        'productTypes': ['appliance', 'switch', 'wireless'],
+        'disableMyMerakiCom': False,
+        'disableRemoteStatusPage': True
+    } for i in range(count)]
+
+
+def retained(build):
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    # measured apart, tracemalloc slows every allocation down
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    codec = get_codec()
+
+    for name, payload, record in (
+            ('inventory', inventory(count), Device),
+            ('deviceStatuses', device_statuses(count), DeviceStatus),
+            ('clients', clients(count), Client),
+            ('networks', networks(count), Network)):
+        content = json.dumps(payload).encode('utf8')
+        del payload
+
+        dicts, dict_time = retained(lambda: codec.loads(content))
+        records, record_time = retained(lambda: record.wrap(codec.loads(content)))
+
+        print('{:<15} {} objects  dicts {:7.1f} MB  records {:7.1f} MB  {:4.0f}% saved  build +{:.0f} ms'.format(
+            name, count, dicts / 1e6, records / 1e6, 100.0 * (dicts - records) / dicts, (record_time - dict_time) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
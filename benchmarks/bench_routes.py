@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Per-call URL building overhead: the old '/'.join + format path assembly
+against the precompiled route table, for a URL built again (served from
+the route's URL cache) and for a new serial on every call (cache misses).
+
+    python benchmarks/bench_routes.py [calls]
+'''
+
+from __future__ import print_function
+
+import sys
+import timeit
+import itertools
+
+from meraki.transport import BASE_URL
+from meraki.modules.devices import LOSS_AND_LATENCY, DEVICE
+
+
+def bulid_url(*args):
+    # Base._bulid_url before the route table
+    url = '{}/{}'.format(BASE_URL, args[0])
+
+    if len(args) > 1:
+        extra = '/'.join(args[1:])
+        url = '{}/{}'.format(url, extra)
+
+    return url
+
+
+def build_querystring(url, **kwargs):
+    # Base._build_querystring before the route table, no percent-encoding
+    if not len(kwargs):
+        return url
+
+    args = []
+    for key in kwargs['parms']:
+        args.append('{}={}'.format(key, kwargs['parms'][key]))
+
+    return '{}?{}'.format(url, '&'.join(args))
+
+
+PARMS = {'resolution': 60, 'uplink': 'wan1', 'ip': '8.8.8.8', 'timespan': 7200}
+
+serials = itertools.count()
+
+
+def serial():
+    return 'Q2XX-{:04X}-{:04X}'.format(*divmod(next(serials) % 2 ** 32, 65536))
+
+
+CASES = [
+    (
+        'device, new',
+        lambda: build_querystring(bulid_url('networks', 'N_1234', 'devices', serial())),
+        lambda: DEVICE.url(BASE_URL, ('N_1234', serial()))
+    ),
+    (
+        'device',
+        lambda: build_querystring(bulid_url('networks', 'N_1234', 'devices', 'Q2XX-AAAA-BBBB')),
+        lambda: DEVICE.url(BASE_URL, ('N_1234', 'Q2XX-AAAA-BBBB'))
+    ),
+    (
+        'lossAndLatency',
+        lambda: build_querystring(bulid_url('networks', 'N_1234', 'devices', 'Q2XX-AAAA-BBBB', 'lossAndLatencyHistory'), parms=PARMS),
+        lambda: LOSS_AND_LATENCY.url(BASE_URL, ('N_1234', 'Q2XX-AAAA-BBBB'), PARMS)
+    )
+]
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    for name, old, new in CASES:
+        before = min(timeit.repeat(old, number=calls, repeat=3)) / calls * 1e6
+        after = min(timeit.repeat(new, number=calls, repeat=3)) / calls * 1e6
+        print('{:<16} join+format {:6.2f} us   route {:6.2f} us'.format(name, before, after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Loss and latency history as per-sample dicts and as NumPy columns.
+
+Decodes 30 days of 60 s lossAndLatencyHistory samples for a number of
+uplinks, keeps them as dicts or as LossAndLatency series, and reports the
+retained memory and the time to compute mean loss and p95 latency of
+every uplink.
+
+    python benchmarks/bench_series.py [uplinks]
+'''
+
+from __future__ import print_function
+
+import gc
+import sys
+import json
+import time
+import datetime
+import tracemalloc
+
+import numpy
+
+from meraki.codec import get_codec
+from meraki.series import LossAndLatency
+
+
+SAMPLES = 30 * 24 * 60
+
+
+def history(seed):
+    start = datetime.datetime(2019, 1, 1)
+    return [{
+        'startTs': (start + datetime.timedelta(minutes=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'endTs': (start + datetime.timedelta(minutes=i + 1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'lossPercent': None if (i + seed) % 97 == 0 else float((i * seed) % 5),
+        'latencyMs': None if (i + seed) % 89 == 0 else 15.0 + (i * 7 + seed) % 40
+    } for i in range(SAMPLES)]
+
+
+def with_dicts(bodies, codec):
+    uplinks = [codec.loads(body) for body in bodies]
+    stats = []
+
+    for samples in uplinks:
+        loss = [s['lossPercent'] for s in samples if s['lossPercent'] is not None]
+        latency = sorted(s['latencyMs'] for s in samples if s['latencyMs'] is not None)
+        stats.append((sum(loss) / len(loss), latency[int(0.95 * (len(latency) - 1))]))
+
+    return uplinks, stats
+
+
+def with_arrays(bodies, codec):
+    uplinks = [LossAndLatency.wrap(codec.loads(body)) for body in bodies]
+    stats = [(numpy.nanmean(s.loss_percent), numpy.nanpercentile(s.latency_ms, 95, method='lower')) for s in uplinks]
+
+    return uplinks, stats
+
+
+def measure(func, bodies, codec):
+    start = time.perf_counter()
+    func(bodies, codec)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    uplinks, stats = func(bodies, codec)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size, elapsed, stats
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    codec = get_codec()
+    bodies = [json.dumps(history(seed)).encode('utf8') for seed in range(1, count + 1)]
+
+    dicts = measure(with_dicts, bodies, codec)
+    arrays = measure(with_arrays, bodies, codec)
+
+    print('{} uplinks x {} samples'.format(count, SAMPLES))
+    print('  dicts   {:8.1f} MB retained  {:8.1f} ms'.format(dicts[0] / 1e6, dicts[1] * 1e3))
+    print('  arrays  {:8.1f} MB retained  {:8.1f} ms  same results: {}'.format(
+        arrays[0] / 1e6, arrays[1] * 1e3, numpy.allclose(dicts[2], arrays[2])))
+
+
+if __name__ == '__main__':
+    main()
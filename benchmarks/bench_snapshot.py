@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Cold start and warm start of a service loading an organization.
+
+A local server answers organizations, networks, inventory and the device
+list of every network after an artificial delay, with ETags. The "service"
+loads all of it; once with an empty SnapshotStore (cold), then again from a
+new Dashboard on the same snapshot file (warm), which answers from disk and
+revalidates in the background. Reports both times, the background
+revalidation time and the snapshot size with and without compression.
+
+    python benchmarks/bench_snapshot.py [networks] [devices per network] [delay ms]
+'''
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    sys.exit('requires python 3.7+')
+
+from bench_codec import inventory
+from meraki import Dashboard
+from meraki.snapshot import SnapshotStore
+
+
+def organization(networks, per_network):
+    devices = inventory(networks * per_network)
+    ids = ['N_{}'.format(646829496481090000 + i) for i in range(networks)]
+
+    for i, device in enumerate(devices):
+        device['networkId'] = ids[i % networks]
+
+    bodies = {
+        'organizations': [{'id': '549236', 'name': 'bench'}],
+        'organizations/549236/networks': [{'id': id, 'organizationId': '549236', 'name': 'site {}'.format(i)} for i, id in enumerate(ids)],
+        'organizations/549236/inventory': devices
+    }
+
+    for id in ids:
+        bodies['networks/{}/devices'.format(id)] = [dict(device, tags=' branch ') for device in devices if device['networkId'] == id]
+
+    return dict((path, json.dumps(body).encode('utf8')) for path, body in bodies.items())
+
+
+def serve(bodies, delay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay)
+            body = bodies.get(self.path.split('?')[0][len('/api/v0/'):])
+
+            if body is None:
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    return server, 'http://127.0.0.1:{}/api/v0'.format(server.server_address[1])
+
+
+def load(dash):
+    orgs = dash.organizations.list()
+    networks = dash.organizations.networks(orgs[0]['id'])
+    devices = dash.organizations.inventory(orgs[0]['id'])
+
+    for network in networks:
+        dash.devices.list(network['id'])
+
+    return len(networks), len(devices)
+
+
+def start(url, path, compress, refresh):
+    snapshot = SnapshotStore(path, compress=compress, refresh=refresh)
+    dash = Dashboard('bench', base_url=url, rate_limit=None, snapshot=snapshot)
+
+    begin = time.perf_counter()
+    networks, devices = load(dash)
+    elapsed = time.perf_counter() - begin
+
+    # closing waits for the background revalidations
+    dash.close()
+    settled = time.perf_counter() - begin
+    snapshot.close()
+
+    return elapsed, settled, networks, devices
+
+
+def main():
+    networks = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_network = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    delay = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.05
+
+    server, url = serve(organization(networks, per_network), delay)
+    directory = tempfile.mkdtemp()
+
+    print('{} networks, {} devices, {:.0f} ms per request'.format(networks, networks * per_network, delay * 1000))
+
+    for compress in (False, True):
+        path = os.path.join(directory, 'snapshot-{}.db'.format('zlib' if compress else 'raw'))
+        cold, _, found, devices = start(url, path, compress, 0)
+        # refresh=0: every entry served is revalidated, the worst case for a restart
+        warm, settled, _, _ = start(url, path, compress, 0)
+
+        print('  {:4}  cold {:7.3f}s  warm {:7.3f}s  ({:.0f}x)  revalidated after {:7.3f}s  snapshot {:8.1f} KB'.format(
+            'zlib' if compress else 'raw', cold, warm, cold / warm, settled, os.path.getsize(path) / 1024.0
+        ))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Peak memory of organizations.inventory against iter_inventory.
+
+Serves a synthetic inventory from a local HTTP server and walks it once with
+the buffered call and once streamed, reporting the Python heap peak measured
+by tracemalloc and the time until the first device is available.
+
+    python benchmarks/bench_streaming.py [devices]
+'''
+
+from __future__ import print_function
+
+import sys
+import json
+import time
+import threading
+import tracemalloc
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    sys.exit('python 3.7+ required')
+
+from meraki import Dashboard
+
+
+def inventory(devices):
+    return [{
+        'mac': '00:18:0a:{:02x}:{:02x}:{:02x}'.format(i >> 16 & 255, i >> 8 & 255, i & 255),
+        'serial': 'Q2XX-{:04X}-{:04X}'.format(i >> 16, i & 0xffff),
+        'networkId': 'N_{}'.format(646829496481090000 + i // 40),
+        'model': 'MR42',
+        'claimedAt': 1518365681.0 + i,
+        'publicIp': '123.123.{}.{}'.format(i >> 8 & 255, i & 255),
+        'name': 'device {}'.format(i)
+    } for i in range(devices)]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = self.server.body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        for pos in range(0, len(body), 1 << 16):
+            self.wfile.write(body[pos:pos + (1 << 16)])
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(body):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.body = body
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def walk(items):
+    start = time.perf_counter()
+    first = None
+    count = 0
+
+    for item in items():
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+
+    return count, first, time.perf_counter() - start
+
+
+def run(label, items):
+    count, first, elapsed = walk(items)
+
+    # a second pass under tracemalloc, which slows allocations down too much to time the first
+    tracemalloc.start()
+    walk(items)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print('{:<10} {:>7} devices  peak {:>7.1f} MB  first item {:>7.1f} ms  total {:>7.1f} ms'.format(
+        label, count, peak / 1e6, first * 1e3, elapsed * 1e3))
+
+
+def main():
+    devices = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    # the server's copy of the body is built before tracing starts
+    server = serve(json.dumps(inventory(devices)).encode('utf8'))
+    dash = Dashboard('bench', base_url='http://127.0.0.1:{}/api/v0'.format(server.server_address[1]), rate_limit=None)
+
+    run('buffered', lambda: dash.organizations.inventory('1'))
+    run('streamed', lambda: dash.organizations.iter_inventory('1'))
+
+    dash.close()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
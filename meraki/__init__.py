@@ -1,5 +1,5 @@
 
 from meraki.exceptions import *
-from meraki.dashboard import Dashboard
+from meraki.dashboard import Dashboard, AsyncDashboard
 
 __all__ = ['dashboard', 'exceptions']
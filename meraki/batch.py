@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import asyncio
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+from meraki.exceptions import APIError
+from meraki.concurrency import failed
+from meraki.modules.networks import Networks
+from meraki.modules.organizations import Organizations
+
+
+OPERATIONS = {
+    'PUT': 'update',
+    'POST': 'create',
+    'DELETE': 'destroy'
+}
+
+# POST endpoints that act on the parent resource instead of creating a child
+VERBS = frozenset(['claim', 'remove', 'bind', 'unbind', 'provision', 'clone'])
+
+
+class RecordingTransport(object):
+    '''
+    Stands in for a Transport and turns every write into an action batch action
+    instead of sending it. Reads are not allowed while recording.
+    '''
+    asynchronous = False
+
+    def __init__(self, base_url, codec):
+        self.base_url = base_url
+        self.codec = codec
+        self.actions = []
+
+        self._base_path = urlsplit(base_url).path.rstrip('/')
+
+    def request(self, method, url, data=None, priority=None, ttl=None, name=None, record=None):
+        if method not in OPERATIONS:
+            raise APIError('only writes can be recorded in an action batch, got {} {}'.format(method, url))
+
+        segments = urlsplit(url).path[len(self._base_path):].strip('/').split('/')
+        operation = OPERATIONS[method]
+
+        if method == 'POST' and segments[-1] in VERBS:
+            operation = segments.pop()
+
+        action = {
+            'resource': '/' + '/'.join(segments),
+            'operation': operation
+        }
+
+        if data is not None:
+            action['body'] = self.codec.loads(data)
+
+        self.actions.append(action)
+
+
+class BatchResult(object):
+    '''
+    Aggregated outcome of every action batch submitted for one ActionBatch
+    '''
+    def __init__(self):
+        self.batches = []
+        self.actions = 0
+        self.completed = 0
+        self.failed = 0
+        self.errors = []
+        # ids of the batches still running when the timeout ran out
+        self.pending = []
+        # actions not submitted before the timeout, kept in the ActionBatch
+        self.unsent = 0
+
+    @property
+    def ok(self):
+        return self.failed == 0 and not self.errors and not self.pending and not self.unsent
+
+    def add(self, size, batch):
+        self.batches.append(batch)
+        self.actions += size
+
+        status = batch.get('status', {}) if isinstance(batch, dict) else {}
+
+        if failed(batch):
+            self.failed += 1
+            self.errors.append(batch)
+        elif status.get('failed'):
+            self.failed += 1
+            self.errors.extend(status.get('errors') or [])
+        elif status.get('completed'):
+            self.completed += 1
+
+    def __repr__(self):
+        return '<BatchResult {} actions in {} batches, {} completed, {} failed, {} pending>'.format(
+            self.actions, len(self.batches) + len(self.pending), self.completed, self.failed, len(self.pending))
+
+
+class ActionBatch(object):
+    '''
+    Record writes made through `networks` and `organizations` without sending
+    them, then submit them as organization action batches of up to `size`
+    actions each and wait for all of them to finish.
+
+        with dash.batch(<orgId>) as batch:
+            for serial in serials:
+                batch.networks.devices.update(<networkId>, serial, update={'tags': 'lobby'})
+
+        print(batch.result)
+
+    Once the batches are done, what the cache and the snapshot hold for the
+    written resources is dropped, as for direct writes. Batches still running
+    after `timeout` are left running and listed in the result's `pending`;
+    actions not submitted by then stay recorded for another submit(). On an
+    AsyncDashboard use `async with`.
+
+    PARAMETERS
+        size:           Actions per action batch, 100 at most
+        concurrency:    Action batches running at the same time, the Dashboard allows 5 per organization
+        interval:       Seconds between status polls
+        timeout:        Seconds to wait for all batches before giving up
+    '''
+    def __init__(self, api_key, transport, org, size=100, concurrency=5, interval=2.0, timeout=600.0):
+        self.org = org
+        self.size = min(size, 100)
+        self.concurrency = concurrency
+        self.interval = interval
+        self.timeout = timeout
+        self.result = None
+
+        self._transport = transport
+        self._recorder = RecordingTransport(transport.base_url, transport.codec)
+        self._url = '{}/organizations/{}/actionBatches'.format(transport.base_url, org)
+
+        self.networks = Networks(api_key, transport=self._recorder)
+        self.organizations = Organizations(api_key, transport=self._recorder)
+
+    @property
+    def actions(self):
+        return self._recorder.actions
+
+    def __len__(self):
+        return len(self._recorder.actions)
+
+    def __enter__(self):
+        if self._transport.asynchronous:
+            raise APIError('use async with to record an action batch on an AsyncDashboard')
+
+        return self
+
+    def __exit__(self, kind, value, traceback):
+        if kind is None:
+            self.submit()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, kind, value, traceback):
+        if kind is None:
+            await self.submit()
+
+    def _chunks(self):
+        actions = self._recorder.actions
+        return [actions[i:i + self.size] for i in range(0, len(actions), self.size)]
+
+    def _payload(self, actions):
+        return self._transport.codec.dumps({
+            'confirmed': True,
+            'synchronous': False,
+            'actions': actions
+        })
+
+    def _done(self, batch):
+        if not isinstance(batch, dict) or failed(batch):
+            return True
+
+        status = batch.get('status', {})
+        return bool(status.get('completed') or status.get('failed'))
+
+    def _submitted(self, result, running, chunk, batch):
+        # a batch without an id cannot be polled, count it as failed
+        if self._done(batch) or 'id' not in batch:
+            result.add(len(chunk), batch if self._done(batch) else {'status': None, 'reason': 'no action batch id in {!r}'.format(batch)})
+        else:
+            running[batch['id']] = len(chunk)
+
+    def _finish(self, result, running, chunks):
+        '''
+        Record the batches still running, drop the cached reads of every
+        resource written and keep only the actions never submitted
+        '''
+        unsent = [action for chunk in chunks for action in chunk]
+        sent = self._recorder.actions[:len(self._recorder.actions) - len(unsent)]
+
+        for path in set(action['resource'] for action in sent):
+            self._transport.invalidate(path)
+
+        result.pending = list(running)
+        result.actions += sum(running.values())
+        result.unsent = len(unsent)
+
+        self._recorder.actions = unsent
+        self.result = result
+        return result
+
+    def submit(self):
+        '''
+        Send the recorded actions, returns a BatchResult (awaitable on an AsyncDashboard)
+        '''
+        if self._transport.asynchronous:
+            return self._asubmit()
+
+        chunks = self._chunks()
+        result = BatchResult()
+        running = {}
+        deadline = time.monotonic() + self.timeout
+
+        while chunks or running:
+            while chunks and len(running) < self.concurrency:
+                chunk = chunks.pop(0)
+                self._submitted(result, running, chunk, self._transport.request('POST', self._url, data=self._payload(chunk)))
+
+            if not running:
+                continue
+
+            if time.monotonic() > deadline:
+                break
+
+            time.sleep(self.interval)
+
+            for id in list(running):
+                batch = self._transport.request('GET', '{}/{}'.format(self._url, id))
+
+                if self._done(batch):
+                    result.add(running.pop(id), batch)
+
+        return self._finish(result, running, chunks)
+
+    async def _asubmit(self):
+        chunks = self._chunks()
+        result = BatchResult()
+        running = {}
+        deadline = time.monotonic() + self.timeout
+
+        while chunks or running:
+            while chunks and len(running) < self.concurrency:
+                chunk = chunks.pop(0)
+                self._submitted(result, running, chunk, await self._transport.request('POST', self._url, data=self._payload(chunk)))
+
+            if not running:
+                continue
+
+            if time.monotonic() > deadline:
+                break
+
+            await asyncio.sleep(self.interval)
+
+            for id in list(running):
+                batch = await self._transport.request('GET', '{}/{}'.format(self._url, id))
+
+                if self._done(batch):
+                    result.add(running.pop(id), batch)
+
+        return self._finish(result, running, chunks)
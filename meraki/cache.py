@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import threading
+from collections import OrderedDict
+
+
+MISS = object()
+
+
+class CacheStats(object):
+    __slots__ = ('hits', 'misses', 'stores', 'evictions', 'expirations', 'invalidations')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class ResponseCache(object):
+    '''
+    In-process TTL + LRU cache of decoded GET responses, keyed on URL and query string.
+
+    Endpoint methods declare a default TTL for the reads that rarely change,
+    everything else is not cached. PUT, POST and DELETE drop every entry on the
+    written path, its parents and its children.
+
+    Cached objects are shared between callers, do not modify them in place.
+
+    PARAMETERS
+        max_entries:    Maximum number of cached responses
+        max_bytes:      Maximum size of the cached response bodies
+        ttls:           Override TTLs by endpoint name, e.g. {'organizations.inventory': 60}. 0 disables caching
+    '''
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, ttls=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self.stats = CacheStats()
+        self.size = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._paths = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, name, default):
+        return self.ttls.get(name, default)
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is None:
+                self.stats.misses += 1
+                return MISS
+
+            if entry[0] < time.monotonic():
+                self._drop(url)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return MISS
+
+            self._entries.move_to_end(url)
+            self.stats.hits += 1
+
+            return entry[3]
+
+    def put(self, url, path, value, size, ttl):
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if url in self._entries:
+                self._drop(url)
+
+            self._entries[url] = (time.monotonic() + ttl, path, size, value)
+            self._paths.setdefault(path, set()).add(url)
+            self.size += size
+            self.stats.stores += 1
+
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, path, extra=()):
+        '''
+        Drop the cached responses for path, its parents, its children and any extra paths
+        '''
+        with self._lock:
+            prefix = path + '/'
+            stale = [
+                key for key in self._paths
+                if key == path or key.startswith(prefix) or path.startswith(key + '/') or key in extra
+            ]
+
+            for key in stale:
+                for url in list(self._paths.get(key, ())):
+                    self._drop(url)
+                    self.stats.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._paths.clear()
+            self.size = 0
+
+    def _drop(self, url):
+        expires, path, size, value = self._entries.pop(url)
+        self.size -= size
+
+        urls = self._paths[path]
+        urls.discard(url)
+
+        if not urls:
+            del self._paths[path]
+
+
+class ConditionalStats(object):
+    __slots__ = ('requests', 'not_modified', 'bytes_saved', 'parse_seconds_saved')
+
+    def __init__(self):
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self.parse_seconds_saved = 0.0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class ConditionalCache(object):
+    '''
+    Validators (ETag / Last-Modified) and decoded bodies of previous GET responses.
+
+    Later GETs for the same URL are sent with If-None-Match / If-Modified-Since,
+    a 304 answer hands back the previously decoded object without downloading
+    or parsing the body again. Returned objects are shared, do not modify them.
+
+    PARAMETERS
+        max_entries:    Maximum number of URLs remembered, least recently used go first
+    '''
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.stats = ConditionalStats()
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def headers(self, url):
+        '''
+        Conditional request headers for url, None when nothing is stored
+        '''
+        entry = self._entries.get(url)
+
+        if entry is None:
+            return None
+
+        headers = {}
+
+        if entry[0]:
+            headers['If-None-Match'] = entry[0]
+
+        if entry[1]:
+            headers['If-Modified-Since'] = entry[1]
+
+        return headers
+
+    def not_modified(self, url):
+        entry = self._hit(url)
+        return MISS if entry is None else entry[2]
+
+    def not_modified_page(self, url):
+        '''
+        Body and rel=next link of a page answered with 304, which does not
+        carry the Link header. (MISS, None) when nothing is stored
+        '''
+        entry = self._hit(url)
+        return (MISS, None) if entry is None else (entry[2], entry[5])
+
+    def _hit(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(url)
+            self.stats.requests += 1
+            self.stats.not_modified += 1
+            self.stats.bytes_saved += entry[3]
+            self.stats.parse_seconds_saved += entry[4]
+
+            return entry
+
+    def store(self, url, headers, value, size, parse_seconds, link=None):
+        etag = headers.get('ETag')
+        modified = headers.get('Last-Modified')
+
+        with self._lock:
+            self.stats.requests += 1
+
+            if not etag and not modified:
+                self._entries.pop(url, None)
+                return
+
+            self._entries[url] = (etag, modified, value, size, parse_seconds, link)
+            self._entries.move_to_end(url)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+
+class CensusClient(object):
+    '''
+    One client merged across every device that reported it.
+    serial and switchport are where the client was last seen: the record with
+    the latest lastSeen when the API provides it, otherwise the device that
+    carried most of the client's traffic.
+    '''
+    __slots__ = ('mac', 'id', 'description', 'ip', 'user', 'vlan', 'sent', 'recv', 'serial', 'switchport', 'devices', '_rank')
+
+    def __init__(self, mac):
+        self.mac = mac
+        self.id = None
+        self.description = None
+        self.ip = None
+        self.user = None
+        self.vlan = None
+        self.sent = 0.0
+        self.recv = 0.0
+        self.serial = None
+        self.switchport = None
+        self.devices = 0
+        self._rank = None
+
+    @property
+    def usage(self):
+        return {'sent': self.sent, 'recv': self.recv}
+
+    def add(self, serial, record):
+        usage = record.get('usage') or {}
+        sent = usage.get('sent') or 0
+        recv = usage.get('recv') or 0
+
+        self.sent += sent
+        self.recv += recv
+        self.devices += 1
+
+        rank = (record.get('lastSeen') or 0, sent + recv)
+
+        if self._rank is None or rank > self._rank:
+            self._rank = rank
+            self.serial = serial
+            self.switchport = record.get('switchport')
+            self.id = record.get('id', self.id)
+            self.description = record.get('description') or self.description
+            self.ip = record.get('ip') or self.ip
+            self.user = record.get('user') or self.user
+            self.vlan = record.get('vlan', self.vlan)
+
+    def as_dict(self):
+        return {
+            'mac': self.mac,
+            'id': self.id,
+            'description': self.description,
+            'ip': self.ip,
+            'user': self.user,
+            'vlan': self.vlan,
+            'usage': self.usage,
+            'serial': self.serial,
+            'switchport': self.switchport,
+            'devices': self.devices
+        }
+
+    def __repr__(self):
+        return '<CensusClient {} {} sent={} recv={}>'.format(self.mac, self.serial, self.sent, self.recv)
+
+
+class ClientCensus(object):
+    '''
+    Streaming merge of devices/<serial>/clients answers by MAC address.
+
+    Each device's client list is folded in as soon as it arrives and then
+    dropped, so memory grows with unique clients, not with rows returned.
+    '''
+    def __init__(self):
+        self.clients = {}
+        self.rows = 0
+        self.devices = 0
+        self.failures = []
+
+    def __len__(self):
+        return len(self.clients)
+
+    def __iter__(self):
+        return iter(self.clients.values())
+
+    def __getitem__(self, mac):
+        return self.clients[mac.lower()]
+
+    def add(self, serial, records):
+        self.devices += 1
+
+        for record in records:
+            mac = (record.get('mac') or '').lower()
+
+            if not mac:
+                continue
+
+            client = self.clients.get(mac)
+
+            if client is None:
+                client = self.clients[mac] = CensusClient(mac)
+
+            client.add(serial, record)
+            self.rows += 1
+
+    def collect(self, fanout, asynchronous=False):
+        '''
+        Fold the 'clients' tasks of a FanOut in as they finish.
+        Returns self, or a coroutine resolving to self when asynchronous.
+        '''
+        def task(task):
+            if not task.ok:
+                self.failures.append(task)
+            elif task.kind == 'clients':
+                self.add(task.args[0], task.result)
+
+        if asynchronous:
+            return self._acollect(fanout, task)
+
+        fanout.each(task)
+        return self
+
+    async def _acollect(self, fanout, task):
+        await fanout.each(task, asynchronous=True)
+        return self
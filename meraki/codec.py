@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class Codec(object):
+    '''
+    JSON encoding and decoding of request and response bodies.
+
+    loads() parses raw response bytes straight away, without decoding them
+    to text first. The standard library json module is the reference
+    implementation and the fallback of the faster backends.
+    '''
+    name = 'json'
+
+    def loads(self, content):
+        return json.loads(content)
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':')).encode('utf8')
+
+
+class OrjsonCodec(Codec):
+    name = 'orjson'
+
+    def loads(self, content):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # integers over 64 bits and other input orjson rejects but json accepts
+            return json.loads(content)
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return Codec.dumps(self, obj)
+
+
+class UjsonCodec(Codec):
+    name = 'ujson'
+
+    def loads(self, content):
+        try:
+            return ujson.loads(content)
+        except ValueError:
+            return json.loads(content)
+
+
+CODECS = {
+    'json': Codec,
+    'orjson': OrjsonCodec if orjson is not None else None,
+    'ujson': UjsonCodec if ujson is not None else None
+}
+
+
+def get_codec(codec='auto'):
+    '''
+    Codec instance by name. 'auto' picks the fastest installed backend:
+    orjson, then ujson, then the standard library.
+    '''
+    if isinstance(codec, Codec):
+        return codec
+
+    if codec == 'auto':
+        for name in ('orjson', 'ujson', 'json'):
+            if CODECS[name] is not None:
+                return CODECS[name]()
+
+    if codec not in CODECS:
+        raise ValueError('unknown JSON codec {!r}, use one of {}'.format(codec, ', '.join(sorted(CODECS))))
+
+    if CODECS[codec] is None:
+        raise ImportError('JSON codec {!r} is not installed'.format(codec))
+
+    return CODECS[codec]()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from meraki.scheduler import lane
+from meraki.retry import track, last_call
+
+
+def failed(result):
+    '''
+    True for the {'status': ..., 'reason': ...} dict returned on HTTP errors
+    '''
+    return isinstance(result, dict) and len(result) == 2 and 'status' in result and 'reason' in result
+
+
+class Task(object):
+    '''
+    One call of a fan-out: what was called, with which arguments, and its outcome
+    '''
+    __slots__ = ('kind', 'args', 'result', 'error', 'retries')
+
+    def __init__(self, kind, args, result=None, error=None, retries=0):
+        if error is None and failed(result):
+            error = result
+
+        self.kind = kind
+        self.args = args
+        self.result = result
+        self.error = error
+        self.retries = retries
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return '<Task {} {} {}>'.format(self.kind, self.args, 'ok' if self.ok else repr(self.error))
+
+
+class FanOut(object):
+    '''
+    Run calls concurrently with at most `workers` in flight and stream them back
+    as they complete. Every finished Task may queue further calls through
+    `expand(task)`, which returns (kind, func, args) tuples.
+
+    Iterate it in a thread, or with `async for` on top of an AsyncDashboard.
+    Failed calls, exceptions and HTTP errors alike, are yielded with `error`
+    set and collected in `failures`; they do not stop the rest of the run.
+
+    PARAMETERS
+        calls:      Initial (kind, func, args) tuples
+        expand:     Callable returning the follow-up calls of a successful Task
+        workers:    Maximum calls in flight
+        priority:   Scheduler lane the calls run in
+    '''
+    def __init__(self, calls, expand=None, workers=8, priority='bulk'):
+        self.calls = list(calls)
+        self.expand = expand
+        self.workers = workers
+        self.priority = priority
+        self.failures = []
+        self.completed = 0
+
+    def each(self, callback, asynchronous=False):
+        '''
+        Run to completion, passing every finished Task to callback.
+        Returns self, or a coroutine resolving to self when asynchronous.
+        '''
+        if asynchronous:
+            return self._aeach(callback)
+
+        for task in self:
+            callback(task)
+
+        return self
+
+    async def _aeach(self, callback):
+        async for task in self:
+            callback(task)
+
+        return self
+
+    def _task(self, kind, args, result, error):
+        stats = last_call()
+        return Task(kind, args, result, error, stats.retries if stats is not None else 0)
+
+    def _run(self, kind, func, args):
+        track(None)
+
+        with lane(self.priority):
+            try:
+                result = func(*args)
+            except Exception as error:
+                return self._task(kind, args, None, error)
+
+        return self._task(kind, args, result, None)
+
+    def _finish(self, task):
+        self.completed += 1
+
+        if not task.ok:
+            self.failures.append(task)
+
+        return task
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(self.workers)
+        pending = set()
+
+        def submit(kind, func, args):
+            context = contextvars.copy_context()
+            pending.add(executor.submit(context.run, self._run, kind, func, args))
+
+        try:
+            for call in self.calls:
+                submit(*call)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    task = self._finish(future.result())
+
+                    if task.ok and self.expand is not None:
+                        for call in self.expand(task):
+                            submit(*call)
+
+                    yield task
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown(wait=False)
+
+    async def _arun(self, semaphore, kind, func, args):
+        async with semaphore:
+            track(None)
+
+            with lane(self.priority):
+                try:
+                    result = await func(*args)
+                except Exception as error:
+                    return self._task(kind, args, None, error)
+
+            return self._task(kind, args, result, None)
+
+    async def __aiter__(self):
+        semaphore = asyncio.Semaphore(self.workers)
+        pending = set()
+
+        def submit(kind, func, args):
+            pending.add(asyncio.ensure_future(self._arun(semaphore, kind, func, args)))
+
+        try:
+            for call in self.calls:
+                submit(*call)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    task = self._finish(future.result())
+
+                    if task.ok and self.expand is not None:
+                        for call in self.expand(task):
+                            submit(*call)
+
+                    yield task
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class BulkResult(object):
+    '''
+    Per-item report of a bulk write: successes, failures and retries.
+    Failed items can be sent again on their own with retry_failed().
+    '''
+    def __init__(self, func, workers=8, asynchronous=False):
+        self.func = func
+        self.workers = workers
+        self.asynchronous = asynchronous
+        self.successes = []
+        self.failures = []
+        self.retries = 0
+
+    def __len__(self):
+        return len(self.successes) + len(self.failures)
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def collect(self, fanout):
+        def task(task):
+            self.retries += task.retries
+            (self.successes if task.ok else self.failures).append(task)
+
+        if self.asynchronous:
+            return self._acollect(fanout, task)
+
+        fanout.each(task)
+        return self
+
+    async def _acollect(self, fanout, task):
+        await fanout.each(task, asynchronous=True)
+        return self
+
+    def retry_failed(self):
+        '''
+        Send the failed items again, returns a new BulkResult (awaitable on an AsyncDashboard)
+        '''
+        return bulk(self.func, [task.args for task in self.failures], self.workers, self.asynchronous)
+
+    def __repr__(self):
+        return '<BulkResult {} ok, {} failed, {} retries>'.format(len(self.successes), len(self.failures), self.retries)
+
+
+def bulk(func, items, workers=8, asynchronous=False):
+    '''
+    Call func once per item concurrently, each item being the tuple of its
+    positional arguments. Returns a BulkResult (a coroutine when asynchronous).
+    '''
+    fanout = FanOut([(func.__name__, func, tuple(args)) for args in items], workers=workers, priority='default')
+    return BulkResult(func, workers, asynchronous).collect(fanout)
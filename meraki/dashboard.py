@@ -4,17 +4,42 @@
 from __future__ import print_function
 
 import sys
+import threading
 
 from meraki.modules import *
 from meraki.exceptions import ApiKeyMissing
+from meraki.transport import Transport, AsyncTransport, BASE_URL
+from meraki.retry import RetryPolicy
+from meraki.batch import ActionBatch
 
 class Dashboard(object):
-    def __init__(self, api_key=None):
+    _transport_class = Transport
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=10, pool_block=False, keep_alive=True, rate_limit=5, retry=RetryPolicy(), max_throttled=5, max_redirects=5, cache=None, conditional=None, codec='auto', snapshot=None, coalesce=True, metrics=None):
         if api_key is None:
             raise ApiKeyMissing
 
         self._api_key = api_key
-        self._baseurl = None  # override base_url with shard node
+
+        # one connection pool for every endpoint instance
+        self._transport = self._transport_class(
+            api_key,
+            base_url=base_url,
+            pool_size=pool_size,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            rate_limit=rate_limit,
+            retry=retry,
+            max_throttled=max_throttled,
+            max_redirects=max_redirects,
+            cache=cache,
+            conditional=conditional,
+            codec=codec,
+            snapshot=snapshot,
+            coalesce=coalesce,
+            metrics=metrics
+        )
+        self._lock = threading.Lock()
 
     def __getattr__(self, name):
         if 'meraki.modules.{}'.format(name) not in sys.modules:
@@ -25,4 +50,88 @@ class Dashboard(object):
         klass = module.__dict__[name.capitalize()]
 
         if klass is not None:
-            return klass(self._api_key)
+            with self._lock:
+                # endpoints are cached, __getattr__ only runs on first access
+                if name not in self.__dict__:
+                    self.__dict__[name] = klass(self._api_key, transport=self._transport)
+
+                return self.__dict__[name]
+
+    @property
+    def shards(self):
+        '''
+        Organization to shard mapping learned by the transport
+        '''
+        return self._transport.shards
+
+    @property
+    def cache(self):
+        return self._transport.cache
+
+    @property
+    def conditional(self):
+        return self._transport.conditional
+
+    @property
+    def snapshot(self):
+        return self._transport.snapshot
+
+    @property
+    def metrics(self):
+        return self._transport.metrics
+
+    def batch(self, org, size=100, concurrency=5, interval=2.0, timeout=600.0):
+        '''
+        Record writes and submit them as action batches of the organization,
+        see meraki.batch.ActionBatch
+        '''
+        return ActionBatch(
+            self._api_key,
+            self._transport,
+            org,
+            size=size,
+            concurrency=concurrency,
+            interval=interval,
+            timeout=timeout
+        )
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncDashboard(Dashboard):
+    '''
+    Same endpoint tree as Dashboard, every endpoint method returns an awaitable.
+
+        async with AsyncDashboard(api_key) as dash:
+            orgs = await dash.organizations.list()
+    '''
+    _transport_class = AsyncTransport
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=100, pool_block=True, keep_alive=True, rate_limit=5, retry=RetryPolicy(), max_throttled=5, max_redirects=5, cache=None, conditional=None, codec='auto', snapshot=None, coalesce=True, metrics=None):
+        super(AsyncDashboard, self).__init__(
+            api_key,
+            base_url=base_url,
+            pool_size=pool_size,
+            pool_block=pool_block,
+            keep_alive=keep_alive,
+            rate_limit=rate_limit,
+            retry=retry,
+            max_throttled=max_throttled,
+            max_redirects=max_redirects,
+            cache=cache,
+            conditional=conditional,
+            codec=codec,
+            snapshot=snapshot,
+            coalesce=coalesce,
+            metrics=metrics
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self._transport.close()
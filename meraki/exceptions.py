@@ -41,3 +41,7 @@ class DevicePolicyMissing(Exception):
 class SerialMissing(Exception):
     def __init__(self):
         Exception.__init__(self, 'Device serial is required.')
+
+class ParameterUnknown(Exception):
+    def __init__(self, name, template):
+        Exception.__init__(self, 'Query parameter {!r} is not accepted by {}.'.format(name, template))
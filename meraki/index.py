@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import threading
+
+from meraki.concurrency import FanOut
+from meraki.records import Record
+
+
+# unique keys: one device per value
+UNIQUE = ('mac',)
+# secondary keys: every device sharing a value, LAN IPs repeat across sites
+GROUPS = ('ip', 'network', 'model', 'tag', 'status')
+# what each source says about a device, merged in this order
+SOURCES = ('inventory', 'devices', 'statuses')
+
+
+def tags(value):
+    '''
+    Device tags as a set, from the API's space separated string or a list
+    '''
+    if not value:
+        return set()
+
+    if isinstance(value, str):
+        return set(value.split())
+
+    return set(value)
+
+
+def keys(entry):
+    '''
+    Index keys of a device entry, by index name
+    '''
+    mac = entry.get('mac')
+    ip = entry.get('lanIp')
+
+    return {
+        'mac': {mac.lower()} if mac else set(),
+        'ip': {ip} if ip else set(),
+        'network': {entry['networkId']} if entry.get('networkId') else set(),
+        'model': {entry['model']} if entry.get('model') else set(),
+        'tag': tags(entry.get('tags')),
+        'status': {entry['status']} if entry.get('status') else set()
+    }
+
+
+class InventoryIndex(object):
+    '''
+    Local index of an organization's devices merged from the inventory,
+    device statuses and network device lists, keyed by serial.
+
+    Serial and MAC lookups are dict hits; LAN IP, network, model, tag and
+    status each map to the set of serials sharing a value. Updates are
+    incremental: every source's view of a device is kept, the entry is the
+    merge of them, and only the index keys of entries that actually changed
+    are touched. Every update returns the serials it changed.
+
+    refresh() fetches the sources concurrently through the organizations and
+    networks endpoints the index was built with (awaitable on an AsyncDashboard).
+
+        index = dash.organizations.index(<orgId>)
+        index.network_of('Q2XX-XXXX-XXXX')
+        index.find(model='MR42', tag='lobby')
+        index.refresh()
+        print(index.changed)
+    '''
+    def __init__(self, organizations=None, networks=None, org=None, devices=True, workers=8):
+        self.organizations = organizations
+        self.networks_endpoint = networks
+        self.org = org
+        self.devices = devices
+        self.workers = workers
+        self.entries = {}
+        self.networks = {}
+        self._sources = {}
+        self._inventory = False
+        self.changed = set()
+        self.failures = []
+
+        self._unique = {name: {} for name in UNIQUE}
+        self._groups = {name: {} for name in GROUPS}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, serial):
+        return serial in self.entries
+
+    def __iter__(self):
+        return iter(list(self.entries.values()))
+
+    def __getitem__(self, serial):
+        return self.entries[serial]
+
+    #
+    # LOOKUPS
+    #
+
+    def get(self, serial, default=None):
+        return self.entries.get(serial, default)
+
+    def by_mac(self, mac):
+        serial = self._unique['mac'].get(mac.lower())
+        return None if serial is None else self.entries[serial]
+
+    def by_ip(self, ip):
+        '''
+        Devices with this LAN IP, one per site using the same addressing
+        '''
+        with self._lock:
+            return [self.entries[serial] for serial in self._groups['ip'].get(ip, ())]
+
+    def network_of(self, serial):
+        '''
+        The network a device is in, the network dict when known or its ID
+        '''
+        entry = self.entries.get(serial)
+
+        if entry is None or not entry.get('networkId'):
+            return None
+
+        return self.networks.get(entry['networkId'], entry['networkId'])
+
+    def serials(self, index, value):
+        '''
+        Serials of the devices with `value` in a secondary index: ip, network, model, tag or status
+        '''
+        return set(self._groups[index].get(value, ()))
+
+    def find(self, network=None, model=None, tag=None, status=None):
+        '''
+        Devices matching every given criterion
+        '''
+        criteria = [(name, value) for name, value in (('network', network), ('model', model), ('tag', tag), ('status', status)) if value is not None]
+
+        if not criteria:
+            return list(self)
+
+        with self._lock:
+            # intersect starting from the smallest set
+            sets = sorted((self._groups[name].get(value, set()) for name, value in criteria), key=len)
+            serials = sets[0].intersection(*sets[1:])
+
+            return [self.entries[serial] for serial in serials]
+
+    #
+    # UPDATES
+    #
+
+    def _merge(self, parts):
+        # later sources win, except with a None over a known value
+        entry = {}
+
+        for source in SOURCES:
+            for key, value in parts.get(source, {}).items():
+                if value is not None or key not in entry:
+                    entry[key] = value
+
+        return entry
+
+    def _apply(self, serial, source, fields):
+        '''
+        Store what one source reports for a device, None to forget it, and
+        re-index the merged entry if it changed. True when the entry changed
+        '''
+        parts = self._sources.setdefault(serial, {})
+
+        if parts.get(source) == fields:
+            return False
+
+        if fields is None:
+            parts.pop(source, None)
+        else:
+            parts[source] = fields
+
+        old = self.entries.get(serial)
+        new = self._merge(parts) if parts else None
+
+        if new == old:
+            return False
+
+        self._reindex(serial, keys(old) if old is not None else None, keys(new) if new is not None else None)
+
+        if new is None:
+            del self.entries[serial]
+            del self._sources[serial]
+        else:
+            self.entries[serial] = new
+
+        return True
+
+    def _reindex(self, serial, old, new):
+        for name in UNIQUE + GROUPS:
+            before = old[name] if old is not None else set()
+            after = new[name] if new is not None else set()
+
+            for value in before - after:
+                if name in self._unique:
+                    if self._unique[name].get(value) == serial:
+                        del self._unique[name][value]
+                else:
+                    members = self._groups[name][value]
+                    members.discard(serial)
+
+                    if not members:
+                        del self._groups[name][value]
+
+            for value in after - before:
+                if name in self._unique:
+                    self._unique[name][value] = serial
+                else:
+                    self._groups[name].setdefault(value, set()).add(serial)
+
+    def _remove(self, serial):
+        self._reindex(serial, keys(self.entries[serial]), None)
+        del self.entries[serial]
+        del self._sources[serial]
+
+    def _items(self, items):
+        for item in items:
+            yield item.raw if isinstance(item, Record) else item
+
+    def _known(self, serial):
+        # once an inventory was applied it decides which devices exist
+        return not self._inventory or serial in self.entries
+
+    def update_inventory(self, devices):
+        '''
+        Apply a full organization inventory. Devices missing from it are dropped
+        '''
+        changed = set()
+
+        with self._lock:
+            seen = set()
+
+            for device in self._items(devices):
+                serial = device['serial']
+                seen.add(serial)
+
+                if self._apply(serial, 'inventory', device):
+                    changed.add(serial)
+
+            for serial in set(self.entries) - seen:
+                self._remove(serial)
+                changed.add(serial)
+
+            self._inventory = True
+
+        return changed
+
+    def update_statuses(self, statuses):
+        '''
+        Apply device statuses (status, lanIp, publicIp...)
+        '''
+        changed = set()
+
+        with self._lock:
+            for status in self._items(statuses):
+                serial = status['serial']
+
+                if self._known(serial) and self._apply(serial, 'statuses', status):
+                    changed.add(serial)
+
+        return changed
+
+    def update_devices(self, network, devices):
+        '''
+        Apply the full device list of a network (tags, addresses, LAN IPs...).
+        Devices listed in the network before and missing now lose what it said about them
+        '''
+        changed = set()
+
+        with self._lock:
+            seen = set()
+
+            for device in self._items(devices):
+                serial = device['serial']
+                seen.add(serial)
+
+                if self._known(serial) and self._apply(serial, 'devices', dict(device, networkId=network)):
+                    changed.add(serial)
+
+            for serial, parts in list(self._sources.items()):
+                if serial not in seen and parts.get('devices', {}).get('networkId') == network:
+                    if self._apply(serial, 'devices', None):
+                        changed.add(serial)
+
+        return changed
+
+    def update_networks(self, networks):
+        '''
+        Apply the full network list of the organization. Returns the IDs of the networks that changed
+        '''
+        changed = set()
+
+        with self._lock:
+            current = {network['id']: network for network in self._items(networks)}
+
+            for id in set(self.networks) ^ set(current):
+                changed.add(id)
+
+            for id, network in current.items():
+                if self.networks.get(id) != network:
+                    changed.add(id)
+
+            self.networks = current
+
+        return changed
+
+    #
+    # REFRESH
+    #
+
+    def refresh(self):
+        '''
+        Fetch inventory, device statuses, networks and, with devices, the device
+        list of every network concurrently, then apply them inventory first.
+        `changed` holds the serials changed by this refresh and `failures` the
+        calls that failed; a failed source leaves its part of the index as it was.
+        Returns self, or a coroutine resolving to self on an AsyncDashboard.
+        '''
+        organizations = self.organizations
+        networks = self.networks_endpoint
+        tasks = []
+
+        def expand(task):
+            if task.kind == 'networks' and self.devices:
+                return [('devices', networks.devices.list, (network['id'],)) for network in task.result]
+
+            return []
+
+        fanout = FanOut([
+            ('inventory', organizations.inventory, (self.org,)),
+            ('statuses', organizations.device_statuses, (self.org,)),
+            ('networks', organizations.networks, (self.org,))
+        ], expand=expand, workers=self.workers)
+
+        if organizations._transport.asynchronous:
+            return self._arefresh(fanout, tasks)
+
+        fanout.each(tasks.append)
+        return self._refreshed(tasks)
+
+    async def _arefresh(self, fanout, tasks):
+        await fanout.each(tasks.append, asynchronous=True)
+        return self._refreshed(tasks)
+
+    def _refreshed(self, tasks):
+        order = {'inventory': 0, 'networks': 1, 'devices': 2, 'statuses': 3}
+        self.changed = set()
+        self.failures = [task for task in tasks if not task.ok]
+
+        for task in sorted((task for task in tasks if task.ok), key=lambda task: order[task.kind]):
+            if task.kind == 'inventory':
+                self.changed |= self.update_inventory(task.result)
+            elif task.kind == 'networks':
+                self.update_networks(task.result)
+            elif task.kind == 'devices':
+                self.changed |= self.update_devices(task.args[0], task.result)
+            else:
+                self.changed |= self.update_statuses(task.result)
+
+        return self
+
+    def __repr__(self):
+        return '<InventoryIndex {} devices in {} networks>'.format(len(self.entries), len(self._groups['network']))
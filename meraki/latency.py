@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def bucket_percentiles(bins, counts, percentiles=PERCENTILES):
+    '''
+    Percentiles of latency histograms, vectorized over every leading axis.
+
+    counts is a (..., buckets) array of packet counts for the buckets whose
+    upper bounds are bins. Returns a (..., percentiles) array holding, for
+    every histogram, the bound of the first bucket reaching each percentile,
+    NaN for empty histograms.
+    '''
+    counts = numpy.nan_to_num(numpy.asarray(counts, dtype='float64'))
+    cumulative = numpy.cumsum(counts, axis=-1)
+    total = cumulative[..., -1:]
+    thresholds = total[..., None, :] * (numpy.asarray(percentiles, dtype='float64') / 100.0)[:, None]
+
+    # buckets still under each threshold, i.e. the index of the first one reaching it
+    index = numpy.minimum((cumulative[..., None, :] < thresholds).sum(axis=-1), len(bins) - 1)
+    result = numpy.asarray(bins, dtype='float64')[index]
+    result[total[..., 0] == 0] = numpy.nan
+
+    return result
+
+
+def merge(histories):
+    '''
+    Sum LatencyHistory series into one histogram per category and timestamp.
+
+    Returns (bins, times, {category: times x bins array}): bins is the union of
+    every series' buckets, times the sorted distinct sample starts. Series
+    sharing the same buckets and sample starts, as the clients of one query
+    do, are summed together first and placed on the common grid once.
+    '''
+    if not histories:
+        return numpy.empty(0), numpy.empty(0, dtype='datetime64[ms]'), {}
+
+    groups = {}
+
+    for history in histories:
+        groups.setdefault((history.bins.tobytes(), history.t0.tobytes()), []).append(history)
+
+    groups = list(groups.values())
+    bins = numpy.unique(numpy.concatenate([group[0].bins for group in groups]))
+    starts = numpy.concatenate([group[0].t0 for group in groups])
+    times = numpy.unique(starts[~numpy.isnat(starts)])
+    categories = {name: numpy.zeros((len(times), len(bins))) for history in histories for name in history.categories}
+
+    for group in groups:
+        first = group[0]
+        valid = ~numpy.isnat(first.t0)
+        rows = numpy.searchsorted(times, first.t0[valid])
+        columns = numpy.searchsorted(bins, first.bins)
+
+        for name, merged in categories.items():
+            total = numpy.zeros((len(first), len(first.bins)))
+
+            for history in group:
+                counts = history.categories.get(name)
+
+                if counts is not None:
+                    total += numpy.nan_to_num(counts)
+
+            # add.at, a series may repeat a sample start
+            numpy.add.at(merged, (rows[:, None], columns), total[valid])
+
+    return bins, times, dict(sorted(categories.items()))
+
+
+class LatencyReport(object):
+    '''
+    Latency percentiles per traffic category, merged from the latency
+    histograms of many clients.
+
+    Every client's LatencyHistory is filed under its network as it arrives;
+    the histograms are summed with array operations when a result is first
+    asked for. Percentiles are bucket bounds in milliseconds: p95 is the upper
+    bound of the bucket in which 95% of the sampled packets were reached.
+    Requires numpy.
+
+        report = dash.networks.latency_report([<networkId>, ...])
+        report.percentiles()                    # {'voiceTraffic': {50: 2.0, 95: 16.0, 99: 64.0}, ...}
+        report.percentiles(<networkId>)
+        times, values = report.timeline('voiceTraffic')
+    '''
+    def __init__(self, percentiles=PERCENTILES):
+        if numpy is None:
+            raise ImportError('LatencyReport requires numpy: pip install meraki-dashboard-api[arrays]')
+
+        self.levels = tuple(percentiles)
+        self.clients = 0
+        self.failures = []
+        self._histories = {}
+        self._merged = {}
+
+    @property
+    def networks(self):
+        return list(self._histories)
+
+    def add(self, network, history):
+        # None or an empty series when the client sent nothing in the period
+        if history:
+            self._histories.setdefault(network, []).append(history)
+            self._merged.clear()
+
+        self.clients += 1
+
+    def _merge(self, network=None):
+        if network not in self._merged:
+            if network is None:
+                histories = [history for histories in self._histories.values() for history in histories]
+            else:
+                histories = self._histories.get(network, [])
+
+            self._merged[network] = merge(histories)
+
+        return self._merged[network]
+
+    def histogram(self, category, network=None):
+        '''
+        Bucket bounds and summed packet counts of a category, over every network or one
+        '''
+        bins, times, categories = self._merge(network)
+
+        return bins, categories[category].sum(axis=0) if category in categories else numpy.zeros(len(bins))
+
+    def percentiles(self, network=None):
+        '''
+        {category: {percentile: milliseconds}} over the whole period, for every network or one
+        '''
+        bins, times, categories = self._merge(network)
+
+        if not categories:
+            return {}
+
+        names = sorted(categories)
+        totals = numpy.stack([categories[name].sum(axis=0) for name in names])
+        values = bucket_percentiles(bins, totals, self.levels)
+
+        return {name: dict(zip(self.levels, row.tolist())) for name, row in zip(names, values)}
+
+    def by_network(self):
+        '''
+        percentiles() of every network
+        '''
+        return {network: self.percentiles(network) for network in self._histories}
+
+    def timeline(self, category, network=None):
+        '''
+        (times, values): the sample starts and a times x percentiles array
+        of the category's percentiles at each of them
+        '''
+        bins, times, categories = self._merge(network)
+
+        if category not in categories:
+            return times, numpy.full((len(times), len(self.levels)), numpy.nan)
+
+        return times, bucket_percentiles(bins, categories[category], self.levels)
+
+    def collect(self, fanout, asynchronous=False):
+        '''
+        File the 'latency' tasks of a FanOut as they finish.
+        Returns self, or a coroutine resolving to self when asynchronous.
+        '''
+        def task(task):
+            if not task.ok:
+                self.failures.append(task)
+            elif task.kind == 'latency':
+                self.add(task.args[0], task.result)
+
+        if asynchronous:
+            return self._acollect(fanout, task)
+
+        fanout.each(task)
+        return self
+
+    async def _acollect(self, fanout, task):
+        await fanout.each(task, asynchronous=True)
+        return self
+
+    def __repr__(self):
+        return '<LatencyReport {} clients in {} networks, {} failed>'.format(self.clients, len(self._histories), len(self.failures))
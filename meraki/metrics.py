@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import bisect
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# request duration histogram bounds, seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class EndpointMetrics(object):
+    '''
+    Counters of one endpoint and method. durations holds the count of calls per
+    BUCKETS bound, the last slot for slower ones, not cumulated
+    '''
+    __slots__ = ('requests', 'statuses', 'errors', 'durations', 'seconds', 'bytes', 'decodes', 'decode_seconds', 'retries', 'throttled', 'wait_seconds')
+
+    def __init__(self, buckets):
+        self.requests = 0
+        self.statuses = {}
+        self.errors = {}
+        self.durations = [0] * (len(buckets) + 1)
+        self.seconds = 0.0
+        self.bytes = 0
+        self.decodes = 0
+        self.decode_seconds = 0.0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class Metrics(object):
+    '''
+    Per-endpoint request metrics, recorded by the transport for every call.
+
+    Calls are labelled with their endpoint name (e.g.
+    networks.devices.lossAndLatencyHistory) and method, and count status
+    codes, exceptions, a duration histogram covering retries and waits,
+    response bytes, JSON decode time, retries, 429s and the time spent
+    waiting for the rate limiter. Recording a call is a few dict and list
+    updates under a lock.
+
+        metrics = Metrics()
+        dash = Dashboard(apikey, metrics=metrics)
+        ...
+        print(metrics.prometheus())
+        metrics.serve(9464)         # GET http://127.0.0.1:9464/metrics
+
+    PARAMETERS
+        buckets:    Upper bounds in seconds of the duration histogram
+    '''
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name, method):
+        endpoint = self._endpoints.get((name, method))
+
+        if endpoint is None:
+            endpoint = self._endpoints[(name, method)] = EndpointMetrics(self.buckets)
+
+        return endpoint
+
+    def observe(self, name, method, status=None, seconds=0.0, size=0, retries=0, throttled=0, waited=0.0, error=None):
+        '''
+        Record one call: its final status, or the exception that ended it
+        '''
+        bucket = bisect.bisect_left(self.buckets, seconds)
+
+        with self._lock:
+            endpoint = self._endpoint(name, method)
+            endpoint.requests += 1
+            endpoint.durations[bucket] += 1
+            endpoint.seconds += seconds
+            endpoint.bytes += size
+            endpoint.retries += retries
+            endpoint.throttled += throttled
+            endpoint.wait_seconds += waited
+
+            if error is not None:
+                kind = type(error).__name__
+                endpoint.errors[kind] = endpoint.errors.get(kind, 0) + 1
+            else:
+                endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+
+    def decoded(self, name, method, seconds):
+        '''
+        Record the time spent decoding one response body
+        '''
+        with self._lock:
+            endpoint = self._endpoint(name, method)
+            endpoint.decodes += 1
+            endpoint.decode_seconds += seconds
+
+    def get(self, name, method='GET'):
+        '''
+        EndpointMetrics of an endpoint, None before its first call
+        '''
+        return self._endpoints.get((name, method))
+
+    def as_dict(self):
+        '''
+        {(endpoint, method): {metric: value}}
+        '''
+        with self._lock:
+            return dict((key, endpoint.as_dict()) for key, endpoint in self._endpoints.items())
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+    def prometheus(self):
+        '''
+        Every metric in the Prometheus text exposition format
+        '''
+        with self._lock:
+            endpoints = sorted((key, endpoint.as_dict()) for key, endpoint in self._endpoints.items())
+
+        lines = []
+
+        def family(metric, kind, help):
+            lines.append('# HELP {} {}'.format(metric, help))
+            lines.append('# TYPE {} {}'.format(metric, kind))
+
+        def sample(metric, labels, value):
+            lines.append('{}{{{}}} {}'.format(metric, ','.join('{}="{}"'.format(key, label(value)) for key, value in labels), repr(value) if type(value) is float else value))
+
+        family('meraki_requests_total', 'counter', 'Calls answered by the API, by endpoint, method and final status code')
+        for (name, method), endpoint in endpoints:
+            for status, count in sorted(endpoint['statuses'].items()):
+                sample('meraki_requests_total', (('endpoint', name), ('method', method), ('status', status)), count)
+
+        family('meraki_request_errors_total', 'counter', 'Calls that ended with an exception, by exception type')
+        for (name, method), endpoint in endpoints:
+            for kind, count in sorted(endpoint['errors'].items()):
+                sample('meraki_request_errors_total', (('endpoint', name), ('method', method), ('error', kind)), count)
+
+        family('meraki_request_duration_seconds', 'histogram', 'Call duration including retries and rate limit waits')
+        for (name, method), endpoint in endpoints:
+            labels = (('endpoint', name), ('method', method))
+            cumulative = 0
+
+            for bound, count in zip(self.buckets + ('+Inf',), endpoint['durations']):
+                cumulative += count
+                sample('meraki_request_duration_seconds_bucket', labels + (('le', bound),), cumulative)
+
+            sample('meraki_request_duration_seconds_sum', labels, float(endpoint['seconds']))
+            sample('meraki_request_duration_seconds_count', labels, endpoint['requests'])
+
+        for metric, key, kind, help in (
+                ('meraki_response_bytes_total', 'bytes', 'counter', 'Response body bytes received'),
+                ('meraki_decode_seconds_total', 'decode_seconds', 'counter', 'Time spent decoding JSON response bodies'),
+                ('meraki_decodes_total', 'decodes', 'counter', 'Response bodies decoded'),
+                ('meraki_retries_total', 'retries', 'counter', 'Requests sent again after a failure or a 429, shard redirects not included'),
+                ('meraki_throttled_total', 'throttled', 'counter', 'HTTP 429 responses received'),
+                ('meraki_rate_limit_wait_seconds_total', 'wait_seconds', 'counter', 'Time spent waiting for the per-organization rate limiter')):
+            family(metric, kind, help)
+
+            for (name, method), endpoint in endpoints:
+                sample(metric, (('endpoint', name), ('method', method)), endpoint[key])
+
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        '''
+        Serve prometheus() at http://host:port/metrics from a daemon thread.
+        Returns the server, shutdown() stops it
+        '''
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+
+                body = metrics.prometheus().encode('utf8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name='meraki-metrics')
+        thread.daemon = True
+        thread.start()
+
+        return server
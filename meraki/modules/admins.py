@@ -4,11 +4,16 @@
 from __future__ import print_function
 
 from .base import Base
+from meraki.routes import Route
+
+
+ADMINS = Route('organizations/{org}/admins')
+ADMIN = Route('organizations/{org}/admins/{admin}')
 
 
 class Admins(Base):
-    def __init__(self, api_key=None, parent=None):
-        super(Admins, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, parent=None, transport=None):
+        super(Admins, self).__init__(api_key=api_key, transport=transport)
         self._parent = parent
         self._name = 'admins'
 
@@ -16,23 +21,23 @@ class Admins(Base):
         '''
         List the dashboard administrators in this organization
         '''
-        return self._get_request(self._parent, org, self._name)
+        return self._get_request(ADMINS, org)
 
     def create(self, org=None, data={}):
         '''
         Create a new dashboard administrator
         '''
-        return self._post_request(self._parent, org, self._name, data=data)
+        return self._post_request(ADMINS, org, data=data)
 
     def update(self, org=None, admin=None, update={}):
         '''
         Update an administrator
         '''
-        return self._post_request(self._parent, org, self._name, admin, update=update)
+        return self._put_request(ADMIN, org, admin, update=update)
 
     def delete(self, org=None, admin=None):
         '''
         Revoke all access for a dashboard administrator within this organization
         '''
-        return self._del_request(self._parent, org, self._name, admin)
+        return self._del_request(ADMIN, org, admin)
 
@@ -3,130 +3,78 @@
 
 from __future__ import print_function
 
-import ssl
-import json
-from requests import Session, Request
-from requests_toolbelt import SSLAdapter
-
-# workaround to suppress InsecureRequestWarning
-# See: https://urllib3.readthedocs.io/en/latest/advanced-usage.html#ssl-warnings
-import urllib3
-urllib3.disable_warnings()
-
 from meraki.exceptions import ApiKeyMissing, APIError
+from meraki.transport import Transport
+from meraki.concurrency import bulk
 
 
 class Base(object):
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, transport=None):
         if api_key is None:
             raise ApiKeyMissing
 
-        self._api_key = api_key
-        self._baseurl = 'https://api.meraki.com/api/v0'
-        self._headers = {
-            'X-Cisco-Meraki-API-Key': str(self._api_key),
-            'Content-type': 'application/json'
-        }
-        
-        self._session = Session()
-        self._session.mount(self._baseurl, SSLAdapter(ssl.PROTOCOL_SSLv23))
+        if transport is None:
+            transport = Transport(api_key)
 
-    def _bulid_url(self, *args, **kwargs):
-        url = '{}/{}'.format(
-            self._baseurl,
-            args[0]
+        self._api_key = api_key
+        self._transport = transport
+        self._baseurl = transport.base_url
+
+    def _get_request(self, route, *args, **kwargs):
+        return self._transport.request(
+            'GET',
+            route.url(self._baseurl, args, kwargs.get('parms')),
+            priority=kwargs.get('priority'),
+            ttl=kwargs.get('ttl'),
+            name=route.name,
+            record=kwargs.get('record')
         )
 
-        if len(args) > 1:
-            extra = '/'.join(args[1:])
-            url = '{}/{}'.format(url, extra)
-
-        # print('DEBUG URL:', args, kwargs)
-        # print('DEBUG URL:', url)
-
-        return url
-
-    def _build_querystring(self, url, **kwargs):
-        if not len(kwargs):
-            return url
-        
-        args = []
-        for key in kwargs['parms']:
-            args.append('{}={}'.format(key, kwargs['parms'][key]))
-
-        query = '&'.join(args)
-
-        # print('DEBUG Q:', kwargs['parms'])
-        # print('DEBUG Q:', query)
+    def _iter_request(self, route, *args, **kwargs):
+        return self._transport.paginate(
+            route.url(self._baseurl, args, kwargs.get('parms')),
+            prefetch=kwargs.get('prefetch', False),
+            priority=kwargs.get('priority'),
+            name=route.name
+        )
 
-        return '{}?{}'.format(url, query)
+    def _stream_request(self, route, *args, **kwargs):
+        return self._transport.stream(
+            route.url(self._baseurl, args, kwargs.get('parms')),
+            priority=kwargs.get('priority'),
+            name=route.name,
+            record=kwargs.get('record')
+        )
 
+    def _series_request(self, series, samples):
+        # columns are filled element by element, the samples are never held as a list
+        if self._transport.asynchronous:
+            return series.from_async_samples(samples)
 
-    def _jsondec(self, data):
-        if data.ok:
-            return data.json()
-        else:
-            return {
-                'status': data.status_code,
-                'reason': data.reason
-            }
+        return series.from_samples(samples)
 
-    def _get_request(self, *args, **kwargs):
-        return self._jsondec(
-            self._session.send(
-                self._session.prepare_request(
-                    Request(
-                        'GET',
-                        self._build_querystring(
-                            self._bulid_url(*args), **kwargs
-                        ),
-                        headers=self._headers
-                    )
-                ),
-                verify=False
-            )
+    def _post_request(self, route, *args, **kwargs):
+        return self._transport.request(
+            'POST',
+            route.url(self._baseurl, args),
+            data=self._transport.codec.dumps(kwargs['data']),
+            name=route.name
         )
 
-    def _post_request(self, *args, **kwargs):
-        return self._jsondec(
-            self._session.send(
-                self._session.prepare_request(
-                    Request(
-                        'POST',
-                        self._bulid_url(*args),
-                        data=json.dumps(kwargs['data']).encode('utf8'),
-                        headers=self._headers
-                    )
-                ),
-                verify=False
-            )
+    def _put_request(self, route, *args, **kwargs):
+        return self._transport.request(
+            'PUT',
+            route.url(self._baseurl, args),
+            data=self._transport.codec.dumps(kwargs['update']),
+            name=route.name
         )
 
-    def _put_request(self, *args, **kwargs):
-        return self._jsondec(
-            self._session.send(
-                self._session.prepare_request(
-                    Request(
-                        'PUT',
-                        self._bulid_url(*args),
-                        data=json.dumps(kwargs['update']).encode('utf8'),
-                        headers=self._headers
-                    )
-                ),
-                verify=False
-            )
+    def _del_request(self, route, *args, **kwargs):
+        return self._transport.request(
+            'DELETE',
+            route.url(self._baseurl, args),
+            name=route.name
         )
 
-    def _del_request(self, *args, **kwargs):
-        return self._jsondec(
-            self._session.send(
-                self._session.prepare_request(
-                    Request(
-                        'DELETE',
-                        self._bulid_url(args),
-                        headers=self._headers
-                    )
-                ),
-                verify=False
-            )
-        )
+    def _bulk(self, func, items, workers=8):
+        return bulk(func, items, workers, self._transport.asynchronous)
@@ -4,30 +4,55 @@
 from __future__ import print_function
 
 from .base import Base
+from meraki.scheduler import INTERACTIVE
+from meraki.concurrency import FanOut
+from meraki.latency import LatencyReport
+from meraki.routes import Route
+from meraki.series import UsageHistory, TrafficHistory, LatencyHistory
+from meraki.windows import fetch_range, MAX_SPAN
+from meraki.records import Client
 from meraki.exceptions import NetworkIdMissing, ClientIdMissing, MacAddressMissing, DevicePolicyMissing
 
 
+DEVICE_CLIENTS = Route('devices/{serial}/clients', params=('timespan',))
+CLIENT = Route('networks/{network}/clients/{client}')
+PROVISION = Route('networks/{network}/clients/provision')
+USAGE_HISTORY = Route('networks/{network}/clients/{client}/usageHistory')
+TRAFFIC_HISTORY = Route('networks/{network}/clients/{client}/trafficHistory', params=('perPage',))
+EVENTS = Route('networks/{network}/clients/{client}/events', params=('perPage',))
+SECURITY_EVENTS = Route('networks/{network}/clients/{client}/securityEvents', params=('timespan', 'perPage'))
+LATENCY_HISTORY = Route('networks/{network}/clients/{client}/latencyHistory', params=('t0', 't1', 'timespan'))
+POLICY = Route('networks/{network}/clients/{client}/policy', params=('timespan', 'devicePolicy', 'groupPolicyId'))
+SPLASH_AUTHORIZATION_STATUS = Route('networks/{network}/clients/{client}/splashAuthorizationStatus')
+
+
 class Clients(Base):
-    def __init__(self, api_key=None, parent=None):
-        super(Clients, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, parent=None, transport=None):
+        super(Clients, self).__init__(api_key=api_key, transport=transport)
         self._parent = parent
         self._name = 'clients'
 
-    def list(self, serial=None, timespan=3600):
+    def list(self, serial=None, timespan=3600, records=False):
         '''
         List the clients of a device, up to a maximum of a month ago. 
         The usage of each client is returned in kilobytes. 
         If the device is a switch, the switchport is returned; otherwise the switchport field is null.
+
+        PARAMETERS
+            records:    Return Client records instead of dicts
         '''
         if timespan > 2592000:
             timespan = 2592000 
 
-        return self._get_request(self._parent, serial, self._name, parms={'timespan': timespan})
+        return self._get_request(DEVICE_CLIENTS, serial, parms={'timespan': timespan}, record=Client if records else None)
 
-    def get(self, network=None, client=None):
+    def get(self, network=None, client=None, records=False):
         '''
         Return the client associated with the given identifier. 
         This endpoint will lookup by client ID or either the MAC or IP depending on whether the network uses Track-by-IP.
+
+        PARAMETERS
+            records:    Return a Client record instead of a dict
         '''
         if network is None:
             raise NetworkIdMissing
@@ -35,7 +60,7 @@ class Clients(Base):
         if client is None:
             raise ClientIdMissing
 
-        return self._get_request(self._parent, network, self._name, client)
+        return self._get_request(CLIENT, network, client, priority=INTERACTIVE, record=Client if records else None)
 
     def provision(self, network=None, mac=None, name='', device_policy=None, group_policy=None):
         '''
@@ -67,11 +92,27 @@ class Clients(Base):
                 'groupPolicyId': group_policy
             })
 
-        return self._post_request(self._parent, network, self._name, 'provision', data=data)
+        return self._post_request(PROVISION, network, data=data)
+
+    def bulk_provision(self, items, workers=8):
+        '''
+        Provision many clients concurrently within the rate budget.
+        POSTs are only retried inside a meraki.retry.retrying() block.
+
+        PARAMETERS
+            items:      Iterable of (network, mac, name, device_policy, group_policy) tuples
+            workers:    Maximum calls in flight
+
+        Returns a BulkResult with the successes, failures and retries of every item.
+        '''
+        return self._bulk(self.provision, items, workers)
 
-    def usage_history(self, network=None, client=None):
+    def usage_history(self, network=None, client=None, as_arrays=False):
         '''
         Return the client's daily usage history. Usage data is in kilobytes.
+
+        PARAMETERS
+            as_arrays:      Return a UsageHistory series of NumPy columns instead of a list of samples
         '''
         if network is None:
             raise NetworkIdMissing
@@ -79,9 +120,12 @@ class Clients(Base):
         if client is None:
             raise ClientIdMissing
 
-        return self._get_request(self._parent, network, self._name, client, 'usageHistory')
+        if as_arrays:
+            return self._series_request(UsageHistory, self._stream_request(USAGE_HISTORY, network, client))
 
-    def traffic_history(self, network=None, client=None, per_page=30):
+        return self._get_request(USAGE_HISTORY, network, client)
+
+    def traffic_history(self, network=None, client=None, per_page=30, as_arrays=False):
         '''
         Return the client's network traffic data over time. 
         Usage data is in kilobytes. 
@@ -91,6 +135,26 @@ class Clients(Base):
             perPage:        The number of entries per page returned
             startingAfter:  A token used by the server to indicate the start of the page. Often this is a timestamp or an ID but it is not limited to those. This parameter should not be defined by client applications. The link for the first, last, next or prev page in the HTTP Link header should define it.
             endingBefore:   A token used by the server to indicate the end of the page. Often this is a timestamp or an ID but it is not limited to those. This parameter should not be defined by client applications. The link for the first, last, next or prev page in the HTTP Link header should define it.
+            as_arrays:      Return a TrafficHistory series of NumPy columns of every page instead of a list of the entries of the first one
+        '''
+        if network is None:
+            raise NetworkIdMissing
+
+        if client is None:
+            raise ClientIdMissing
+
+        if as_arrays:
+            return self._series_request(TrafficHistory, self._iter_request(TRAFFIC_HISTORY, network, client, parms={'perPage': per_page}))
+
+        return self._get_request(TRAFFIC_HISTORY, network, client, parms={'perPage': per_page})
+
+    def iter_traffic_history(self, network=None, client=None, per_page=30, prefetch=False):
+        '''
+        Iterate over the client's network traffic data, following every page.
+
+        PARAMETERS
+            perPage:        The number of entries per page returned
+            prefetch:       Download the next page in the background while the current one is consumed
         '''
         if network is None:
             raise NetworkIdMissing
@@ -98,7 +162,7 @@ class Clients(Base):
         if client is None:
             raise ClientIdMissing
 
-        return self._get_request(self._parent, network, self._name, client, 'trafficHistory', parms={'perPage': per_page})
+        return self._iter_request(TRAFFIC_HISTORY, network, client, parms={'perPage': per_page}, prefetch=prefetch)
 
     def events(self, network=None, client=None, per_page=30):
         '''
@@ -110,7 +174,19 @@ class Clients(Base):
         if client is None:
             raise ClientIdMissing
 
-        return self._get_request(self._parent, network, self._name, client, 'events', parms={'perPage': per_page})
+        return self._get_request(EVENTS, network, client, parms={'perPage': per_page})
+
+    def iter_events(self, network=None, client=None, per_page=30, prefetch=False):
+        '''
+        Iterate over the events associated with this client, following every page.
+        '''
+        if network is None:
+            raise NetworkIdMissing
+
+        if client is None:
+            raise ClientIdMissing
+
+        return self._iter_request(EVENTS, network, client, parms={'perPage': per_page}, prefetch=prefetch)
 
     def security_events(self, network=None, client=None, timespan=3600, per_page=30):
         '''
@@ -125,13 +201,31 @@ class Clients(Base):
         if timespan > 2592000:
             timespan = 2592000 
 
-        return self._get_request(self._parent, network, self._name, client, 'securityEvents', parms={'timespan': timespan, 'perPage': per_page})
+        return self._get_request(SECURITY_EVENTS, network, client, parms={'timespan': timespan, 'perPage': per_page})
+
+    def iter_security_events(self, network=None, client=None, timespan=3600, per_page=30, prefetch=False):
+        '''
+        Iterate over the security events associated with this client, following every page.
+        '''
+        if network is None:
+            raise NetworkIdMissing
+
+        if client is None:
+            raise ClientIdMissing
+
+        if timespan > 2592000:
+            timespan = 2592000 
+
+        return self._iter_request(SECURITY_EVENTS, network, client, parms={'timespan': timespan, 'perPage': per_page}, prefetch=prefetch)
 
-    def latency_history(self, network=None, client=None, t0=0, t1=0, timespan=3600):
+    def latency_history(self, network=None, client=None, t0=0, t1=0, timespan=3600, as_arrays=False):
         '''
         Return the latency history for a client. 
         The latency data is from a sample of 2% of packets and is grouped into 4 traffic categories: background, best effort, video, voice. 
         Within these categories the sampled packet counters are bucketed by latency in milliseconds.
+
+        PARAMETERS
+            as_arrays:      Return a LatencyHistory series with one samples x buckets NumPy array per category
         '''
         if network is None:
             raise NetworkIdMissing
@@ -151,7 +245,56 @@ class Clients(Base):
                 'timespan': timespan
             })
 
-        return self._get_request(self._parent, network, self._name, client, 'latencyHistory', parms=parms)
+        if as_arrays:
+            return self._series_request(LatencyHistory, self._stream_request(LATENCY_HISTORY, network, client, parms=parms))
+
+        return self._get_request(LATENCY_HISTORY, network, client, parms=parms)
+
+    def latency_history_range(self, clients, t0, t1, workers=8, as_arrays=False):
+        '''
+        Latency history of many clients over any period, past the 30 days a single
+        call returns. Windows of every client are fetched concurrently and each
+        client's samples are stitched back in time order without boundary duplicates.
+
+        Returns a RangeResult keyed by (networkId, clientId), awaitable on an
+        AsyncDashboard. A client with a failed window is listed in `incomplete`.
+
+        PARAMETERS
+            clients:    (networkId, clientId) pairs
+            t0, t1:     Start and end of the period, epoch seconds
+            workers:    Maximum calls in flight
+            as_arrays:  Stitch every client into a LatencyHistory series
+        '''
+        return fetch_range(
+            self.latency_history,
+            clients,
+            t0,
+            t1,
+            't0',
+            span=MAX_SPAN,
+            workers=workers,
+            asynchronous=self._transport.asynchronous,
+            record=LatencyHistory if as_arrays else None
+        )
+
+    def latency_report(self, clients, t0=0, t1=0, timespan=3600, workers=8, percentiles=(50, 95, 99)):
+        '''
+        Latency percentiles per traffic category over a set of clients.
+
+        Fetches the latency history of every client concurrently and merges the
+        histograms with array operations. Returns a LatencyReport with
+        percentiles per category overall, per network and over time
+        (awaitable on an AsyncDashboard). Requires numpy.
+
+        PARAMETERS
+            clients:        (networkId, clientId) pairs
+            workers:        Maximum calls in flight
+            percentiles:    Percentiles to report
+        '''
+        report = LatencyReport(percentiles)
+        fanout = FanOut([('latency', self.latency_history, (network, client, t0, t1, timespan, True)) for network, client in clients], workers=workers)
+
+        return report.collect(fanout, self._transport.asynchronous)
 
     def policy(self, network=None, client=None, device_policy=None, group_policy=None, timespan=3600):
         '''
@@ -189,7 +332,7 @@ class Clients(Base):
                 'devicePolicy': device_policy
             })
 
-        return self._get_request(self._parent, network, self._name, client, 'policy', parms=parms)
+        return self._get_request(POLICY, network, client, parms=parms)
 
     def splash_auth_status(self, network=None, client=None, ssid=None, is_authorized=False):
         '''
@@ -217,9 +360,9 @@ class Clients(Base):
                     ssid: {'isAuthorized': is_authorized}
                 }
             }
-            return self._put_request(self._parent, network, self._name, client, 'splashAuthorizationStatus', update=update)
+            return self._put_request(SPLASH_AUTHORIZATION_STATUS, network, client, update=update)
         else:
-            return self._get_request(self._parent, network, self._name, client, 'splashAuthorizationStatus')
+            return self._get_request(SPLASH_AUTHORIZATION_STATUS, network, client)
 
 
 
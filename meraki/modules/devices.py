@@ -5,27 +5,46 @@ from __future__ import print_function
 
 from .base import Base
 from .clients import Clients
-from meraki.exceptions import SerialMissing
+from meraki.routes import Route
+from meraki.series import LossAndLatency
+from meraki.windows import fetch_range, MAX_SPAN
+from meraki.records import Device
+from meraki.exceptions import NetworkIdMissing, IpMissing, SerialMissing
+
+
+DEVICES = Route('networks/{network}/devices')
+DEVICE = Route('networks/{network}/devices/{serial}')
+PERFORMANCE = Route('networks/{network}/devices/{serial}/performance')
+UPLINK = Route('networks/{network}/devices/{serial}/uplink')
+CLAIM = Route('networks/{network}/devices/claim')
+REMOVE = Route('networks/{network}/devices/{serial}/remove')
+LLDP_CDP = Route('networks/{network}/devices/{serial}/lldp_cdp', params=('timespan',))
+LOSS_AND_LATENCY = Route('networks/{network}/devices/{serial}/lossAndLatencyHistory', params=('t0', 't1', 'timespan', 'resolution', 'uplink', 'ip'))
 
 
 class Devices(Base):
-    def __init__(self, api_key=None, parent=None):
-        super(Devices, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, parent=None, transport=None):
+        super(Devices, self).__init__(api_key=api_key, transport=transport)
         self._parent = parent
         self._name = 'devices'
 
         # sub endpoint
-        self.clients = Clients(api_key, self._name)
+        self.clients = Clients(api_key, self._name, transport=self._transport)
 
-    def list(self, network, serial=None):
+    def list(self, network, serial=None, records=False):
         '''
         List the devices in a network
 
         OR
 
         Return a single device or 
+
+        PARAMETERS
+            records:    Return Device records instead of dicts
         '''
-        return self._get_request(self._parent, network, self._name) if serial is None else self._get_request(self._parent, network, self._name, serial)
+        record = Device if records else None
+
+        return self._get_request(DEVICES, network, ttl=300, record=record) if serial is None else self._get_request(DEVICE, network, serial, ttl=300, record=record)
 
     def update(self, network=None, serial=None, update={}):
         '''
@@ -39,7 +58,19 @@ class Devices(Base):
             notes:          The notes for the device. String. Limited to 255 characters.
             moveMapMarker:  Whether or not to set the latitude and longitude of a device based on the new address. Only applies when lat and lng are not specified.
         '''
-        self._put_request(self._parent, network, self._name, serial, update=update)
+        return self._put_request(DEVICE, network, serial, update=update)
+
+    def bulk_update(self, items, workers=8):
+        '''
+        Update many devices concurrently within the rate budget.
+
+        PARAMETERS
+            items:      Iterable of (network, serial, update) tuples
+            workers:    Maximum calls in flight
+
+        Returns a BulkResult with the successes, failures and retries of every item.
+        '''
+        return self._bulk(self.update, items, workers)
 
 
     def performance(self, network=None, serial=None):
@@ -54,7 +85,7 @@ class Devices(Base):
         if serial is None:
             raise SerialMissing
 
-        return self._get_request(self._parent, network, self._name, serial, 'performance')
+        return self._get_request(PERFORMANCE, network, serial)
 
     def uplink(self, network=None, serial=None):
         '''
@@ -66,7 +97,7 @@ class Devices(Base):
         if serial is None:
             raise SerialMissing
 
-        return self._get_request(self._parent, network, self._name, serial, 'uplink')
+        return self._get_request(UPLINK, network, serial)
 
     def claim(self, network=None, serial=None):
         '''
@@ -78,7 +109,7 @@ class Devices(Base):
         if serial is None:
             raise SerialMissing
 
-        return self._post_request(self._parent, network, self._name, 'claim', data={'serial': serial})
+        return self._post_request(CLAIM, network, data={'serial': serial})
 
     def remove(self, network=None, serial=None):
         '''
@@ -90,7 +121,7 @@ class Devices(Base):
         if serial is None:
             raise SerialMissing
 
-        return self._post_request(self._parent, network, self._name, serial, 'remove')
+        return self._post_request(REMOVE, network, serial, data={})
 
     def lldp_cdp(self, network=None, serial=None, timespan=3600):
         '''
@@ -108,11 +139,14 @@ class Devices(Base):
         if timespan > 2592000:
             timespan = 2592000 
 
-        return self._get_request(self._parent, network, self._name, serial, 'lldp_cdp', parms={'timespan': timespan})
+        return self._get_request(LLDP_CDP, network, serial, parms={'timespan': timespan})
 
-    def loss_and_latency(self, network=None, serial=None, t0=0, t1=0, timespan=3600, resolution=60, uplink='wan1', ip=None):
+    def loss_and_latency(self, network=None, serial=None, t0=0, t1=0, timespan=3600, resolution=60, uplink='wan1', ip=None, as_arrays=False):
         '''
         Get the uplink loss percentage and latency in milliseconds for a wired network device.
+
+        PARAMETERS
+            as_arrays:  Return a LossAndLatency series of NumPy columns instead of a list of samples
         '''
         if network is None:
             raise NetworkIdMissing
@@ -139,4 +173,42 @@ class Devices(Base):
                 'timespan': timespan
             })
 
-        return self._get_request(self._parent, network, self._name, serial, 'lossAndLatencyHistory', parms=parms)
+        if as_arrays:
+            return self._series_request(LossAndLatency, self._stream_request(LOSS_AND_LATENCY, network, serial, parms=parms))
+
+        return self._get_request(LOSS_AND_LATENCY, network, serial, parms=parms)
+
+    def loss_and_latency_range(self, devices, t0, t1, resolution=60, uplink='wan1', ip=None, workers=8, as_arrays=False):
+        '''
+        Uplink loss and latency of many devices over any period, past the 30 days
+        a single call returns. t0..t1 is split into windows the server accepts and
+        every window of every device is fetched concurrently, then each device's
+        samples are stitched back in time order with the boundary duplicates dropped.
+
+        Returns a RangeResult keyed by (networkId, serial), awaitable on an
+        AsyncDashboard. A device with a failed window is listed in `incomplete`.
+
+        PARAMETERS
+            devices:    (networkId, serial) pairs
+            t0, t1:     Start and end of the period, epoch seconds
+            workers:    Maximum calls in flight
+            as_arrays:  Stitch every device into a LossAndLatency series of NumPy columns
+        '''
+        if ip is None:
+            raise IpMissing
+
+        def window(network, serial, start, end):
+            return self.loss_and_latency(network, serial, start, end, resolution=resolution, uplink=uplink, ip=ip)
+
+        return fetch_range(
+            window,
+            devices,
+            t0,
+            t1,
+            'startTs',
+            span=MAX_SPAN,
+            align=resolution,
+            workers=workers,
+            asynchronous=self._transport.asynchronous,
+            record=LossAndLatency if as_arrays else None
+        )
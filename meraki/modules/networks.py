@@ -7,31 +7,54 @@ from .base import Base
 from .clients import Clients
 from .devices import Devices
 from .ssids import Ssids
+from meraki.concurrency import FanOut
+from meraki.census import ClientCensus
+from meraki.latency import LatencyReport
+from meraki.routes import Route
+from meraki.records import Network
 from meraki.exceptions import NetworkIdMissing, IpMissing, ClientIdMissing, MacAddressMissing, DevicePolicyMissing, SerialMissing
 
 
+NETWORK = Route('networks/{network}')
+ORGANIZATION_NETWORKS = Route('organizations/{org}/networks')
+BIND = Route('networks/{network}/bind')
+UNBIND = Route('networks/{network}/unbind')
+SITE_TO_SITE_VPN = Route('networks/{network}/siteToSiteVpn')
+TRAFFIC = Route('networks/{network}/traffic', params=('timespan',))
+ACCESS_POLICIES = Route('networks/{network}/accessPolicies')
+AIR_MARSHAL = Route('networks/{network}/airMarshal', params=('timespan',))
+BLUETOOTH_SETTINGS = Route('networks/{network}/bluetoothSettings')
+ALERT_SETTINGS = Route('networks/{network}/alertSettings')
+BLUETOOTH_CLIENTS = Route('networks/{network}/bluetoothClients', params=('timespan', 'includeConnectivityHistory', 'perPage'))
+BLUETOOTH_CLIENT = Route('networks/{network}/bluetoothClients/{client}', params=('includeConnectivityHistory', 'connectivityHistoryTimespan'))
+SPLASH_LOGIN_ATTEMPTS = Route('networks/{network}/splashLoginAttempts', params=('timespan', 'ssidNumber'))
+
+
 class Networks(Base):
-    def __init__(self, api_key=None):
-        super(Networks, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, transport=None):
+        super(Networks, self).__init__(api_key=api_key, transport=transport)
         self._name = 'networks'
         
         # sub endpoint
-        self.clients = Clients(api_key, self._name)
-        self.devices = Devices(api_key, self._name)
-        self.ssids = Ssids(api_key, self._name)
+        self.clients = Clients(api_key, self._name, transport=self._transport)
+        self.devices = Devices(api_key, self._name, transport=self._transport)
+        self.ssids = Ssids(api_key, self._name, transport=self._transport)
 
-    def list(self, id=None):
+    def list(self, id=None, records=False):
         '''
         Return a network
+
+        PARAMETERS
+            records:    Return a Network record instead of a dict
         '''
         if id is None:
             raise NetworkIdMissing
 
-        return self._get_request(self._name, id)
+        return self._get_request(NETWORK, id, ttl=300, record=Network if records else None)
 
-    def create(self, name=None, type=None, tags=[], time_zone='America/Los_Angeles', copy_from_network=None, disable_my_meraki_com=False, disable_remote_status_page=False):
+    def create(self, name=None, type=None, tags=[], time_zone='America/Los_Angeles', copy_from_network=None, disable_my_meraki_com=False, disable_remote_status_page=False, org=None):
         '''
-        Create a network
+        Create a network in the organization `org`
 
         PARAMETERS
             name:                       The name of the new network
@@ -57,7 +80,7 @@ class Networks(Base):
                 'copyFromNetworkId': copy_from_network
             })
         
-        return self._post_request(self._name, id, data=data)
+        return self._post_request(ORGANIZATION_NETWORKS, org, data=data)
 
     def update(self, id, name=None, time_zone='America/Los_Angeles', tags=[], disable_my_meraki_com=False, disable_remote_status_page=False):
         '''
@@ -81,7 +104,7 @@ class Networks(Base):
             'disableRemoteStatusPage': disable_remote_status_page
         }
 
-        return self._put_request(self._name, id, update=update)
+        return self._put_request(NETWORK, id, update=update)
     
     def delete(self, id=None):
         '''
@@ -90,7 +113,7 @@ class Networks(Base):
         if id is None:
             raise NetworkIdMissing
 
-        return self._del_request(self._name, id)
+        return self._del_request(NETWORK, id)
 
     def bind_template(self, id=None, config_template=None, auto_bind=False):
         '''
@@ -108,7 +131,20 @@ class Networks(Base):
             'autoBind': auto_bind
         }
 
-        return self._post_request(self._name, id, 'bind', data=data)
+        return self._post_request(BIND, id, data=data)
+
+    def bulk_bind_template(self, items, workers=8):
+        '''
+        Bind many networks to templates concurrently within the rate budget.
+        POSTs are only retried inside a meraki.retry.retrying() block.
+
+        PARAMETERS
+            items:      Iterable of (network, config_template, auto_bind) tuples
+            workers:    Maximum calls in flight
+
+        Returns a BulkResult with the successes, failures and retries of every item.
+        '''
+        return self._bulk(self.bind_template, items, workers)
 
 
     def unbind_template(self, id=None):
@@ -118,7 +154,7 @@ class Networks(Base):
         if id is None:
             raise NetworkIdMissing
 
-        return self._post_request(self._name, id, 'unbind', data={})
+        return self._post_request(UNBIND, id, data={})
 
 
     def sts_vpn(self, id=None, mode=None, hubs=[], subnets=[]):
@@ -138,9 +174,9 @@ class Networks(Base):
                 'hubs': hubs,
                 'subnets': subnets
             }
-            return self._put_request(self._name, id, 'siteToSiteVpn', update=update)
+            return self._put_request(SITE_TO_SITE_VPN, id, update=update)
         else:
-            return self._get_request(self._name, id, 'siteToSiteVpn')
+            return self._get_request(SITE_TO_SITE_VPN, id)
 
     def traffic(self, id=None, timespan=3600):
         '''
@@ -154,7 +190,7 @@ class Networks(Base):
         if timespan > 2592000:
             timespan = 2592000 
 
-        return self._get_request(self._name, id, 'traffic', parms={'timespan': timespan})
+        return self._get_request(TRAFFIC, id, parms={'timespan': timespan})
 
     def access_polices(self, id=None):
         '''
@@ -163,9 +199,9 @@ class Networks(Base):
         if id is None:
             raise NetworkIdMissing
 
-        return self._get_request(self._name, id, 'accessPolicies')
+        return self._get_request(ACCESS_POLICIES, id)
 
-    def air_marshal(self, id=None):
+    def air_marshal(self, id=None, timespan=3600):
         '''
         List Air Marshal scan results from a network
         '''
@@ -175,7 +211,7 @@ class Networks(Base):
         if timespan > 2592000:
             timespan = 2592000 
 
-        return self._get_request(self._name, id, 'airMarshal', parms={'timespan': timespan})
+        return self._get_request(AIR_MARSHAL, id, parms={'timespan': timespan})
 
     def bluetooth_settings(self, id=None, scanning_enabled=False, advertising_enabled=False, uuid=None, major_minor_assignment_mode=None, major=0, minor=0):
         '''
@@ -209,9 +245,78 @@ class Networks(Base):
                     'minor': minor
                 })
 
-            return self._put_request(self._name, id, 'bluetoothSettings', update=update)
+            return self._put_request(BLUETOOTH_SETTINGS, id, update=update)
         else:
-            return self._get_request(self._name, id, 'bluetoothSettings')
+            return self._get_request(BLUETOOTH_SETTINGS, id)
+
+    def client_census(self, id=None, timespan=86400, workers=8):
+        '''
+        Every client seen by the devices of this network, de-duplicated by MAC.
+
+        Lists the clients of every device concurrently and merges them as they
+        arrive: usage is summed and the device and switchport where the client
+        was last seen are kept. Returns a ClientCensus (awaitable on an AsyncDashboard).
+
+        PARAMETERS
+            timespan:   The timespan for which clients will be fetched, capped to a month (2592000 seconds)
+            workers:    Maximum calls in flight
+        '''
+        if id is None:
+            raise NetworkIdMissing
+
+        def expand(task):
+            if task.kind == 'devices':
+                return [('clients', self.devices.clients.list, (dev['serial'], timespan)) for dev in task.result]
+
+            return []
+
+        fanout = FanOut([('devices', self.devices.list, (id,))], expand=expand, workers=workers)
+
+        return ClientCensus().collect(fanout, self._transport.asynchronous)
+
+    def latency_report(self, ids=[], t0=0, t1=0, timespan=3600, workers=8, percentiles=(50, 95, 99)):
+        '''
+        Latency percentiles per traffic category over every client of a set of networks.
+
+        Lists the devices of each network and their clients, then fetches the
+        latency history of every client concurrently, once per network however
+        many devices saw it. Histograms are merged with array operations into a
+        LatencyReport with percentiles per category overall, per network and
+        over time (awaitable on an AsyncDashboard). Requires numpy.
+
+        PARAMETERS
+            ids:            Network IDs
+            workers:        Maximum calls in flight
+            percentiles:    Percentiles to report
+        '''
+        report = LatencyReport(percentiles)
+        device_network = {}
+        seen = set()
+        clients_timespan = min(t1 - t0 if t0 > 0 and t1 > 0 else timespan, 2592000)
+
+        def expand(task):
+            if task.kind == 'devices':
+                for dev in task.result:
+                    device_network[dev['serial']] = task.args[0]
+
+                return [('clients', self.devices.clients.list, (dev['serial'], clients_timespan)) for dev in task.result]
+
+            if task.kind == 'clients':
+                network = device_network[task.args[0]]
+                calls = []
+
+                for client in task.result:
+                    if (network, client['id']) not in seen:
+                        seen.add((network, client['id']))
+                        calls.append(('latency', self.clients.latency_history, (network, client['id'], t0, t1, timespan, True)))
+
+                return calls
+
+            return []
+
+        fanout = FanOut([('devices', self.devices.list, (id,)) for id in ids], expand=expand, workers=workers)
+
+        return report.collect(fanout, self._transport.asynchronous)
 
     #
     # ALERTS
@@ -246,9 +351,9 @@ class Networks(Base):
                 'alerts': alerts
             }
 
-            return self._put_request(self._name, network, 'alertSettings', update=update)
+            return self._put_request(ALERT_SETTINGS, network, update=update)
         else:
-            return self._get_request(self._name, network, 'alertSettings')
+            return self._get_request(ALERT_SETTINGS, network)
 
     #
     # bluetooth clients
@@ -277,7 +382,7 @@ class Networks(Base):
                 'connectivityHistoryTimespan': timespan
             }
 
-            return self._get_request(self._name, network, 'bluetoothClients', client, parms=parms)
+            return self._get_request(BLUETOOTH_CLIENT, network, client, parms=parms)
         else:
             parms = {
                 'timespan': timespan,
@@ -285,7 +390,31 @@ class Networks(Base):
                 'perPage': per_page
             }
 
-            return self._get_request(self._name, network, 'bluetoothClients', parms=parms)
+            return self._get_request(BLUETOOTH_CLIENTS, network, parms=parms)
+
+    def iter_bluetooth_clients(self, network=None, timespan=3600, include_connectivity_history=False, per_page=30, prefetch=False):
+        '''
+        Iterate over the Bluetooth clients seen by APs in this network, following every page.
+
+        PARAMETERS
+            timespan:                   The timespan, in seconds, used to look back from now for bluetooth clients
+            includeConnectivityHistory: Include the connectivity history for this client
+            perPage:                    The number of entries per page returned
+            prefetch:                   Download the next page in the background while the current one is consumed
+        '''
+        if network is None:
+            raise NetworkIdMissing
+
+        if timespan > 2592000:
+            timespan = 2592000 
+
+        parms = {
+            'timespan': timespan,
+            'includeConnectivityHistory': include_connectivity_history,
+            'perPage': per_page
+        }
+
+        return self._iter_request(BLUETOOTH_CLIENTS, network, parms=parms, prefetch=prefetch)
 
     #
     # splash
@@ -306,4 +435,4 @@ class Networks(Base):
                 'ssidNumber': str(ssid)
             })
 
-        return self._get_request(self._name, network, 'splashLoginAttempts', parms=parms)
+        return self._get_request(SPLASH_LOGIN_ATTEMPTS, network, parms=parms)
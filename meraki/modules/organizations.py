@@ -5,14 +5,35 @@ from __future__ import print_function
 
 from .base import Base
 from .admins import Admins
+from .networks import Networks
+from meraki.scheduler import BULK
+from meraki.concurrency import FanOut
+from meraki.census import ClientCensus
+from meraki.index import InventoryIndex
+from meraki.poller import StatusPoller
+from meraki.routes import Route
+from meraki.records import Device, DeviceStatus, Network
+
+
+ORGANIZATIONS = Route('organizations')
+ORGANIZATION = Route('organizations/{org}')
+CLONE = Route('organizations/{org}/clone')
+CLAIM = Route('organizations/{org}/claim')
+LICENSE_STATE = Route('organizations/{org}/licenseState')
+INVENTORY = Route('organizations/{org}/inventory')
+DEVICE_STATUSES = Route('organizations/{org}/deviceStatuses')
+SNMP = Route('organizations/{org}/snmp')
+THIRD_PARTY_VPN_PEERS = Route('organizations/{org}/thirdPartyVPNPeers')
+NETWORKS = Route('organizations/{org}/networks')
+
 
 class Organizations(Base):
-    def __init__(self, api_key=None):
-        super(Organizations, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, transport=None):
+        super(Organizations, self).__init__(api_key=api_key, transport=transport)
         self._name = 'organizations'
 
         # sub endpoint
-        self.admins = Admins(api_key, self._name)
+        self.admins = Admins(api_key, self._name, transport=self._transport)
 
     def list(self, org=None):
         '''
@@ -22,25 +43,25 @@ class Organizations(Base):
 
         Return an organization
         '''
-        return self._get_request(self._name) if org is None else self._get_request(self._name, org)
+        return self._get_request(ORGANIZATIONS, ttl=300) if org is None else self._get_request(ORGANIZATION, org, ttl=300)
 
     def create(self, data={}):
         '''
         Create a new organization
         '''
-        return self._post_request(self._name, data=data)
+        return self._post_request(ORGANIZATIONS, data=data)
     
     def update(self, org=None, update={}):
         '''
         Update an organization
         '''
-        return self._put_request(self._name, org, update=update)
+        return self._put_request(ORGANIZATION, org, update=update)
 
     def clone(self, org=None, data={}):
         '''
         Create a new organization by cloning the addressed organization
         '''
-        return self._post_request(self._name, org, 'clone', data=data)
+        return self._post_request(CLONE, org, data=data)
 
     def claim(self, org=None, data={}):
         '''
@@ -49,25 +70,51 @@ class Organizations(Base):
         licenses will be added to the organization and devices will be placed in the organization's inventory. 
         These three types of claims are mutually exclusive and cannot be performed in one request.
         '''
-        return self._post_request(self._name, org, 'claim', data=data)
+        return self._post_request(CLAIM, org, data=data)
 
     def license_state(self, org=None):
         '''
         Return the license state for an organization
         '''
-        return self._get_request(self._name, org, 'licenseState')        
+        return self._get_request(LICENSE_STATE, org, ttl=3600)
 
-    def inventory(self, org=None):
+    def inventory(self, org=None, records=False):
         '''
         Return the inventory for an organization
+
+        PARAMETERS
+            records:    Return Device records instead of dicts
+        '''
+        return self._get_request(INVENTORY, org, priority=BULK, ttl=300, record=Device if records else None)
+
+    def iter_inventory(self, org=None, records=False):
+        '''
+        Iterate over the inventory for an organization while it downloads,
+        holding one device at a time instead of the whole response.
+
+        PARAMETERS
+            records:    Yield Device records instead of dicts
         '''
-        return self._get_request(self._name, org, 'inventory')        
+        return self._stream_request(INVENTORY, org, priority=BULK, record=Device if records else None)
     
-    def device_statuses(self, org=None):
+    def device_statuses(self, org=None, records=False):
         '''
         List the status of every Meraki device in the organization
+
+        PARAMETERS
+            records:    Return DeviceStatus records instead of dicts
+        '''
+        return self._get_request(DEVICE_STATUSES, org, priority=BULK, record=DeviceStatus if records else None)
+
+    def iter_device_statuses(self, org=None, records=False):
         '''
-        return self._get_request(self._name, org, 'deviceStatuses')
+        Iterate over the status of every Meraki device in the organization while
+        it downloads, holding one status at a time instead of the whole response.
+
+        PARAMETERS
+            records:    Yield DeviceStatus records instead of dicts
+        '''
+        return self._stream_request(DEVICE_STATUSES, org, priority=BULK, record=DeviceStatus if records else None)
     
     def snmp(self, org=None, update={}):
         '''
@@ -78,9 +125,9 @@ class Organizations(Base):
         Update the SNMP settings for an organization
         '''
         if len(update) == 0:
-            return self._put_request(self._name, org, 'snmp', update=update)
+            return self._put_request(SNMP, org, update=update)
         else:
-            return self._get_request(self._name, org, 'snmp')
+            return self._get_request(SNMP, org)
     
     def third_party_vpn_peers(self, org=None, update={}):
         '''
@@ -91,9 +138,112 @@ class Organizations(Base):
         Update the third party VPN peers for an organization
         '''
         if len(update) == 0:
-            return self._put_request(self._name, org, 'thirdPartyVPNPeers', update=update)
+            return self._put_request(THIRD_PARTY_VPN_PEERS, org, update=update)
         else:
-            return self._get_request(self._name, org, 'thirdPartyVPNPeers')
+            return self._get_request(THIRD_PARTY_VPN_PEERS, org)
+
+    def networks(self, org=None, records=False):
+        '''
+        List the networks in an organization
+
+        PARAMETERS
+            records:    Return Network records instead of dicts
+        '''
+        return self._get_request(NETWORKS, org, record=Network if records else None)
+
+    def iter_networks(self, org=None, records=False):
+        '''
+        Iterate over the networks in an organization while they download
+
+        PARAMETERS
+            records:    Yield Network records instead of dicts
+        '''
+        return self._stream_request(NETWORKS, org, record=Network if records else None)
+
+    def crawl(self, org=None, depth=2, workers=8):
+        '''
+        Walk an organization with concurrent calls, streaming every finished call
+        back as a Task (kind, args, result, error) as soon as it completes.
+        Iterate with `for`, or `async for` on an AsyncDashboard.
+
+        Calls run in the bulk lane under the organization's rate budget. Failed
+        calls are yielded with `error` set and collected in `failures`, the rest
+        of the crawl goes on.
+
+        PARAMETERS
+            depth:      1 networks, 2 adds the devices of every network, 3 adds the uplink of every device
+            workers:    Maximum calls in flight
 
-    def networks(self, org=None):
-        return self._get_request(self._name, org, 'networks')
+            crawl = dash.organizations.crawl(<orgId>, depth=3)
+            for task in crawl:
+                print(task.kind, task.args, task.result)
+            print(crawl.failures)
+        '''
+        networks = Networks(self._api_key, transport=self._transport)
+
+        def expand(task):
+            if task.kind == 'networks' and depth > 1:
+                return [('devices', networks.devices.list, (net['id'],)) for net in task.result]
+
+            if task.kind == 'devices' and depth > 2:
+                return [('uplink', networks.devices.uplink, (task.args[0], dev['serial'])) for dev in task.result]
+
+            return []
+
+        return FanOut([('networks', self.networks, (org,))], expand=expand, workers=workers)
+
+    def client_census(self, org=None, timespan=86400, workers=8):
+        '''
+        Every client seen by the devices of this organization, de-duplicated by MAC.
+
+        Reads the inventory, lists the clients of every device assigned to a
+        network concurrently and merges them as they arrive. Returns a
+        ClientCensus (awaitable on an AsyncDashboard).
+
+        PARAMETERS
+            timespan:   The timespan for which clients will be fetched, capped to a month (2592000 seconds)
+            workers:    Maximum calls in flight
+        '''
+        networks = Networks(self._api_key, transport=self._transport)
+
+        def expand(task):
+            if task.kind == 'inventory':
+                return [('clients', networks.devices.clients.list, (dev['serial'], timespan)) for dev in task.result if dev.get('networkId')]
+
+            return []
+
+        fanout = FanOut([('inventory', self.inventory, (org,))], expand=expand, workers=workers)
+
+        return ClientCensus().collect(fanout, self._transport.asynchronous)
+
+    def index(self, org=None, devices=True, workers=8):
+        '''
+        Local index of the organization's devices by serial, MAC, LAN IP,
+        network, model, tag and status, built from the inventory, the device
+        statuses and the device list of every network fetched concurrently.
+        Returns an InventoryIndex (awaitable on an AsyncDashboard); call its
+        refresh() to apply only what changed since.
+
+        PARAMETERS
+            devices:    Also list the devices of every network, which is where tags come from
+            workers:    Maximum calls in flight
+        '''
+        networks = Networks(self._api_key, transport=self._transport)
+
+        return InventoryIndex(self, networks, org, devices=devices, workers=workers).refresh()
+
+    def status_poller(self, org=None, interval=30.0, min_interval=10.0, max_interval=300.0, queue_size=10000, ignore=(), initial=False):
+        '''
+        Poller of the organization's device statuses emitting only the devices
+        added, removed or changed since the previous poll, see meraki.poller.StatusPoller.
+        Call poll() for one round or start() to poll in the background.
+
+        PARAMETERS
+            interval:       Seconds between the first polls, adapted to the change rate and 429s
+            min_interval:   Shortest interval while devices keep changing
+            max_interval:   Longest interval while nothing changes or the API pushes back
+            queue_size:     Changes buffered for the consumer, the oldest are dropped beyond it
+            ignore:         Status fields that do not count as a change
+            initial:        Emit every device as added on the first poll
+        '''
+        return StatusPoller(self, org, interval=interval, min_interval=min_interval, max_interval=max_interval, queue_size=queue_size, ignore=ignore, initial=initial)
@@ -4,31 +4,56 @@
 from __future__ import print_function
 
 from .base import Base
+from meraki.routes import Route
+from meraki.records import Ssid
+
+
+SSIDS = Route('networks/{network}/ssids')
+SSID = Route('networks/{network}/ssids/{ssid}')
+SPLASH_SETTINGS = Route('networks/{network}/ssids/{ssid}/splashSettings')
 
 
 class Ssids(Base):
-    def __init__(self, api_key=None, parent=None):
-        super(Ssids, self).__init__(api_key=api_key)
+    def __init__(self, api_key=None, parent=None, transport=None):
+        super(Ssids, self).__init__(api_key=api_key, transport=transport)
         self._parent = parent
         self._name = 'ssids'
 
-    def list(self, network=None):
+    def list(self, network=None, records=False):
         '''
         List the SSIDs in a network. Supports networks with access points or wireless-enabled security appliances and teleworker gateways.
+
+        PARAMETERS
+            records:    Return Ssid records instead of dicts
         '''
-        return self._get_request(self._parent, network, self._name)
+        return self._get_request(SSIDS, network, ttl=300, record=Ssid if records else None)
     
-    def get(self, network=None, ssid=None):
+    def get(self, network=None, ssid=None, records=False):
         '''
         Return a single SSID
+
+        PARAMETERS
+            records:    Return an Ssid record instead of a dict
         '''
-        return self._get_request(self._parent, network, self._name, ssid)
+        return self._get_request(SSID, network, ssid, ttl=300, record=Ssid if records else None)
 
     def update(self, network=None, ssid=None, update={}):
         '''
         Update the attributes of an SSID
         '''
-        return self._put_request(self._parent, network, self._name, ssid, update=update)
+        return self._put_request(SSID, network, ssid, update=update)
+
+    def bulk_update(self, items, workers=8):
+        '''
+        Update many SSIDs concurrently within the rate budget.
+
+        PARAMETERS
+            items:      Iterable of (network, ssid, update) tuples
+            workers:    Maximum calls in flight
+
+        Returns a BulkResult with the successes, failures and retries of every item.
+        '''
+        return self._bulk(self.update, items, workers)
     
     def splash_settings(self, network=None, ssid=None, update={}):
         '''
@@ -39,6 +64,6 @@ class Ssids(Base):
         Modify the splash page settings for the given SSID
         '''
         if len(update) == 0:
-            return self._get_request(self._parent, network, self._name, ssid, 'splashSettings')
+            return self._get_request(SPLASH_SETTINGS, network, ssid)
         else:
-            return self._put_request(self._parent, network, self._name, ssid, 'splashSettings', update=update)
+            return self._put_request(SPLASH_SETTINGS, network, ssid, update=update)
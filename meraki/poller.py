@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import queue
+import asyncio
+import threading
+
+from meraki.exceptions import APIError
+from meraki.concurrency import failed
+from meraki.records import Record
+from meraki.retry import last_call
+
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# put on the event queue by stop(), ends iteration
+STOP = object()
+
+
+class StatusChange(object):
+    '''
+    One device that appeared, disappeared or changed between two polls.
+    status is the device's current status, its last one when removed, and
+    changes maps every changed field to its (old, new) values
+    '''
+    __slots__ = ('kind', 'serial', 'status', 'changes')
+
+    def __init__(self, kind, serial, status, changes=None):
+        self.kind = kind
+        self.serial = serial
+        self.status = status
+        self.changes = changes or {}
+
+    def __repr__(self):
+        return '<StatusChange {} {} {}>'.format(self.kind, self.serial, ', '.join(
+            '{}: {!r} -> {!r}'.format(field, old, new) for field, (old, new) in sorted(self.changes.items())
+        ))
+
+
+def fields(old, new):
+    '''
+    {field: (old, new)} of the fields that differ between two status dicts
+    '''
+    return dict((key, (old.get(key), new.get(key))) for key in set(old) | set(new) if old.get(key) != new.get(key))
+
+
+def diff(previous, current):
+    '''
+    StatusChanges turning previous into current, two dicts of statuses by serial
+    '''
+    changes = []
+
+    for serial, status in current.items():
+        old = previous.get(serial)
+
+        if old is None:
+            changes.append(StatusChange(ADDED, serial, status))
+        # whole dict comparison first, fields are only looked at for devices that changed
+        elif old != status:
+            changes.append(StatusChange(CHANGED, serial, status, fields(old, status)))
+
+    for serial in previous.keys() - current.keys():
+        changes.append(StatusChange(REMOVED, serial, previous[serial]))
+
+    return changes
+
+
+class StatusPoller(object):
+    '''
+    Polls the device statuses of an organization and emits only what changed.
+
+    The previous poll is kept by serial and every poll yields StatusChanges
+    for the devices added, removed or changed, with the changed fields. The
+    first poll only records the baseline unless initial is True.
+
+    The interval adapts: it halves, down to min_interval, after a poll that
+    found changes, grows by half, up to max_interval, after a quiet one, and
+    doubles when the poll was throttled (429) or failed so the poller backs
+    off under the organization's rate budget.
+
+    start() polls in a background thread, or an asyncio task on an
+    AsyncDashboard, into a bounded queue; when the consumer falls behind the
+    oldest changes are dropped and counted in `dropped`.
+
+        poller = dash.organizations.status_poller(<orgId>).start()
+        for change in poller:
+            print(change.serial, change.kind, change.changes)
+
+    On an AsyncDashboard use `async for` and `await poller.stop()`.
+
+    PARAMETERS
+        interval:       Seconds between the first polls
+        min_interval:   Shortest interval while devices keep changing
+        max_interval:   Longest interval while nothing changes or the API pushes back
+        queue_size:     Changes buffered for the consumer
+        ignore:         Status fields that do not count as a change
+        initial:        Emit every device as added on the first poll
+    '''
+    def __init__(self, organizations, org, interval=30.0, min_interval=10.0, max_interval=300.0, queue_size=10000, ignore=(), initial=False):
+        self.organizations = organizations
+        self.org = org
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ignore = frozenset(ignore)
+        self.initial = initial
+        self.asynchronous = organizations._transport.asynchronous
+
+        self.state = None
+        self.polls = 0
+        self.errors = 0
+        self.dropped = 0
+        self.last_error = None
+
+        self._queue_size = queue_size
+        self._queue = None
+        self._worker = None
+        self._stop = threading.Event()
+
+    #
+    # POLLING
+    #
+
+    def poll(self):
+        '''
+        Fetch the statuses once and return the changes since the previous poll
+        (a coroutine on an AsyncDashboard). Failures raise; the interval is adapted either way.
+        '''
+        if self.asynchronous:
+            return self._apoll()
+
+        try:
+            result = self.organizations.device_statuses(self.org)
+        except Exception:
+            self._adapt(None, last_call())
+            raise
+
+        return self._polled(result, last_call())
+
+    async def _apoll(self):
+        try:
+            result = await self.organizations.device_statuses(self.org)
+        except Exception:
+            self._adapt(None, last_call())
+            raise
+
+        return self._polled(result, last_call())
+
+    def _polled(self, result, stats):
+        if failed(result):
+            self._adapt(None, stats)
+            raise APIError(result['status'], result['reason'])
+
+        current = {}
+
+        for status in result:
+            status = status.raw if isinstance(status, Record) else status
+
+            if self.ignore:
+                status = dict((key, value) for key, value in status.items() if key not in self.ignore)
+
+            current[status['serial']] = status
+
+        if self.state is None:
+            changes = diff({}, current) if self.initial else []
+        else:
+            changes = diff(self.state, current)
+
+        self.state = current
+        self.polls += 1
+        self._adapt(changes, stats)
+
+        return changes
+
+    def _adapt(self, changes, stats):
+        if changes is None or (stats is not None and stats.throttled):
+            self.interval = min(self.max_interval, self.interval * 2)
+        elif changes:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+    #
+    # BACKGROUND
+    #
+
+    def _publish(self, item):
+        # drop the oldest change rather than block the poller or grow without
+        # bound; the queue holds one more item than queue_size, kept for STOP
+        # so stopping never costs a buffered change
+        while item is not STOP and self._queue.qsize() >= self._queue_size:
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+            except (queue.Empty, asyncio.QueueEmpty):
+                pass
+
+        self._queue.put_nowait(item)
+
+    def _failed(self, error):
+        self.errors += 1
+        self.last_error = error
+
+    def start(self):
+        '''
+        Poll in the background, returns self. On an AsyncDashboard call it inside the event loop
+        '''
+        self._stop.clear()
+
+        if self.asynchronous:
+            self._queue = asyncio.Queue(self._queue_size + 1)
+            self._worker = asyncio.ensure_future(self._arun())
+        else:
+            self._queue = queue.Queue(self._queue_size + 1)
+            self._worker = threading.Thread(target=self._run, name='meraki-status-poller-{}'.format(self.org))
+            self._worker.daemon = True
+            self._worker.start()
+
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                for change in self.poll():
+                    self._publish(change)
+            except Exception as error:
+                self._failed(error)
+
+            self._stop.wait(self.interval)
+
+    async def _arun(self):
+        while True:
+            try:
+                for change in await self.poll():
+                    self._publish(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                self._failed(error)
+
+            await asyncio.sleep(self.interval)
+
+    def stop(self):
+        '''
+        Stop polling and end iteration once the queued changes are consumed
+        (a coroutine on an AsyncDashboard). Does nothing before start()
+        '''
+        self._stop.set()
+
+        if self.asynchronous:
+            return self._astop()
+
+        if self._worker is not None:
+            self._worker.join()
+            self._publish(STOP)
+
+    async def _astop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+            self._publish(STOP)
+
+    def get(self, timeout=None):
+        '''
+        Next change from the background poller, None on timeout or once stopped
+        '''
+        self._started()
+
+        try:
+            item = self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+        if item is STOP:
+            # let other consumers see it too
+            self._queue.put(STOP)
+            return None
+
+        return item
+
+    def _started(self):
+        if self._queue is None:
+            raise RuntimeError('start() the poller before reading its changes')
+
+    def __iter__(self):
+        self._started()
+        return self._changes()
+
+    def _changes(self):
+        while True:
+            item = self._queue.get()
+
+            if item is STOP:
+                self._queue.put(STOP)
+                return
+
+            yield item
+
+    def __aiter__(self):
+        self._started()
+        return self._achanges()
+
+    async def _achanges(self):
+        while True:
+            item = await self._queue.get()
+
+            if item is STOP:
+                self._queue.put_nowait(STOP)
+                return
+
+            yield item
+
+    def __repr__(self):
+        return '<StatusPoller {} {} devices, {} polls, interval {:.1f}s, {} errors, {} dropped>'.format(
+            self.org, len(self.state or ()), self.polls, self.interval, self.errors, self.dropped)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import sys
+
+from meraki.codec import get_codec
+from meraki.concurrency import failed
+
+
+# nested values are kept encoded, whichever codec the transport decodes with
+CODEC = get_codec()
+
+
+def slots(fields, lazy=()):
+    '''
+    Slot names of a record: one per field, prefixed with _ for lazy fields
+    whose attribute is a property decoding the slot
+    '''
+    return tuple('_' + attr if attr in lazy else attr for attr, key in fields)
+
+
+class Record(object):
+    '''
+    Compact, read-only view of one API object; setting or deleting an
+    attribute raises AttributeError.
+
+    Known fields live in __slots__ under snake_case names (network_id for
+    networkId). Strings repeated across thousands of objects (models,
+    statuses, network IDs) are interned so every record shares one copy, and
+    nested lists and dicts listed in LAZY are stored encoded and decoded on
+    every access. Fields missing from the response read as None, keys the
+    record does not know are kept aside, and `raw` rebuilds the original dict.
+
+    The savings depend on the data: they come from the slots, from values
+    repeated across objects and from the nested values kept encoded. Fields
+    that are unique per object (serials, MACs, IPs) are not interned, which
+    would only grow the interpreter's intern table.
+
+    Records also answer record['networkId'] and record.get('networkId') so code
+    written against the plain dicts keeps working.
+    '''
+    __slots__ = ('_extra',)
+
+    FIELDS = ()
+    INTERNED = ()
+    LAZY = ()
+
+    _keys = {}
+    _attrs = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super(Record, cls).__init_subclass__(**kwargs)
+
+        interned = frozenset(cls.INTERNED)
+        cls._keys = {}
+        cls._attrs = {}
+
+        for attr, key in cls.FIELDS:
+            slot = '_' + attr if attr in cls.LAZY else attr
+            cls._keys[key] = (slot, attr in interned, attr in cls.LAZY)
+            cls._attrs[attr] = slot
+
+            if attr in cls.LAZY:
+                setattr(cls, attr, property(cls._lazy(slot)))
+
+    @staticmethod
+    def _lazy(slot):
+        def decode(self):
+            value = getattr(self, slot, None)
+            return CODEC.loads(value) if isinstance(value, bytes) else value
+
+        return decode
+
+    def __init__(self, data):
+        extra = None
+        keys = self._keys
+        set = object.__setattr__
+
+        for key, value in data.items():
+            field = keys.get(key)
+
+            if field is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+                continue
+
+            slot, interned, lazy = field
+
+            if interned and type(value) is str:
+                value = sys.intern(value)
+            elif lazy and isinstance(value, (list, dict)):
+                # copied, orjson hands back its output buffer over-allocated to 1 KB
+                value = bytes(memoryview(CODEC.dumps(value)))
+
+            set(self, slot, value)
+
+        set(self, '_extra', extra)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError('{} records are read-only'.format(type(self).__name__))
+
+    def __delattr__(self, attr):
+        raise AttributeError('{} records are read-only'.format(type(self).__name__))
+
+    @classmethod
+    def wrap(cls, result):
+        '''
+        Records of a decoded response: a list of records for a list, one record
+        for an object. Error dicts and anything else are returned unchanged.
+        '''
+        if isinstance(result, list):
+            return [cls(item) if isinstance(item, dict) else item for item in result]
+
+        if isinstance(result, dict) and not failed(result):
+            return cls(result)
+
+        return result
+
+    def __getattr__(self, attr):
+        # only reached for fields the response did not contain
+        if attr in self._attrs:
+            return None
+
+        raise AttributeError('{} has no field {!r}'.format(type(self).__name__, attr))
+
+    def __getitem__(self, key):
+        field = self._keys.get(key)
+
+        if field is not None:
+            try:
+                # bypasses __getattr__, an unset slot is a missing key here
+                value = object.__getattribute__(self, field[0])
+            except AttributeError:
+                raise KeyError(key)
+
+            return CODEC.loads(value) if field[2] and isinstance(value, bytes) else value
+
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @property
+    def raw(self):
+        '''
+        The object as the API returned it, a new dict on every access
+        '''
+        data = {}
+        missing = object()
+
+        for attr, key in self.FIELDS:
+            value = self.get(key, missing)
+
+            if value is not missing:
+                data[key] = value
+
+        if self._extra is not None:
+            data.update(self._extra)
+
+        return data
+
+    def __reduce__(self):
+        return type(self), (self.raw,)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.raw == other.raw
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        attr, key = self.FIELDS[0]
+        return '<{} {}={!r}>'.format(type(self).__name__, attr, getattr(self, attr))
+
+
+class Device(Record):
+    '''
+    A device of a network or of an organization's inventory
+    '''
+    FIELDS = (
+        ('serial', 'serial'),
+        ('mac', 'mac'),
+        ('model', 'model'),
+        ('name', 'name'),
+        ('network_id', 'networkId'),
+        ('lan_ip', 'lanIp'),
+        ('public_ip', 'publicIp'),
+        ('wan1_ip', 'wan1Ip'),
+        ('wan2_ip', 'wan2Ip'),
+        ('claimed_at', 'claimedAt'),
+        ('lat', 'lat'),
+        ('lng', 'lng'),
+        ('address', 'address'),
+        ('tags', 'tags'),
+        ('firmware', 'firmware'),
+        ('url', 'url'),
+        ('notes', 'notes'),
+        ('floor_plan_id', 'floorPlanId'),
+        ('beacon_id_params', 'beaconIdParams')
+    )
+    INTERNED = ('model', 'network_id', 'tags', 'firmware', 'floor_plan_id')
+    LAZY = ('beacon_id_params',)
+
+    __slots__ = slots(FIELDS, LAZY)
+
+
+class DeviceStatus(Record):
+    '''
+    The status of a device in an organization
+    '''
+    FIELDS = (
+        ('serial', 'serial'),
+        ('name', 'name'),
+        ('mac', 'mac'),
+        ('status', 'status'),
+        ('model', 'model'),
+        ('product_type', 'productType'),
+        ('network_id', 'networkId'),
+        ('lan_ip', 'lanIp'),
+        ('public_ip', 'publicIp'),
+        ('wan1_ip', 'wan1Ip'),
+        ('wan2_ip', 'wan2Ip'),
+        ('using_cellular_failover', 'usingCellularFailover'),
+        ('last_reported_at', 'lastReportedAt')
+    )
+    INTERNED = ('status', 'model', 'product_type', 'network_id')
+
+    __slots__ = slots(FIELDS)
+
+
+class Client(Record):
+    '''
+    A client seen by a device or a network
+    '''
+    FIELDS = (
+        ('mac', 'mac'),
+        ('id', 'id'),
+        ('description', 'description'),
+        ('ip', 'ip'),
+        ('ip6', 'ip6'),
+        ('user', 'user'),
+        ('vlan', 'vlan'),
+        ('switchport', 'switchport'),
+        ('mdns_name', 'mdnsName'),
+        ('dhcp_hostname', 'dhcpHostname'),
+        ('manufacturer', 'manufacturer'),
+        ('os', 'os'),
+        ('ssid', 'ssid'),
+        ('status', 'status'),
+        ('first_seen', 'firstSeen'),
+        ('last_seen', 'lastSeen'),
+        ('recent_device_serial', 'recentDeviceSerial'),
+        ('recent_device_mac', 'recentDeviceMac'),
+        ('usage', 'usage')
+    )
+    INTERNED = ('vlan', 'switchport', 'manufacturer', 'os', 'ssid', 'status', 'recent_device_serial', 'recent_device_mac')
+    LAZY = ('usage',)
+
+    __slots__ = slots(FIELDS, LAZY)
+
+
+class Network(Record):
+    '''
+    A network of an organization
+    '''
+    FIELDS = (
+        ('id', 'id'),
+        ('organization_id', 'organizationId'),
+        ('name', 'name'),
+        ('type', 'type'),
+        ('time_zone', 'timeZone'),
+        ('tags', 'tags'),
+        ('product_types', 'productTypes'),
+        ('config_template_id', 'configTemplateId'),
+        ('disable_my_meraki_com', 'disableMyMerakiCom'),
+        ('disable_remote_status_page', 'disableRemoteStatusPage'),
+        ('enrollment_string', 'enrollmentString')
+    )
+    INTERNED = ('organization_id', 'type', 'time_zone', 'tags', 'config_template_id')
+    LAZY = ('product_types',)
+
+    __slots__ = slots(FIELDS, LAZY)
+
+
+class Ssid(Record):
+    '''
+    An SSID of a network
+    '''
+    FIELDS = (
+        ('number', 'number'),
+        ('name', 'name'),
+        ('enabled', 'enabled'),
+        ('splash_page', 'splashPage'),
+        ('ssid_admin_accessible', 'ssidAdminAccessible'),
+        ('auth_mode', 'authMode'),
+        ('encryption_mode', 'encryptionMode'),
+        ('wpa_encryption_mode', 'wpaEncryptionMode'),
+        ('psk', 'psk'),
+        ('ip_assignment_mode', 'ipAssignmentMode'),
+        ('min_bitrate', 'minBitrate'),
+        ('band_selection', 'bandSelection'),
+        ('per_client_bandwidth_limit_up', 'perClientBandwidthLimitUp'),
+        ('per_client_bandwidth_limit_down', 'perClientBandwidthLimitDown'),
+        ('radius_servers', 'radiusServers'),
+        ('radius_accounting_servers', 'radiusAccountingServers')
+    )
+    INTERNED = ('splash_page', 'auth_mode', 'encryption_mode', 'wpa_encryption_mode', 'ip_assignment_mode', 'band_selection')
+    LAZY = ('radius_servers', 'radius_accounting_servers')
+
+    __slots__ = slots(FIELDS, LAZY)
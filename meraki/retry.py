@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import random
+import contextlib
+import contextvars
+
+
+_post = contextvars.ContextVar('meraki_retry_post', default=False)
+_last = contextvars.ContextVar('meraki_last_call', default=None)
+
+
+@contextlib.contextmanager
+def retrying(post=True):
+    '''
+    Opt in to retrying POST requests issued inside the block.
+    Only use it for calls that are safe to repeat.
+
+        with retrying():
+            dash.networks.devices.claim(<networkId>, <serial>)
+    '''
+    token = _post.set(post)
+    try:
+        yield
+    finally:
+        _post.reset(token)
+
+
+def track(stats):
+    _last.set(stats)
+
+
+def last_call():
+    '''
+    CallStats of the most recent request made from the current thread or task
+    '''
+    return _last.get()
+
+
+class CallStats(object):
+    '''
+    What one call went through. attempts counts the requests the call made,
+    not the shard redirects it followed on the way, which are in redirects
+    '''
+    __slots__ = ('method', 'url', 'name', 'attempts', 'throttled', 'redirects', 'waited', 'status', 'elapsed', 'error')
+
+    def __init__(self, method, url, name=None):
+        self.method = method
+        self.url = url
+        self.name = name
+        self.attempts = 0
+        self.throttled = 0
+        self.redirects = 0
+        self.waited = 0.0
+        self.status = None
+        self.elapsed = 0.0
+        self.error = None
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    def __repr__(self):
+        return '<CallStats {} {} attempts={} throttled={} redirects={} status={}>'.format(
+            self.method, self.url, self.attempts, self.throttled, self.redirects, self.status)
+
+
+class RetryPolicy(object):
+    '''
+    When and how long to wait before sending a failed request again.
+
+    GET, PUT and DELETE are retried on connection errors and on the listed
+    status codes. POST is only retried inside a retrying() block.
+
+    PARAMETERS
+        max_attempts:   Total attempts per call, including the first one
+        backoff:        Delay before the first retry, doubled on every attempt
+        max_backoff:    Upper bound for a single delay
+        budget:         Seconds a call may spend in total before retries stop
+        jitter:         Randomize each delay between 0 and its computed value
+        statuses:       HTTP status codes worth retrying
+    '''
+    IDEMPOTENT = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS')
+
+    def __init__(self, max_attempts=4, backoff=0.5, max_backoff=30.0, budget=120.0, jitter=True, statuses=(500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+
+    def retryable(self, method, status=None):
+        if method not in self.IDEMPOTENT and not _post.get():
+            return False
+
+        return status is None or status in self.statuses
+
+    def delay(self, attempt):
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def next_delay(self, stats, elapsed, status=None):
+        '''
+        Seconds to wait before the next attempt, None when the call must give up
+        '''
+        if stats.attempts - stats.throttled >= self.max_attempts or not self.retryable(stats.method, status):
+            return None
+
+        delay = self.delay(stats.attempts)
+
+        if elapsed + delay > self.budget:
+            return None
+
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import re
+import string
+import functools
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+from meraki.exceptions import ParameterMissing, ParameterUnknown
+
+
+# path values and query strings made only of these need no percent-encoding
+_plain = re.compile(r'[A-Za-z0-9_.~-]*\Z').match
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote(value):
+    return value if _plain(value) else quote(value, safe='')
+
+
+def encode(value):
+    kind = type(value)
+
+    if kind is str:
+        return _quote(value)
+
+    if kind is int:
+        return str(value)
+
+    if kind is bool:
+        return 'true' if value else 'false'
+
+    if value is None:
+        raise ParameterMissing('value required')
+
+    return _quote(str(value))
+
+
+class Route(object):
+    '''
+    Path template and accepted query parameters of one endpoint.
+
+    Templates are parsed once, when the endpoint module is imported, into a
+    positional format string, prefixed with the API root on first use of each
+    root; building a URL is then one str.format call over the percent-encoded
+    path values, skipped for values that need no percent-encoding, checked
+    with one regex over all of them. Encoded query strings are cached by
+    their parameters.
+
+        Route('networks/{network}/devices/{serial}/uplink').url(base, ('N_1', 'Q2XX'))
+
+    The route name is the template without its placeholders,
+    e.g. networks.devices.uplink, and labels the endpoint in caches and metrics.
+    '''
+    __slots__ = ('template', 'name', 'fields', 'params', '_pattern', '_format', '_bases', '_queries')
+
+    def __init__(self, template, params=()):
+        fields = []
+        parts = []
+
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+
+            if field is not None:
+                parts.append('{%d}' % len(fields))
+                fields.append(field)
+
+        self.template = template
+        self.name = '.'.join(part for part in template.split('/') if not part.startswith('{'))
+        self.fields = tuple(fields)
+        self.params = frozenset(params)
+        self._pattern = ''.join(parts)
+        self._format = self._pattern.format
+        # format of the full URL by API root
+        self._bases = {}
+        self._queries = functools.lru_cache(maxsize=256)(self._query)
+
+    def __repr__(self):
+        return '<Route {}>'.format(self.template)
+
+    def _fill(self, format, values):
+        if len(values) != len(self.fields):
+            raise ParameterMissing('{} expects {}'.format(self.template, ', '.join(self.fields)))
+
+        try:
+            return format(*[encode(value) for value in values])
+        except ParameterMissing:
+            field = self.fields[list(values).index(None)]
+            raise ParameterMissing('{} is required by {}'.format(field, self.template))
+
+    def path(self, values):
+        return self._fill(self._format, values)
+
+    def _query(self, items):
+        return '&'.join([key + '=' + encode(value) for key, value in items if value is not None])
+
+    def query(self, parms):
+        if not self.params.issuperset(parms):
+            raise ParameterUnknown(sorted(set(parms) - self.params)[0], self.template)
+
+        items = tuple(parms.items())
+
+        try:
+            return self._queries(items)
+        except TypeError:
+            # an unhashable value, e.g. a list
+            return self._query(items)
+
+    def _bind(self, base_url):
+        format = self._bases[base_url] = (base_url.replace('{', '{{').replace('}', '}}') + '/' + self._pattern).format
+        return format
+
+    def url(self, base_url, values, parms=None):
+        format = self._bases.get(base_url) or self._bind(base_url)
+
+        try:
+            # the usual case, IDs and serials that need no encoding: one regex over all of them
+            plain = len(values) == len(self.fields) and _plain(''.join(values))
+        except TypeError:
+            # not all strings
+            plain = False
+
+        url = format(*values) if plain else self._fill(format, values)
+
+        if parms:
+            query = self.query(parms)
+
+            if query:
+                url = url + '?' + query
+
+        return url
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+import contextlib
+import contextvars
+
+
+# priority lanes, lower runs first
+INTERACTIVE = 0
+DEFAULT = 1
+BULK = 2
+
+LANES = {
+    'interactive': INTERACTIVE,
+    'default': DEFAULT,
+    'bulk': BULK
+}
+
+_lane = contextvars.ContextVar('meraki_lane', default=None)
+
+
+@contextlib.contextmanager
+def lane(name):
+    '''
+    Run every request issued inside the block in the given priority lane.
+    Calls made with an explicit priority keep it.
+
+        with lane('bulk'):
+            for net in nets:
+                dash.networks.devices.list(net)
+    '''
+    token = _lane.set(LANES.get(name, name))
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane(default=DEFAULT):
+    value = _lane.get()
+    return default if value is None else value
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TokenBucket(object):
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.paused_until = 0.0
+
+    def delay(self, now):
+        '''
+        Seconds until a token is available
+        '''
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+        if self.tokens >= 1:
+            return 0.0
+
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def pause(self, seconds):
+        # Retry-After: nothing leaves this bucket until the server says so
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class Scheduler(object):
+    '''
+    Per-organization token buckets with priority lanes.
+
+    Every request waits for a token from the bucket of the organization it
+    targets. Waiters are served by lane first (interactive, default, bulk)
+    and then in arrival order, so short lookups overtake long crawls.
+
+    PARAMETERS
+        rate:   Requests per second allowed per organization
+        burst:  Requests that may be sent back to back before pacing starts
+    '''
+    def __init__(self, rate=5, burst=None):
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+
+        self._lock = threading.Lock()
+        # notified whenever a waiter leaves a queue or a bucket is paused
+        self._changed = threading.Condition(self._lock)
+        # (loop, future) of every coroutine waiting for a notification
+        self._sleepers = []
+        self._buckets = {}
+        self._waiters = {}
+        self._counter = itertools.count()
+
+    def throttle(self, key, retry_after):
+        with self._lock:
+            self._bucket(key).pause(retry_after)
+            self._notify()
+
+    def acquire(self, key, priority=DEFAULT):
+        '''
+        Block until a request for key may be sent, return the time waited
+        '''
+        start = time.monotonic()
+        entry = self._enqueue(key, priority)
+
+        try:
+            with self._changed:
+                wait = self._turn(key, entry)
+
+                while wait is None or wait > 0:
+                    self._changed.wait(wait)
+                    wait = self._turn(key, entry)
+        except BaseException:
+            # KeyboardInterrupt or the like, do not hold up the queue
+            self._cancel(key, entry)
+            raise
+
+        return time.monotonic() - start
+
+    async def acquire_async(self, key, priority=DEFAULT):
+        start = time.monotonic()
+        entry = self._enqueue(key, priority)
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                with self._lock:
+                    wait = self._turn(key, entry)
+
+                    if wait == 0:
+                        break
+
+                    woken = loop.create_future()
+                    self._sleepers.append((loop, woken))
+
+                await asyncio.wait([woken], timeout=wait)
+        except BaseException:
+            self._cancel(key, entry)
+            raise
+
+        return time.monotonic() - start
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+
+        return bucket
+
+    def _enqueue(self, key, priority):
+        entry = (priority, next(self._counter))
+
+        with self._lock:
+            heapq.heappush(self._waiters.setdefault(key, []), entry)
+
+        return entry
+
+    def _cancel(self, key, entry):
+        with self._lock:
+            waiters = self._waiters[key]
+
+            # already gone when the interruption came right after its turn
+            if entry in waiters:
+                waiters.remove(entry)
+                heapq.heapify(waiters)
+                self._notify()
+
+    def _notify(self):
+        '''
+        Wake every waiter to check whether its turn came, with the lock held
+        '''
+        self._changed.notify_all()
+
+        for loop, woken in self._sleepers:
+            try:
+                loop.call_soon_threadsafe(_wake, woken)
+            except RuntimeError:
+                # loop closed
+                pass
+
+        self._sleepers = []
+
+    def _turn(self, key, entry):
+        '''
+        Take a token if entry is first in line and one is available and
+        return 0. Otherwise the seconds until the bucket refills, or None
+        when somebody is ahead, with the lock held
+        '''
+        waiters = self._waiters[key]
+
+        if waiters[0] != entry:
+            return None
+
+        wait = self._bucket(key).delay(time.monotonic())
+
+        if wait > 0:
+            return wait
+
+        self._bucket(key).take()
+        heapq.heappop(waiters)
+        self._notify()
+
+        return 0.0
@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import sys
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from meraki.concurrency import failed
+from meraki.exceptions import APIError
+
+
+TIME = 'time'
+NUMBER = 'number'
+TEXT = 'text'
+
+NAT = 'NaT'
+
+
+def times(values):
+    '''
+    datetime64[ms] array of ISO 8601 strings or epoch seconds, NaT where missing
+    '''
+    sample = next((value for value in values if value is not None), None)
+
+    if isinstance(sample, str):
+        # numpy parses naive ISO 8601 only, every API timestamp is UTC
+        return numpy.array([NAT if value is None else value.rstrip('Z') for value in values], dtype='datetime64[ms]')
+
+    seconds = numpy.array(values, dtype='float64')
+    missing = numpy.isnan(seconds)
+    seconds[missing] = 0
+    result = (seconds * 1000).astype('int64').astype('datetime64[ms]')
+    result[missing] = numpy.datetime64(NAT)
+
+    return result
+
+
+def numbers(values):
+    # None becomes NaN
+    return numpy.array(values, dtype='float64')
+
+
+def texts(values):
+    return numpy.array([sys.intern(value) if type(value) is str else value for value in values], dtype=object)
+
+
+def flatten(rows, width):
+    '''
+    len(rows) x width float64 array of the values of dicts sharing the same keys
+    '''
+    try:
+        values = numpy.fromiter(itertools.chain.from_iterable([row.values() for row in rows]), 'float64', len(rows) * width)
+    except TypeError:
+        # None somewhere, numpy.array turns it into NaN
+        values = numpy.array([list(row.values()) for row in rows], dtype='float64')
+
+    return values.reshape(len(rows), width)
+
+
+DECODERS = {
+    TIME: times,
+    NUMBER: numbers,
+    TEXT: texts
+}
+
+
+class Columns(object):
+    '''
+    Values of every column of a series, filled one sample at a time so the
+    samples themselves are dropped as soon as they are read
+    '''
+    def __init__(self, series):
+        self.series = series
+        self.values = [(key, []) for attr, key, kind in series.COLUMNS]
+
+    def add(self, sample):
+        for key, values in self.values:
+            values.append(sample.get(key))
+
+    def decoded(self):
+        return {attr: DECODERS[kind](values) for (attr, key, kind), (_, values) in zip(self.series.COLUMNS, self.values)}
+
+    def build(self):
+        return self.series(**self.decoded())
+
+
+class Series(object):
+    '''
+    Columnar view of a time series response: one NumPy array per field
+    instead of one dict per sample. Timestamps are datetime64[ms] (UTC),
+    numbers float64 with NaN for missing samples, text object arrays of
+    interned strings. Keys outside COLUMNS are dropped.
+
+    Columns are attributes under snake_case names and also answer their API
+    key, series.latency_ms is series['latencyMs']. Requires numpy.
+    '''
+    __slots__ = ()
+
+    COLUMNS = ()
+    COLLECTOR = Columns
+
+    def __init__(self, **columns):
+        for attr, key, kind in self.COLUMNS:
+            setattr(self, attr, columns[attr])
+
+    @classmethod
+    def wrap(cls, result):
+        '''
+        Series of a decoded response. Error dicts are returned unchanged.
+        '''
+        if numpy is None:
+            raise ImportError('as_arrays requires numpy: pip install meraki-dashboard-api[arrays]')
+
+        if failed(result) or not isinstance(result, list):
+            return result
+
+        return cls.from_samples(result)
+
+    @classmethod
+    def from_samples(cls, samples):
+        '''
+        Series of an iterable of samples, e.g. Transport.stream or
+        Transport.paginate, read element by element. An APIError raised by the
+        iterable is returned as the usual error dict.
+        '''
+        if numpy is None:
+            raise ImportError('as_arrays requires numpy: pip install meraki-dashboard-api[arrays]')
+
+        columns = cls.COLLECTOR(cls)
+
+        try:
+            for sample in samples:
+                columns.add(sample)
+        except APIError as error:
+            return cls._error(error)
+
+        return columns.build()
+
+    @classmethod
+    async def from_async_samples(cls, samples):
+        '''
+        Coroutine version of from_samples for async iterables
+        '''
+        if numpy is None:
+            raise ImportError('as_arrays requires numpy: pip install meraki-dashboard-api[arrays]')
+
+        columns = cls.COLLECTOR(cls)
+
+        try:
+            async for sample in samples:
+                columns.add(sample)
+        except APIError as error:
+            return cls._error(error)
+
+        return columns.build()
+
+    @staticmethod
+    def _error(error):
+        status, reason = error.args
+        return {'status': status, 'reason': reason}
+
+    def __len__(self):
+        return len(getattr(self, self.COLUMNS[0][0]))
+
+    def __getitem__(self, key):
+        for attr, name, kind in self.COLUMNS:
+            if key == name or key == attr:
+                return getattr(self, attr)
+
+        raise KeyError(key)
+
+    def as_dict(self):
+        '''
+        The columns by API key
+        '''
+        return {key: getattr(self, attr) for attr, key, kind in self.COLUMNS}
+
+    def __repr__(self):
+        return '<{} {} samples>'.format(type(self).__name__, len(self))
+
+
+class LossAndLatency(Series):
+    '''
+    Uplink loss and latency of a wired device
+    '''
+    COLUMNS = (
+        ('start', 'startTs', TIME),
+        ('end', 'endTs', TIME),
+        ('loss_percent', 'lossPercent', NUMBER),
+        ('latency_ms', 'latencyMs', NUMBER)
+    )
+
+    __slots__ = tuple(attr for attr, key, kind in COLUMNS)
+
+
+class UsageHistory(Series):
+    '''
+    Daily usage of a client, in kilobytes
+    '''
+    COLUMNS = (
+        ('ts', 'ts', TIME),
+        ('received', 'received', NUMBER),
+        ('sent', 'sent', NUMBER)
+    )
+
+    __slots__ = tuple(attr for attr, key, kind in COLUMNS)
+
+
+class TrafficHistory(Series):
+    '''
+    Traffic of a client per application and destination, in kilobytes
+    '''
+    COLUMNS = (
+        ('ts', 'ts', TIME),
+        ('application', 'application', TEXT),
+        ('destination', 'destination', TEXT),
+        ('protocol', 'protocol', TEXT),
+        ('port', 'port', NUMBER),
+        ('sent', 'sent', NUMBER),
+        ('recv', 'recv', NUMBER),
+        ('num_flows', 'numFlows', NUMBER),
+        ('active_seconds', 'activeSeconds', NUMBER)
+    )
+
+    __slots__ = tuple(attr for attr, key, kind in COLUMNS)
+
+
+class Histograms(Columns):
+    '''
+    Columns of a LatencyHistory, keeping the histogram of every sample until
+    the buckets of the whole series are known
+    '''
+    def __init__(self, series):
+        super(Histograms, self).__init__(series)
+        self.histograms = []
+
+    def add(self, sample):
+        super(Histograms, self).add(sample)
+        self.histograms.append(sample.get('latencyBinsByCategory') or {})
+
+    def build(self):
+        histograms = self.histograms
+        names = sorted({name for histogram in histograms for name in histogram})
+        layouts = {tuple(bins) for histogram in histograms for bins in histogram.values() if bins}
+        labels = sorted({label for layout in layouts for label in layout}, key=float)
+        column = {label: i for i, label in enumerate(labels)}
+        categories = {}
+
+        # the usual case: every sample has every category, listing the same buckets in the same order
+        uniform = len(layouts) == 1 and all(len(histogram) == len(names) and all(histogram.values()) for histogram in histograms)
+
+        for name in names:
+            if uniform:
+                layout = next(iter(layouts))
+                counts = numpy.empty((len(histograms), len(labels)))
+                counts[:, [column[label] for label in layout]] = flatten([histogram[name] for histogram in histograms], len(layout))
+            else:
+                counts = numpy.full((len(histograms), len(labels)), numpy.nan)
+
+                for row, histogram in enumerate(histograms):
+                    bins = histogram.get(name)
+
+                    if bins:
+                        counts[row, [column[label] for label in bins]] = list(bins.values())
+
+            categories[name] = counts
+
+        return self.series(bins=numpy.array(labels, dtype='float64'), categories=categories, **self.decoded())
+
+
+class LatencyHistory(Series):
+    '''
+    Latency histograms of a client per traffic category.
+
+    bins holds the upper bound in milliseconds of every latency bucket, in
+    increasing order, and categories maps each category (backgroundTraffic,
+    bestEffortTraffic, videoTraffic, voiceTraffic) to a samples x bins float64
+    array of packet counts, NaN where a sample has no count for a bucket.
+    '''
+    COLUMNS = (
+        ('t0', 't0', TIME),
+        ('t1', 't1', TIME)
+    )
+
+    __slots__ = ('t0', 't1', 'bins', 'categories')
+
+    COLLECTOR = Histograms
+
+    def __init__(self, bins=None, categories=None, **columns):
+        super(LatencyHistory, self).__init__(**columns)
+        self.bins = bins
+        self.categories = categories
+
+    def __getitem__(self, key):
+        if key in self.categories:
+            return self.categories[key]
+
+        return super(LatencyHistory, self).__getitem__(key)
+
+    def as_dict(self):
+        result = super(LatencyHistory, self).as_dict()
+        result['bins'] = self.bins
+        result.update(self.categories)
+        return result
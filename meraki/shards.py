@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+
+REDIRECTS = (301, 302, 303, 307, 308)
+
+
+class ShardMap(object):
+    '''
+    Which organization owns each network and which shard serves each organization.
+
+    api.meraki.com redirects every call to the organization's shard
+    (nXXX.meraki.com). Once an organization's shard is known, calls for it, for
+    its networks and for its devices are sent there directly and the redirect
+    round trip is saved.
+    '''
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self._base_path = urlsplit(base_url).path.rstrip('/')
+        self._networks = {}
+        self._devices = {}
+        self._shards = {}
+        self._listed = set()
+
+    def listed(self, url):
+        '''
+        Whether the devices or networks of a listing URL were already bound,
+        marks it as bound otherwise. Repeated polls of a listing skip the walk
+        '''
+        if url in self._listed:
+            return True
+
+        self._listed.add(url)
+        return False
+
+    def bind(self, network, org):
+        self._networks[network] = org
+
+    def bind_device(self, serial, network=None, org=None):
+        '''
+        Record the network or the organization of a device. Device lists only
+        carry the network, resolved to its organization when the device is routed
+        '''
+        if org is None:
+            org = self._devices.get(serial, (None, None))[1]
+
+        self._devices[serial] = (network, org)
+
+    def org(self, segments):
+        '''
+        Organization addressed by a request path split on "/", relative to the API root
+        '''
+        if len(segments) > 1:
+            if segments[0] == 'organizations':
+                return segments[1]
+
+            if segments[0] == 'networks':
+                return self._networks.get(segments[1])
+
+            if segments[0] == 'devices':
+                network, org = self._devices.get(segments[1], (None, None))
+                return org or self._networks.get(network)
+
+        return None
+
+    def shard(self, org):
+        return self._shards.get(org)
+
+    def route(self, url, org):
+        '''
+        Rewrite an api.meraki.com URL to the organization's shard, when known
+        '''
+        shard = self._shards.get(org)
+
+        if shard is None or not url.startswith(self.base_url):
+            return url
+
+        return shard + url[len(self.base_url):]
+
+    def learn(self, org, url):
+        '''
+        Record the shard from a URL served by it, returns the shard root
+        '''
+        parts = urlsplit(url)
+        shard = '{}://{}{}'.format(parts.scheme, parts.netloc, self._base_path)
+
+        if org is not None:
+            self._shards[org] = shard
+
+        return shard
+
+    def learn_org(self, org):
+        # organization objects carry their dashboard url on the shard host
+        if isinstance(org, dict) and org.get('id') and org.get('url'):
+            parts = urlsplit(org['url'])
+
+            if parts.netloc:
+                self._shards[str(org['id'])] = '{}://{}{}'.format(parts.scheme, parts.netloc, self._base_path)
+
+    def invalidate(self, org):
+        self._shards.pop(org, None)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import zlib
+import sqlite3
+import threading
+
+
+# endpoints a service needs before it can answer anything, and which rarely change
+ENDPOINTS = (
+    'organizations',
+    'organizations.networks',
+    'organizations.inventory',
+    'networks',
+    'networks.devices',
+    'networks.ssids'
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resources (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    etag TEXT,
+    modified TEXT,
+    compressed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_path ON resources (path);
+'''
+
+
+class SnapshotStats(object):
+    __slots__ = ('served', 'stores', 'revalidated', 'not_modified', 'failed', 'invalidations')
+
+    def __init__(self):
+        self.served = 0
+        self.stores = 0
+        self.revalidated = 0
+        self.not_modified = 0
+        self.failed = 0
+        self.invalidations = 0
+
+    def as_dict(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+
+class SnapshotEntry(object):
+    __slots__ = ('key', 'fetched', 'etag', 'modified', 'body')
+
+    def __init__(self, key, fetched, etag, modified, body):
+        self.key = key
+        self.fetched = fetched
+        self.etag = etag
+        self.modified = modified
+        self.body = body
+
+    @property
+    def age(self):
+        return time.time() - self.fetched
+
+
+class SnapshotStore(object):
+    '''
+    Persistent copy of GET response bodies in a SQLite file, for warm starts.
+
+    GETs of the covered endpoints are answered from the snapshot when it has
+    them, however old, so a restarted service can answer straight away. An
+    entry older than `refresh` seconds is then fetched again in the background,
+    with its ETag / Last-Modified so an unchanged resource costs a 304, and
+    the snapshot is updated for the next read. Writes drop the entries of the
+    written path, its parents and its children, like the ResponseCache.
+
+    Bodies are stored as the API sent them, zlib compressed unless compress is
+    False, with the time they were fetched. Entries are keyed on path and query
+    string, not on the shard that served them.
+
+    PARAMETERS
+        path:           SQLite file, ':memory:' for a throwaway store
+        endpoints:      Endpoint names served from the snapshot, e.g. 'organizations.inventory'
+        refresh:        Age in seconds past which a served entry is revalidated in the background
+        compress:       zlib compress the stored bodies
+        level:          zlib compression level
+    '''
+    def __init__(self, path, endpoints=ENDPOINTS, refresh=60.0, compress=True, level=6):
+        self.path = path
+        self.endpoints = frozenset(endpoints)
+        self.refresh = refresh
+        self.compress = compress
+        self.level = level
+        self.stats = SnapshotStats()
+
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+
+        self._db.executescript(SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM resources').fetchone()[0]
+
+    def covers(self, name):
+        return name in self.endpoints
+
+    def get(self, key):
+        '''
+        The SnapshotEntry stored under key, None when there is none
+        '''
+        with self._lock:
+            row = self._db.execute('SELECT fetched, etag, modified, compressed, body FROM resources WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        fetched, etag, modified, compressed, body = row
+        self.stats.served += 1
+
+        return SnapshotEntry(key, fetched, etag, modified, zlib.decompress(body) if compressed else bytes(body))
+
+    def put(self, key, path, name, body, headers=None, fetched=None):
+        headers = headers or {}
+        stored = zlib.compress(body, self.level) if self.compress else body
+
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, path, name, time.time() if fetched is None else fetched, headers.get('ETag'), headers.get('Last-Modified'), int(self.compress), len(body), stored)
+            )
+
+        self.stats.stores += 1
+
+    def touch(self, key, fetched=None):
+        '''
+        Mark an entry as confirmed by the server just now
+        '''
+        with self._lock:
+            self._db.execute('UPDATE resources SET fetched = ? WHERE key = ?', (time.time() if fetched is None else fetched, key))
+
+    def stale(self, entry):
+        return entry.age > self.refresh
+
+    def invalidate(self, path, extra=()):
+        '''
+        Drop the entries for path, its parents, its children and any extra paths
+        '''
+        parts = path.split('/')
+        parents = ['/'.join(parts[:i]) for i in range(1, len(parts))]
+
+        with self._lock:
+            cursor = self._db.execute(
+                'DELETE FROM resources WHERE path = ? OR path LIKE ? ESCAPE \'\\\' OR path IN ({})'.format(', '.join('?' * (len(parents) + len(extra))) or "''"),
+                [path, path.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'] + parents + list(extra)
+            )
+
+        self.stats.invalidations += cursor.rowcount
+
+    def resources(self):
+        '''
+        (key, endpoint name, fetched, size) of every entry, the per-resource timestamps
+        '''
+        with self._lock:
+            return self._db.execute('SELECT key, name, fetched, size FROM resources ORDER BY key').fetchall()
+
+    def claim(self, key):
+        '''
+        True when no revalidation of key is in flight, and mark one as started
+        '''
+        with self._lock:
+            if key in self._pending:
+                return False
+
+            self._pending.add(key)
+            return True
+
+    def release(self, key):
+        with self._lock:
+            self._pending.discard(key)
+
+    @property
+    def pending(self):
+        '''
+        Number of background revalidations in flight
+        '''
+        return len(self._pending)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM resources')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
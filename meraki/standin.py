@@ -0,0 +1,1193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+Local stand-in for the Dashboard API, for load tests and benchmarks.
+
+Serves synthetic organizations of configurable size on the routes this
+package calls, with configurable latency, 429 responses with Retry-After
+past a per-organization rate, Link header pages and shard redirects.
+
+Every Route the meraki.modules declare is served: the ones without a
+handler of their own yet answer GET with {} and echo the body of writes,
+and are listed in StandIn.generic.
+
+    python -m meraki.standin --organizations 2 --networks 50 --devices 20 --latency 0.05 --rate 10 --shards 2
+
+or from Python:
+
+    with StandIn(networks=50, latency=0.05) as api:
+        dash = Dashboard('key', base_url=api.url)
+'''
+
+from __future__ import print_function
+
+import re
+import sys
+import json
+import time
+import random
+import zlib
+import copy
+import pkgutil
+import hashlib
+import argparse
+import importlib
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from urllib.parse import urlsplit, parse_qsl, urlencode
+except ImportError:
+    from urlparse import urlsplit, parse_qsl
+    from urllib import urlencode
+
+import meraki.modules
+from meraki.routes import Route
+
+
+BASE_PATH = '/api/v0'
+
+MODELS = ('MR42', 'MR33', 'MS220-8P', 'MS225-48LP', 'MX84', 'MX68', 'MV12W')
+STATUSES = ('online', 'online', 'online', 'online', 'offline', 'alerting')
+CATEGORIES = ('backgroundTraffic', 'bestEffortTraffic', 'videoTraffic', 'voiceTraffic')
+BINS = ('0.5', '1.0', '2.0', '4.0', '8.0', '16.0', '32.0', '64.0', '128.0', '256.0', '512.0', '1024.0', '2048.0')
+APPLICATIONS = ('Google HTTPS', 'Office 365', 'Slack', 'Zoom', 'Miscellaneous web', 'DNS')
+
+# HTTP method of every action batch operation
+OPERATIONS = {'create': 'POST', 'update': 'PUT', 'destroy': 'DELETE'}
+
+# longest t0..t1 span the history routes accept
+MAX_SPAN = 2592000
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def stable(value):
+    '''
+    Hash of a string that, unlike hash(), is the same in every process
+    '''
+    return zlib.crc32(value.encode('utf8'))
+
+
+def iso(seconds):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+
+
+def window(query, default=3600):
+    '''
+    (t0, t1) of a history query, from t0/t1 or timespan
+    '''
+    if 't0' in query and 't1' in query:
+        t0, t1 = int(query['t0']), int(query['t1'])
+    else:
+        t1 = int(time.time())
+        t0 = t1 - int(query.get('timespan', default))
+
+    if t1 - t0 > MAX_SPAN or t1 < t0:
+        raise BadRequest('t0 and t1 must be at most {} seconds apart'.format(MAX_SPAN))
+
+    return t0, t1
+
+
+class Organization(object):
+    '''
+    Synthetic organization: networks, devices in them, clients of every
+    device, SSIDs and administrators, generated from a seed
+    '''
+    def __init__(self, id, index, networks=10, devices=20, clients=10, seed=0):
+        rand = random.Random('{}-{}'.format(seed, id))
+
+        self.id = id
+        self.name = 'Stand-in organization {}'.format(index)
+        self.clients_per_device = clients
+        self.seed = seed
+        self.networks = {}
+        self.devices = {}
+        self.admins = {}
+        self.batches = {}
+        self._clients = {}
+        self._client_index = {}
+
+        for n in range(networks):
+            network = 'N_{}{:06d}'.format(id, n)
+            self.networks[network] = {
+                'id': network,
+                'organizationId': id,
+                'name': 'Site {} {}'.format(index, n),
+                'timeZone': 'America/Los_Angeles',
+                'tags': ' branch ' if n % 4 else ' hq ',
+                'type': 'combined',
+                'productTypes': ['appliance', 'switch', 'wireless'],
+                'disableMyMerakiCom': False,
+                'disableRemoteStatusPage': True
+            }
+
+            for d in range(devices):
+                serial = 'Q2{}-{:04X}-{:04X}'.format(id[-2:], n, d)
+                model = MODELS[rand.randrange(len(MODELS))]
+                self.devices[serial] = {
+                    'serial': serial,
+                    'mac': '88:15:44:{:02x}:{:02x}:{:02x}'.format(index & 255, n & 255, d & 255),
+                    'name': '{}-{}-{}'.format(model.lower(), n, d),
+                    'model': model,
+                    'networkId': network,
+                    'lanIp': '10.{}.{}.{}'.format(n >> 8 & 255, n & 255, 10 + d % 240),
+                    'tags': ' floor{} '.format(d % 4),
+                    'lat': 37.4180951010362 + n / 1000.0,
+                    'lng': -122.098531723022 - d / 1000.0,
+                    'address': '{} Main St'.format(n),
+                    'firmware': 'wireless-25-13',
+                    'status': STATUSES[rand.randrange(len(STATUSES))],
+                    'publicIp': '203.0.{}.{}'.format(n & 255, 1 + d % 250)
+                }
+
+        for a in range(5):
+            admin = '{}{:06d}'.format(id, a)
+            self.admins[admin] = {
+                'id': admin,
+                'name': 'Admin {}'.format(a),
+                'email': 'admin{}@example.com'.format(a),
+                'orgAccess': 'full' if a == 0 else 'read-only',
+                'tags': [],
+                'networks': []
+            }
+
+    def inventory(self):
+        return [{
+            'mac': device['mac'],
+            'serial': device['serial'],
+            'networkId': device['networkId'],
+            'model': device['model'],
+            'claimedAt': 1521072000.0,
+            'publicIp': device['publicIp'],
+            'name': device['name']
+        } for device in self.devices.values()]
+
+    def statuses(self):
+        return [{
+            'name': device['name'],
+            'serial': device['serial'],
+            'mac': device['mac'],
+            'publicIp': device['publicIp'],
+            'networkId': device['networkId'],
+            'status': device['status'],
+            'lanIp': device['lanIp'],
+            'usingCellularFailover': False
+        } for device in self.devices.values()]
+
+    def device(self, serial, network=None):
+        device = self.devices.get(serial)
+
+        if device is None or (network is not None and device['networkId'] != network):
+            raise NotFound(serial)
+
+        return dict((key, value) for key, value in device.items() if key not in ('status', 'publicIp'))
+
+    def clients(self, serial):
+        '''
+        Clients seen by a device, generated on first use
+        '''
+        if serial not in self.devices:
+            raise NotFound(serial)
+
+        if serial not in self._clients:
+            rand = random.Random('{}-{}'.format(self.seed, serial))
+            device = self.devices[serial]
+            clients = []
+
+            for c in range(self.clients_per_device):
+                # a fifth of the clients roam, and are also seen by the device's neighbour
+                key = stable('{}-{}'.format(serial if c % 5 else device['networkId'], c))
+                id = 'k{:08x}'.format(key)
+                client = {
+                    'id': id,
+                    'mac': 'f0:18:{:02x}:{:02x}:{:02x}:{:02x}'.format(key >> 24 & 255, key >> 16 & 255, key >> 8 & 255, key & 255),
+                    'description': 'laptop-{}'.format(id),
+                    'mdnsName': None,
+                    'dhcpHostname': 'laptop-{}'.format(id),
+                    'ip': '10.{}.{}.{}'.format(rand.randrange(256), rand.randrange(256), rand.randrange(1, 255)),
+                    'vlan': 10 + c % 4,
+                    'switchport': str(1 + c % 48) if device['model'].startswith('MS') else None,
+                    'usage': {'sent': round(rand.random() * 1e5, 2), 'recv': round(rand.random() * 1e6, 2)}
+                }
+                clients.append(client)
+                self._client_index[id] = (device['networkId'], client)
+
+            self._clients[serial] = clients
+
+        return self._clients[serial]
+
+    def client(self, network, id):
+        if id not in self._client_index:
+            # clients are generated with their devices
+            for serial, device in self.devices.items():
+                if device['networkId'] == network:
+                    self.clients(serial)
+
+        found = self._client_index.get(id)
+
+        if found is None or found[0] != network:
+            raise NotFound(id)
+
+        return found[1]
+
+    def ssids(self, network):
+        return [{
+            'number': number,
+            'name': 'Stand-in SSID {}'.format(number) if number < 3 else 'Unconfigured SSID {}'.format(number + 1),
+            'enabled': number < 3,
+            'splashPage': 'None',
+            'ssidAdminAccessible': False,
+            'authMode': 'psk' if number < 3 else 'open',
+            'encryptionMode': 'wpa' if number < 3 else None,
+            'wpaEncryptionMode': 'WPA2 only' if number < 3 else None,
+            'ipAssignmentMode': 'NAT mode',
+            'minBitrate': 11,
+            'bandSelection': 'Dual band operation',
+            'perClientBandwidthLimitUp': 0,
+            'perClientBandwidthLimitDown': 0
+        } for number in range(15)]
+
+    def batch(self, body, delay, errors=()):
+        id = '{}{:06d}'.format(self.id, len(self.batches))
+        self.batches[id] = (time.monotonic() + delay, list(errors), {
+            'id': id,
+            'organizationId': self.id,
+            'confirmed': body.get('confirmed', False),
+            'synchronous': body.get('synchronous', False),
+            'actions': body.get('actions', [])
+        })
+
+        return self.batch_status(id)
+
+    def batch_status(self, id):
+        if id not in self.batches:
+            raise NotFound(id)
+
+        done, errors, batch = self.batches[id]
+        finished = batch['confirmed'] and time.monotonic() >= done
+
+        return dict(batch, status={'completed': finished and not errors, 'failed': finished and bool(errors), 'errors': errors if finished else []})
+
+
+def declared():
+    '''
+    Templates of the Route constants of every meraki.modules module
+    '''
+    templates = []
+
+    for info in pkgutil.iter_modules(meraki.modules.__path__):
+        module = importlib.import_module('meraki.modules.' + info.name)
+
+        for value in vars(module).values():
+            if isinstance(value, Route) and value.template not in templates:
+                templates.append(value.template)
+
+    return templates
+
+
+def samples(t0, t1, step, sample):
+    start = t0 - t0 % step + (step if t0 % step else 0)
+    return [sample(ts) for ts in range(start, t1, step)]
+
+
+class StandIn(object):
+    '''
+    Local stand-in server for the Dashboard API.
+
+    Listens on one "api" port and, with shards, on one more port per shard.
+    Organization i lives on shard i % shards: organization and network calls
+    reaching another port are redirected to it with a 302, and organizations
+    carry their shard in their `url` like the real API.
+
+    PARAMETERS
+        organizations:  Number of organizations
+        networks:       Networks per organization
+        devices:        Devices per network
+        clients:        Clients per device
+        latency:        Seconds added to every response
+        jitter:         Up to this many more seconds, at random
+        rate:           Requests per second per organization before answering 429, None never
+        shards:         Shard listeners besides the api one, 0 serves everything directly
+        page_size:      Items per page of the paged routes when the caller sets no perPage
+        batch_delay:    Seconds an action batch takes to complete
+        seed:           Seed of the generated data
+        host, port:     Address of the api listener, port 0 picks a free one
+    '''
+    def __init__(self, organizations=1, networks=10, devices=20, clients=10, latency=0.0, jitter=0.0, rate=None, shards=0, page_size=100, batch_delay=0.5, seed=0, host='127.0.0.1', port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.page_size = page_size
+        self.batch_delay = batch_delay
+        self.host = host
+        self.port = port
+        self.shards = shards
+
+        self.organizations = {}
+        self._network_org = {}
+        self._device_org = {}
+
+        for i in range(organizations):
+            org = Organization(str(549236 + i), i, networks=networks, devices=devices, clients=clients, seed=seed)
+            self.organizations[org.id] = org
+            self._network_org.update((network, org) for network in org.networks)
+            self._device_org.update((serial, org) for serial in org.devices)
+
+        self.requests = 0
+        self.statuses = {}
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._bodies = {}
+        self._documents = {}
+        self._servers = []
+        self._routes = self._table()
+
+    #
+    # LIFECYCLE
+    #
+
+    @property
+    def url(self):
+        return self._root(0)
+
+    def _root(self, listener):
+        host, port = self._servers[listener].server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, BASE_PATH)
+
+    def start(self):
+        '''
+        Listen in daemon threads, returns self
+        '''
+        for listener in range(1 + self.shards):
+            server = ThreadingHTTPServer((self.host, self.port if listener == 0 else 0), self._handler(listener))
+            server.daemon_threads = True
+            self._servers.append(server)
+
+            thread = threading.Thread(target=server.serve_forever, name='meraki-standin-{}'.format(listener))
+            thread.daemon = True
+            thread.start()
+
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+        self._servers = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _shard(self, org):
+        # listener serving an organization
+        if not self.shards:
+            return 0
+
+        return 1 + list(self.organizations).index(org.id) % self.shards
+
+    def _count(self, status):
+        with self._lock:
+            self.requests += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def _throttled(self, org):
+        '''
+        Seconds until the organization may send again, 0 when it may now
+        '''
+        if self.rate is None or org is None:
+            return 0
+
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, stamp = self._buckets.get(org.id, (float(self.rate), now))
+            tokens = min(float(self.rate), tokens + (now - stamp) * self.rate)
+
+            if tokens < 1:
+                self._buckets[org.id] = (tokens, now)
+                return (1 - tokens) / self.rate
+
+            self._buckets[org.id] = (tokens - 1, now)
+            return 0
+
+    #
+    # ROUTES
+    #
+
+    def _table(self):
+        routes = [
+            ('GET', 'organizations', self._organizations),
+            ('POST', 'organizations', self._create_organization),
+            ('GET', 'organizations/{org}', lambda org, query: self._organization(self._org(org))),
+            ('PUT', 'organizations/{org}', self._update_organization),
+            ('POST', 'organizations/{org}/clone', lambda org, query, body: self._create_organization(query, body, self._org(org))),
+            ('POST', 'organizations/{org}/claim', self._claim),
+            ('GET', 'organizations/{org}/licenseState', lambda org, query: {'status': 'OK', 'expirationDate': 'Dec 31, 2030 UTC', 'licensedDeviceCounts': {}}),
+            ('GET', 'organizations/{org}/inventory', lambda org, query: self._org(org).inventory()),
+            ('GET', 'organizations/{org}/deviceStatuses', lambda org, query: self._org(org).statuses()),
+            ('GET', 'organizations/{org}/networks', lambda org, query: list(self._org(org).networks.values())),
+            ('POST', 'organizations/{org}/networks', self._create_network),
+            ('GET', 'organizations/{org}/thirdPartyVPNPeers', self._vpn_peers),
+            ('PUT', 'organizations/{org}/thirdPartyVPNPeers', self._vpn_peers),
+            ('GET', 'organizations/{org}/admins', lambda org, query: list(self._org(org).admins.values())),
+            ('POST', 'organizations/{org}/admins', self._create_admin),
+            ('PUT', 'organizations/{org}/admins/{admin}', self._update_admin),
+            ('DELETE', 'organizations/{org}/admins/{admin}', self._delete_admin),
+            ('POST', 'organizations/{org}/actionBatches', self._create_batch),
+            ('GET', 'organizations/{org}/actionBatches/{batch}', lambda org, batch, query: self._org(org).batch_status(batch)),
+            ('GET', 'networks/{network}', lambda network, query: self._network(network)),
+            ('PUT', 'networks/{network}', self._update_network),
+            ('DELETE', 'networks/{network}', self._delete_network),
+            ('POST', 'networks/{network}/bind', lambda network, query, body: self._update_network(network, query, {'configTemplateId': body.get('configTemplateId'), 'isBoundToConfigTemplate': True})),
+            ('POST', 'networks/{network}/unbind', lambda network, query, body: self._update_network(network, query, {'configTemplateId': None, 'isBoundToConfigTemplate': False})),
+            ('GET', 'networks/{network}/traffic', self._traffic),
+            ('GET', 'networks/{network}/accessPolicies', self._access_policies),
+            ('GET', 'networks/{network}/airMarshal', self._air_marshal),
+            ('GET', 'networks/{network}/bluetoothClients', self._bluetooth_clients),
+            ('GET', 'networks/{network}/bluetoothClients/{client}', self._bluetooth_client),
+            ('GET', 'networks/{network}/splashLoginAttempts', self._splash_login_attempts),
+            ('GET', 'networks/{network}/devices', lambda network, query: [self._net_org(network).device(serial) for serial in self._serials(network)]),
+            ('POST', 'networks/{network}/devices/claim', self._claim_device),
+            ('GET', 'networks/{network}/devices/{serial}', lambda network, serial, query: self._net_org(network).device(serial, network)),
+            ('PUT', 'networks/{network}/devices/{serial}', self._update_device),
+            ('POST', 'networks/{network}/devices/{serial}/remove', self._remove_device),
+            ('GET', 'networks/{network}/devices/{serial}/uplink', self._uplink),
+            ('GET', 'networks/{network}/devices/{serial}/performance', lambda network, serial, query: {'perfScore': stable(serial) % 100}),
+            ('GET', 'networks/{network}/devices/{serial}/lldp_cdp', self._lldp_cdp),
+            ('GET', 'networks/{network}/devices/{serial}/lossAndLatencyHistory', self._loss_and_latency),
+            ('GET', 'networks/{network}/ssids', lambda network, query: self._net_org(network).ssids(network)),
+            ('GET', 'networks/{network}/ssids/{ssid}', self._ssid),
+            ('PUT', 'networks/{network}/ssids/{ssid}', lambda network, ssid, query, body: dict(self._ssid(network, ssid, query), **body)),
+            ('GET', 'devices/{serial}/clients', lambda serial, query: self._dev_org(serial).clients(serial)),
+            ('POST', 'networks/{network}/clients/provision', self._provision),
+            ('GET', 'networks/{network}/clients/{client}', lambda network, client, query: self._net_org(network).client(network, client)),
+            ('GET', 'networks/{network}/clients/{client}/usageHistory', self._usage_history),
+            ('GET', 'networks/{network}/clients/{client}/trafficHistory', self._traffic_history),
+            ('GET', 'networks/{network}/clients/{client}/events', self._events),
+            ('GET', 'networks/{network}/clients/{client}/securityEvents', self._security_events),
+            ('GET', 'networks/{network}/clients/{client}/latencyHistory', self._latency_history),
+            ('GET', 'networks/{network}/clients/{client}/policy', self._policy),
+            ('GET', 'networks/{network}/clients/{client}/splashAuthorizationStatus', self._splash_authorization),
+            ('PUT', 'networks/{network}/clients/{client}/splashAuthorizationStatus', self._splash_authorization)
+        ]
+
+        routes += self._settings('organizations/{org}/snmp', self._org, {
+            'v2cEnabled': False, 'v3Enabled': False, 'v3AuthMode': None, 'v3PrivMode': None, 'peerIps': None, 'hostname': 'snmp.meraki.com', 'port': 16100
+        })
+        routes += self._settings('networks/{network}/siteToSiteVpn', self._network, {'mode': 'none', 'hubs': [], 'subnets': []})
+        routes += self._settings('networks/{network}/alertSettings', self._network, {
+            'defaultDestinations': {'emails': [], 'allAdmins': False, 'snmp': False, 'httpServerIds': []}, 'alerts': []
+        })
+        routes += self._settings('networks/{network}/bluetoothSettings', self._network, {
+            'scanningEnabled': False, 'advertisingEnabled': False, 'uuid': None, 'majorMinorAssignmentMode': 'Non-unique', 'major': 1, 'minor': 1
+        })
+        routes += self._settings('networks/{network}/ssids/{ssid}/splashSettings', lambda network, ssid: self._ssid(network, ssid, {}), {
+            'splashUrl': None, 'useSplashUrl': False
+        })
+
+        # routes the modules declare that nothing above serves get a generic
+        # handler, so a new endpoint can be called before it has a real one
+        served = set(template for method, template, handler in routes)
+        self.generic = [template for template in declared() if template not in served]
+
+        for template in self.generic:
+            routes += [
+                ('GET', template, lambda *args: {}),
+                ('POST', template, lambda *args: args[-1]),
+                ('PUT', template, lambda *args: args[-1]),
+                ('DELETE', template, lambda *args: None)
+            ]
+
+        table = []
+
+        for method, template, handler in routes:
+            pattern = re.sub(r'\\{(\w+)\\}', r'(?P<\1>[^/]+)', re.escape(template))
+            table.append((method, re.compile(pattern + r'\Z'), handler))
+
+        return table
+
+    def _org(self, id):
+        if id not in self.organizations:
+            raise NotFound(id)
+
+        return self.organizations[id]
+
+    def _net_org(self, network):
+        if network not in self._network_org:
+            raise NotFound(network)
+
+        return self._network_org[network]
+
+    def _dev_org(self, serial):
+        if serial not in self._device_org:
+            raise NotFound(serial)
+
+        return self._device_org[serial]
+
+    def _network(self, network):
+        return self._net_org(network).networks[network]
+
+    def _serials(self, network):
+        return [serial for serial, device in self._net_org(network).devices.items() if device['networkId'] == network]
+
+    def _organization(self, org):
+        listener = self._shard(org)
+        host = '{}:{}'.format(*self._servers[listener].server_address[:2]) if self._servers else 'localhost'
+
+        return {
+            'id': org.id,
+            'name': org.name,
+            'url': 'http://{}/o/{}/manage/organization/overview'.format(host, org.id)
+        }
+
+    def _organizations(self, query):
+        return [self._organization(org) for org in self.organizations.values()]
+
+    def _create_organization(self, query, body, source=None):
+        '''
+        A new, empty organization, or a clone of source: its networks without their devices
+        '''
+        with self._lock:
+            index = len(self.organizations)
+            org = Organization(str(549236 + index), index, networks=0, devices=0, seed=source.seed if source else 0)
+            org.name = body.get('name', org.name)
+            self.organizations[org.id] = org
+
+        for network in list(source.networks.values()) if source else ():
+            self._create_network(org.id, query, {
+                'name': network['name'],
+                'type': network['type'],
+                'tags': (network['tags'] or '').strip(),
+                'timeZone': network['timeZone']
+            })
+
+        return self._organization(org)
+
+    def _update_organization(self, org, query, body):
+        org = self._org(org)
+        org.name = body.get('name', org.name)
+        return self._organization(org)
+
+    def _claim(self, org, query, body):
+        self._org(org)
+
+        return {
+            'orders': [body['order']] if body.get('order') else [],
+            'serials': [body['serial']] if body.get('serial') else [],
+            'licenses': [{'key': body['licenseKey'], 'mode': body.get('licenseMode', 'addDevices')}] if body.get('licenseKey') else []
+        }
+
+    def _vpn_peers(self, org, query, body=None):
+        self._org(org)
+
+        with self._lock:
+            if body is not None:
+                self._documents[('thirdPartyVPNPeers', org)] = list(body.get('peers', []))
+
+            return self._documents.get(('thirdPartyVPNPeers', org), [])
+
+    def _settings(self, template, owner, default):
+        '''
+        GET and PUT routes of a settings document kept per owner, PUT merges into it
+
+        PARAMETERS
+            template:   Route template
+            owner:      Called with the path values, raises NotFound for unknown ones
+            default:    Document before the first PUT
+        '''
+        def get(*args):
+            owner(*args[:-1])
+
+            with self._lock:
+                return self._documents.setdefault((template,) + args[:-1], copy.deepcopy(default))
+
+        def put(*args):
+            document = get(*args[:-1])
+
+            with self._lock:
+                document.update(args[-1])
+
+            return document
+
+        return [('GET', template, get), ('PUT', template, put)]
+
+    def _create_admin(self, org, query, body):
+        org = self._org(org)
+        admin = dict(body, id='{}{:06d}'.format(org.id, len(org.admins) + 1000))
+        org.admins[admin['id']] = admin
+        return admin
+
+    def _update_admin(self, org, admin, query, body):
+        admins = self._org(org).admins
+
+        if admin not in admins:
+            raise NotFound(admin)
+
+        admins[admin].update(body)
+        return admins[admin]
+
+    def _delete_admin(self, org, admin, query, body):
+        if self._org(org).admins.pop(admin, None) is None:
+            raise NotFound(admin)
+
+        return None
+
+    def _create_batch(self, org, query, body):
+        '''
+        Apply the actions of a confirmed batch at once, report them completed after batch_delay
+        '''
+        org = self._org(org)
+        errors = []
+
+        for action in body.get('actions', []) if body.get('confirmed') else ():
+            method = OPERATIONS.get(action.get('operation'), 'POST')
+
+            try:
+                self._dispatch(method, action.get('resource', '').strip('/'), {}, action.get('body', {}))
+            except (NotFound, BadRequest) as error:
+                errors.append('{} {}: {}'.format(action.get('operation'), action.get('resource'), error))
+
+        return org.batch(body, self.batch_delay, errors)
+
+    def _update_network(self, network, query, body):
+        self._network(network).update(body)
+        return self._network(network)
+
+    def _create_network(self, org, query, body):
+        org = self._org(org)
+
+        with self._lock:
+            network = 'N_{}{:06d}'.format(org.id, len(org.networks))
+
+            while network in self._network_org:
+                network += '0'
+
+            org.networks[network] = {
+                'id': network,
+                'organizationId': org.id,
+                'name': body.get('name'),
+                'timeZone': body.get('timeZone', 'America/Los_Angeles'),
+                'tags': ' {} '.format(body['tags']) if body.get('tags') else None,
+                'type': body.get('type', 'combined'),
+                'productTypes': sorted((body.get('type') or 'appliance switch wireless').split()),
+                'disableMyMerakiCom': body.get('disableMyMerakiCom', False),
+                'disableRemoteStatusPage': body.get('disableRemoteStatusPage', True)
+            }
+            self._network_org[network] = org
+
+        return org.networks[network]
+
+    def _delete_network(self, network, query, body):
+        if self._serials(network):
+            raise BadRequest('Remove the devices of network {} first'.format(network))
+
+        with self._lock:
+            del self._net_org(network).networks[network]
+            del self._network_org[network]
+
+        return None
+
+    def _traffic(self, network, query):
+        self._network(network)
+        seed = stable(network)
+        scale = int(query.get('timespan', 86400)) / 86400.0
+
+        return [{
+            'application': application,
+            'destination': None,
+            'protocol': 'TCP' if i % 3 else 'UDP',
+            'port': 53 if application == 'DNS' else 443,
+            'sent': round((seed % 997 + 100 * i) * scale, 1),
+            'recv': round((seed % 991 + 900 * i) * scale, 1),
+            'numClients': 1 + (seed + i) % 40,
+            'activeTime': int(3600 * i * scale),
+            'flows': int((seed % 89 + 30 * i) * scale)
+        } for i, application in enumerate(APPLICATIONS)]
+
+    def _access_policies(self, network, query):
+        self._network(network)
+
+        return [{
+            'number': 1,
+            'name': 'Access policy #1',
+            'accessPolicyType': '802.1x',
+            'hostMode': 'Single-Host',
+            'radiusServers': [{'host': '10.0.0.2', 'port': 1812}],
+            'guestVlanId': None
+        }]
+
+    def _air_marshal(self, network, query):
+        self._network(network)
+        serials = self._serials(network)
+        now = int(time.time())
+        seed = stable(network)
+
+        return [{
+            'ssid': 'Rogue {}'.format(i),
+            'bssids': [{
+                'bssid': '00:11:22:{:02x}:{:02x}:{:02x}'.format(seed >> 8 & 255, seed & 255, i),
+                'contained': False,
+                'detectedBy': [{'device': serial, 'rssi': -60 - (seed + i) % 30} for serial in serials[:2]]
+            }],
+            'channels': [1 + 5 * (i % 3), 36 + 4 * i],
+            'firstSeen': now - 86400 * (i + 1),
+            'lastSeen': now - 60 * i,
+            'wiredMacs': [],
+            'wiredVlans': [],
+            'wiredLastSeen': None
+        } for i in range(3)]
+
+    def _bluetooth_clients(self, network, query):
+        '''
+        Bluetooth clients of a network: clients_per_device for every device in it
+        '''
+        org = self._net_org(network)
+        history = query.get('includeConnectivityHistory') == 'true'
+        now = int(time.time())
+        clients = []
+
+        for serial in self._serials(network):
+            for c in range(org.clients_per_device):
+                key = stable('{}-bt-{}'.format(serial, c))
+                client = {
+                    'id': 'b{:08x}'.format(key),
+                    'mac': '7c:50:{:02x}:{:02x}:{:02x}:{:02x}'.format(key >> 24 & 255, key >> 16 & 255, key >> 8 & 255, key & 255),
+                    'networkId': network,
+                    'name': 'Beacon {}'.format(len(clients)),
+                    'deviceName': None,
+                    'manufacturer': ('Apple', 'Samsung', 'Estimote')[key % 3],
+                    'lastSeen': now - key % 3600,
+                    'seenByDeviceMac': org.devices[serial]['mac'],
+                    'inSightAlert': False,
+                    'outOfSightAlert': False,
+                    'tags': []
+                }
+
+                if history:
+                    client['connectivityHistory'] = [{'ts': iso(now - 600), 'connectivity': 'inSight'}]
+
+                clients.append(client)
+
+        return clients
+
+    def _bluetooth_client(self, network, client, query):
+        for found in self._bluetooth_clients(network, query):
+            if found['id'] == client:
+                return found
+
+        raise NotFound(client)
+
+    def _splash_login_attempts(self, network, query):
+        self._network(network)
+        now = int(time.time())
+        ssid = query.get('ssidNumber')
+
+        return [{
+            'name': 'Guest {}'.format(i),
+            'login': 'guest{}@example.com'.format(i),
+            'ssid': 'Stand-in SSID {}'.format(i % 3),
+            'loginAt': iso(now - 900 * i),
+            'gatewayDeviceMac': None,
+            'clientMac': 'f0:18:98:00:00:{:02x}'.format(i),
+            'clientId': 'k{:08x}'.format(stable('{}-{}'.format(network, i))),
+            'authorization': 'success' if i % 4 else 'failure'
+        } for i in range(12) if ssid is None or int(ssid) == i % 3]
+
+    def _update_device(self, network, serial, query, body):
+        org = self._net_org(network)
+        org.device(serial, network)
+        org.devices[serial].update(body)
+        return org.device(serial, network)
+
+    def _claim_device(self, network, query, body):
+        '''
+        Add an unknown serial to the network, claiming one another organization holds fails
+        '''
+        org = self._net_org(network)
+        serial = body.get('serial')
+
+        if not serial:
+            raise BadRequest('serial is required')
+
+        with self._lock:
+            owner = self._device_org.get(serial)
+
+            if owner is not None and owner is not org:
+                raise BadRequest('Device {} is claimed by another organization'.format(serial))
+
+            if serial in org.devices and org.devices[serial]['networkId'] is not None:
+                raise BadRequest('Device {} is already in a network'.format(serial))
+
+            key = stable(serial)
+            model = MODELS[key % len(MODELS)]
+            org.devices[serial] = dict(org.devices.get(serial) or {
+                'serial': serial,
+                'mac': '88:15:44:{:02x}:{:02x}:{:02x}'.format(key >> 16 & 255, key >> 8 & 255, key & 255),
+                'name': '{}-{}'.format(model.lower(), serial[-4:].lower()),
+                'model': model,
+                'lanIp': '10.255.{}.{}'.format(key >> 8 & 255, 10 + key % 240),
+                'tags': None,
+                'lat': 37.4180951010362,
+                'lng': -122.098531723022,
+                'address': '',
+                'firmware': 'wireless-25-13',
+                'status': 'online',
+                'publicIp': '203.0.113.{}'.format(1 + key % 250)
+            }, networkId=network)
+            self._device_org[serial] = org
+
+        return None
+
+    def _remove_device(self, network, serial, query, body):
+        '''
+        Take a device out of its network, it stays in the organization's inventory
+        '''
+        org = self._net_org(network)
+        org.device(serial, network)
+        org.devices[serial]['networkId'] = None
+        return None
+
+    def _lldp_cdp(self, network, serial, query):
+        device = self._net_org(network).device(serial, network)
+        gateway = device['lanIp'].rsplit('.', 1)[0] + '.1'
+
+        return {
+            'sourceMac': device['mac'],
+            'ports': {
+                'wan1': {
+                    'cdp': {'deviceId': '0c8ddb{:06x}'.format(stable(network) & 0xffffff), 'portId': 'Port 1', 'address': gateway, 'sourcePort': 'wan1'},
+                    'lldp': {'systemName': 'Stand-in switch', 'portId': '1', 'managementAddress': gateway, 'sourcePort': 'wan1'}
+                }
+            }
+        }
+
+    def _uplink(self, network, serial, query):
+        device = self._net_org(network).device(serial, network)
+
+        return [{
+            'interface': 'WAN 1',
+            'status': 'Active',
+            'ip': device['lanIp'],
+            'gateway': device['lanIp'].rsplit('.', 1)[0] + '.1',
+            'publicIp': self._net_org(network).devices[serial]['publicIp'],
+            'dns': '8.8.8.8',
+            'usingStaticIp': False
+        }]
+
+    def _loss_and_latency(self, network, serial, query):
+        self._net_org(network).device(serial, network)
+        t0, t1 = window(query)
+        step = int(query.get('resolution', 60))
+
+        return samples(t0, t1, step, lambda ts: {
+            'startTs': iso(ts),
+            'endTs': iso(ts + step),
+            'lossPercent': 0.0 if ts % 97 else 1.5,
+            'latencyMs': 18.0 + ts % 13
+        })
+
+    def _ssid(self, network, ssid, query):
+        ssids = self._net_org(network).ssids(network)
+
+        if not ssid.isdigit() or int(ssid) >= len(ssids):
+            raise NotFound(ssid)
+
+        return ssids[int(ssid)]
+
+    def _usage_history(self, network, client, query):
+        self._net_org(network).client(network, client)
+        today = int(time.time()) // 86400 * 86400
+
+        return [{'ts': iso(today - day * 86400), 'received': 1024.0 * day, 'sent': 256.0 * day} for day in range(30, 0, -1)]
+
+    def _traffic_history(self, network, client, query):
+        self._net_org(network).client(network, client)
+        now = int(time.time())
+
+        return [{
+            'ts': iso(now - i * 3600),
+            'application': APPLICATIONS[i % len(APPLICATIONS)],
+            'destination': None,
+            'protocol': 'TCP',
+            'port': 443,
+            'sent': 12.0 * i,
+            'recv': 96.0 * i,
+            'numFlows': i % 7,
+            'activeSeconds': 60 * (i % 11)
+        } for i in range(240)]
+
+    def _events(self, network, client, query):
+        self._net_org(network).client(network, client)
+        now = int(time.time())
+
+        return [{'occurredAt': now - i * 600, 'type': 'association' if i % 2 else 'disassociation', 'details': {'channel': 36}} for i in range(120)]
+
+    def _security_events(self, network, client, query):
+        '''
+        One IDS alert every hour of the timespan, oldest first
+        '''
+        found = self._net_org(network).client(network, client)
+        t0, t1 = window(query, 86400)
+
+        return samples(t0, t1, 3600, lambda ts: {
+            'ts': iso(ts),
+            'eventType': 'IDS Alert',
+            'clientName': found['description'],
+            'clientMac': found['mac'],
+            'clientIp': found['ip'],
+            'srcIp': found['ip'],
+            'destIp': '198.51.100.{}'.format(ts // 3600 % 250 + 1),
+            'protocol': 'tcp',
+            'priority': str(1 + ts // 3600 % 4),
+            'classification': '4',
+            'blocked': bool(ts // 3600 % 2),
+            'message': 'SERVER-WEBAPP directory traversal attempt',
+            'signature': '1:{}:1'.format(1000 + ts // 3600 % 500)
+        })
+
+    def _policy(self, network, client, query):
+        found = self._net_org(network).client(network, client)
+
+        return {'mac': found['mac'], 'type': query.get('devicePolicy', 'Normal'), 'groupPolicyId': query.get('groupPolicyId')}
+
+    def _splash_authorization(self, network, client, query, body=None):
+        self._net_org(network).client(network, client)
+        now = int(time.time())
+
+        with self._lock:
+            status = self._documents.setdefault(('splashAuthorizationStatus', network, client), {'ssids': {}})
+
+            for ssid, update in (body or {}).get('ssids', {}).items():
+                authorized = bool(update.get('isAuthorized'))
+                status['ssids'][str(ssid)] = {
+                    'isAuthorized': authorized,
+                    'authorizedAt': iso(now) if authorized else None,
+                    'expiresAt': iso(now + 86400) if authorized else None
+                }
+
+            return status
+
+    def _provision(self, network, query, body):
+        self._network(network)
+
+        if not body.get('mac') or not body.get('devicePolicy'):
+            raise BadRequest('mac and devicePolicy are required')
+
+        return {
+            'mac': body['mac'],
+            'clientId': 'k{:08x}'.format(stable(body['mac'])),
+            'name': body.get('name', ''),
+            'devicePolicy': body['devicePolicy'],
+            'groupPolicyId': body.get('groupPolicyId')
+        }
+
+    def _latency_history(self, network, client, query):
+        self._net_org(network).client(network, client)
+        t0, t1 = window(query)
+        seed = stable(client)
+
+        return samples(t0, t1, 86400 if t1 - t0 > 86400 else 300, lambda ts: {
+            't0': ts,
+            't1': ts + 300,
+            'latencyBinsByCategory': dict((category, dict((label, (seed + ts + i * j) % 50 >> j) for j, label in enumerate(BINS))) for i, category in enumerate(CATEGORIES))
+        })
+
+    #
+    # HTTP
+    #
+
+    def _owner(self, segments):
+        '''
+        Organization addressed by a request path
+        '''
+        if len(segments) < 2:
+            return None
+
+        if segments[0] == 'organizations':
+            return self.organizations.get(segments[1])
+
+        if segments[0] == 'networks':
+            return self._network_org.get(segments[1])
+
+        if segments[0] == 'devices':
+            return self._device_org.get(segments[1])
+
+        return None
+
+    def _dispatch(self, method, path, query, body):
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+
+            if match is not None and route_method == method:
+                args = list(match.groups()) + [query]
+
+                if method != 'GET':
+                    args.append(body)
+
+                return handler(*args)
+
+        raise NotFound(path)
+
+    def _page(self, result, query, host, path):
+        '''
+        Slice a list on perPage / startingAfter and the Link to the next page
+        '''
+        size = int(query.get('perPage') or self.page_size)
+        offset = int(query.get('startingAfter') or 0)
+        link = None
+
+        if offset + size < len(result):
+            link = '<http://{}{}/{}?{}>; rel=next'.format(host, BASE_PATH, path, urlencode(dict(query, perPage=size, startingAfter=offset + size)))
+
+        return result[offset:offset + size], link
+
+    def _handler(self, listener):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body go out in two writes, do not hold the second one back
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+            def _send(self, status, body=b'', headers=()):
+                self.send_response(status)
+
+                for key, value in headers:
+                    self.send_header(key, value)
+
+                # counted first, a client that has read the response sees it in the counters
+                standin._count(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                data = self.rfile.read(length) if length else b''
+
+                if standin.latency or standin.jitter:
+                    time.sleep(standin.latency + random.random() * standin.jitter)
+
+                parts = urlsplit(self.path)
+
+                if not parts.path.startswith(BASE_PATH + '/'):
+                    return self._send(404)
+
+                path = parts.path[len(BASE_PATH) + 1:].strip('/')
+                query = dict(parse_qsl(parts.query))
+                org = standin._owner(path.split('/'))
+
+                if org is not None and standin._shard(org) != listener:
+                    location = standin._root(standin._shard(org)) + '/' + path + ('?' + parts.query if parts.query else '')
+                    return self._send(302, headers=(('Location', location),))
+
+                wait = standin._throttled(org)
+
+                if wait:
+                    return self._send(429, json.dumps({'errors': ['API rate limit exceeded for organization']}).encode('utf8'), (('Retry-After', '{:.3f}'.format(wait)), ('Content-Type', 'application/json')))
+
+                try:
+                    body = json.loads(data.decode('utf8')) if data else {}
+                    result = standin._dispatch(method, path, query, body)
+                except NotFound:
+                    return self._send(404, json.dumps({'errors': ['Not found']}).encode('utf8'), (('Content-Type', 'application/json'),))
+                except (BadRequest, ValueError) as error:
+                    return self._send(400, json.dumps({'errors': [str(error)]}).encode('utf8'), (('Content-Type', 'application/json'),))
+
+                if method == 'DELETE':
+                    return self._send(204)
+
+                headers = [('Content-Type', 'application/json')]
+
+                if isinstance(result, list) and ('perPage' in query or 'startingAfter' in query):
+                    result, link = standin._page(result, query, self.headers.get('Host'), path)
+
+                    if link is not None:
+                        headers.append(('Link', link))
+
+                content = json.dumps(result).encode('utf8')
+
+                if method == 'GET':
+                    etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+                    headers.append(('ETag', etag))
+
+                    if self.headers.get('If-None-Match') == etag:
+                        return self._send(304, headers=(('ETag', etag),))
+
+                self._send(201 if method == 'POST' else 200, content, headers)
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local stand-in for the Meraki Dashboard API')
+    parser.add_argument('--organizations', type=int, default=1)
+    parser.add_argument('--networks', type=int, default=10, help='networks per organization')
+    parser.add_argument('--devices', type=int, default=20, help='devices per network')
+    parser.add_argument('--clients', type=int, default=10, help='clients per device')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many more seconds, at random')
+    parser.add_argument('--rate', type=float, default=None, help='requests per second per organization before 429')
+    parser.add_argument('--shards', type=int, default=0, help='shard listeners organizations are redirected to')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--batch-delay', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    standin = StandIn(
+        organizations=args.organizations,
+        networks=args.networks,
+        devices=args.devices,
+        clients=args.clients,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate=args.rate,
+        shards=args.shards,
+        page_size=args.page_size,
+        batch_delay=args.batch_delay,
+        seed=args.seed,
+        host=args.host,
+        port=args.port
+    ).start()
+
+    print('meraki stand-in listening on {} with organizations {}'.format(standin.url, ', '.join(standin.organizations)))
+    sys.stdout.flush()
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == '__main__':
+    main()
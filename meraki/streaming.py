@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import re
+import json
+import codecs
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DELIMITERS = frozenset(', \t\n\r]')
+
+
+class ArrayStream(object):
+    '''
+    Incremental parser of a JSON array, fed the response body chunk by chunk.
+
+    feed() returns the elements completed by a chunk, so only the current
+    element and one chunk are held in memory however long the array is. An
+    empty body is an empty array.
+
+        parser = ArrayStream()
+        for chunk in response.iter_content(65536):
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    '''
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder('utf8')()
+        self._scan = json.JSONDecoder().raw_decode
+        self._buffer = ''
+        self._started = False
+        self._done = False
+
+    def feed(self, chunk, final=False):
+        buffer = self._buffer + self._text.decode(chunk, final)
+        end = len(buffer)
+        pos = 0
+        items = []
+
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+
+            if pos == end:
+                break
+
+            char = buffer[pos]
+
+            if self._done:
+                raise ValueError('extra data after the JSON array at offset {}'.format(pos))
+
+            if not self._started:
+                if char != '[':
+                    raise ValueError('expected a JSON array, got {!r}'.format(char))
+
+                self._started = True
+                pos += 1
+                continue
+
+            if char == ']':
+                self._done = True
+                pos += 1
+                continue
+
+            if char == ',':
+                pos += 1
+                continue
+
+            try:
+                item, stop = self._scan(buffer, pos)
+            except ValueError:
+                # element cut by the chunk boundary, wait for the rest
+                if final:
+                    raise
+                break
+
+            # a number cut by the chunk boundary parses as a shorter one, only
+            # trust an element once its delimiter has arrived
+            if not final and (stop == end or buffer[stop] not in DELIMITERS):
+                break
+
+            items.append(item)
+            pos = stop
+
+        self._buffer = buffer[pos:]
+
+        return items
+
+    def close(self):
+        '''
+        Elements left in the buffer. Raises ValueError when the array is incomplete
+        '''
+        items = self.feed(b'', final=True)
+
+        if self._started and not self._done:
+            raise ValueError('truncated JSON array')
+
+        return items
@@ -0,0 +1,938 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import ssl
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests import Session, Request
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from requests_toolbelt import SSLAdapter
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+# workaround to suppress InsecureRequestWarning
+# See: https://urllib3.readthedocs.io/en/latest/advanced-usage.html#ssl-warnings
+import urllib3
+urllib3.disable_warnings()
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from meraki.exceptions import ApiKeyMissing, APIError
+from meraki.scheduler import Scheduler, current_lane, BULK
+from meraki.retry import RetryPolicy, CallStats, NO_RETRY, track, last_call
+from meraki.shards import ShardMap, REDIRECTS
+from meraki.cache import MISS
+from meraki.codec import get_codec
+from meraki.streaming import ArrayStream
+
+
+BASE_URL = 'https://api.meraki.com/api/v0'
+
+
+def endpoint_name(segments):
+    '''
+    Endpoint name of a request path: the resource names without the IDs,
+    e.g. networks/N_1/devices/Q2XX/uplink is networks.devices.uplink
+    '''
+    return '.'.join(segments[0::2])
+
+
+def retry_after(data, default=1.0):
+    try:
+        return float(data.headers.get('Retry-After', default))
+    except ValueError:
+        return default
+
+
+class Flight(object):
+    '''
+    A GET in flight that identical GETs wait for instead of sending their own
+    '''
+    __slots__ = ('done', 'result', 'error', 'stats')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.stats = None
+
+
+class BaseTransport(object):
+    '''
+    State and decoding shared by the blocking and the asyncio transports.
+
+    PARAMETERS
+        base_url:       API root, defaults to api.meraki.com
+        rate_limit:     Requests per second per organization, None disables the scheduler
+        retry:          RetryPolicy for failed requests, None disables retries
+        max_throttled:  How many 429 responses a single call waits out before giving up
+        max_redirects:  Shard redirects followed by a single call
+        cache:          ResponseCache for GET responses, None disables caching
+        conditional:    ConditionalCache to revalidate GET responses with ETag / If-Modified-Since
+        codec:          JSON codec name ('auto', 'orjson', 'ujson', 'json') or Codec instance
+        snapshot:       SnapshotStore answering GETs across restarts, revalidated in the background
+        coalesce:       Share one call between identical GETs in flight at the same time
+        metrics:        Metrics registry recording every call by endpoint, None disables it
+    '''
+    def __init__(self, api_key=None, base_url=BASE_URL, rate_limit=5, retry=RetryPolicy(), max_throttled=5, max_redirects=5, cache=None, conditional=None, codec='auto', snapshot=None, coalesce=True, metrics=None):
+        if api_key is None:
+            raise ApiKeyMissing
+
+        self.base_url = base_url
+        self.scheduler = Scheduler(rate_limit) if rate_limit else None
+        self.retry = NO_RETRY if retry is None else retry
+        self.max_throttled = max_throttled
+        self.max_redirects = max_redirects
+        self.shards = ShardMap(base_url)
+        self.cache = cache
+        self.conditional = conditional
+        self.codec = get_codec(codec)
+        self.snapshot = snapshot
+        self.coalesce = coalesce
+        self.metrics = metrics
+        # calls answered by an identical GET already in flight
+        self.coalesced = 0
+
+        self._base_path = urlsplit(base_url).path.rstrip('/')
+        self._headers = {
+            'X-Cisco-Meraki-API-Key': str(api_key),
+            'Content-type': 'application/json'
+        }
+
+    def _segments(self, url):
+        path = urlsplit(url).path
+
+        if path.startswith(self._base_path):
+            path = path[len(self._base_path):]
+
+        return path.strip('/').split('/')
+
+    def _schedule(self, url, priority):
+        # a priority given by the endpoint wins over the lane of the block
+        return self.shards.org(self._segments(url)), current_lane() if priority is None else priority
+
+    def _redirect(self, org, url, response):
+        '''
+        Follow a shard redirect, keeping method and body. Returns the new URL,
+        None when the response is not a redirect
+        '''
+        location = response.headers.get('Location')
+
+        if response.status_code not in REDIRECTS or not location:
+            return None
+
+        # a redirect away from a cached shard means the organization moved
+        if not url.startswith(self.base_url):
+            self.shards.invalidate(org)
+
+        self.shards.learn(org, location)
+
+        return location
+
+    def _begin(self, method, url, name=None):
+        stats = CallStats(method, url, name)
+        track(stats)
+        return stats, time.monotonic()
+
+    def _observe(self, stats, response=None, error=None, stream=False):
+        '''
+        Record a finished call in the metrics registry
+        '''
+        if self.metrics is None:
+            return
+
+        size = 0
+
+        if response is not None:
+            # a streamed body has not been read yet
+            size = int(response.headers.get('Content-Length') or 0) if stream else len(response.content)
+
+        self.metrics.observe(
+            stats.name or endpoint_name(self._segments(stats.url)),
+            stats.method,
+            status=stats.status,
+            seconds=stats.elapsed,
+            size=size,
+            retries=stats.retries,
+            throttled=stats.throttled,
+            waited=stats.waited,
+            error=error
+        )
+
+    def _backoff(self, key, stats, start, response=None, error=None):
+        '''
+        Seconds to wait before sending the call again, None to stop here
+        '''
+        elapsed = time.monotonic() - start
+        stats.elapsed = elapsed
+
+        if error is not None:
+            stats.error = error
+            return self.retry.next_delay(stats, elapsed)
+
+        stats.status = response.status_code
+
+        if response.status_code == 429:
+            # not processed by the server, safe to resend whatever the method
+            if stats.throttled >= self.max_throttled:
+                return None
+
+            stats.throttled += 1
+
+            if self.scheduler is not None:
+                self.scheduler.throttle(key, retry_after(response))
+                return 0.0
+
+            return retry_after(response)
+
+        if response.status_code in self.retry.statuses:
+            return self.retry.next_delay(stats, elapsed, response.status_code)
+
+        return None
+
+    def _learn(self, url, result):
+        '''
+        Remember which organization owns each network and device and which
+        shard serves each organization seen in a response. Listings are walked
+        the first time their URL is seen only
+        '''
+        segments = self._segments(url)
+
+        listing = segments[-1] in ('networks', 'devices', 'inventory', 'deviceStatuses')
+
+        if listing and len(segments) > 2 and isinstance(result, list) and self.shards.listed(url):
+            return
+
+        if segments[0] == 'organizations':
+            if len(segments) == 1 and isinstance(result, list):
+                for org in result:
+                    self.shards.learn_org(org)
+            elif len(segments) == 2:
+                self.shards.learn_org(result)
+            elif segments[-1] == 'networks' and isinstance(result, list):
+                for network in result:
+                    if isinstance(network, dict) and 'id' in network:
+                        self.shards.bind(network['id'], network.get('organizationId', segments[1]))
+            elif segments[-1] in ('inventory', 'deviceStatuses') and isinstance(result, list):
+                for device in result:
+                    if isinstance(device, dict) and 'serial' in device:
+                        self.shards.bind_device(device['serial'], device.get('networkId'), segments[1])
+        elif segments[0] == 'networks' and len(segments) == 2 and isinstance(result, dict):
+            if 'organizationId' in result:
+                self.shards.bind(segments[1], result['organizationId'])
+        elif segments[0] == 'networks' and segments[2:3] == ['devices'] and len(segments) <= 4:
+            for device in result if isinstance(result, list) else [result]:
+                if isinstance(device, dict) and 'serial' in device:
+                    self.shards.bind_device(device['serial'], segments[1])
+
+    def _cache_ttl(self, method, url, ttl, name=None):
+        if self.cache is None or method != 'GET':
+            return 0
+
+        return self.cache.ttl(name or endpoint_name(self._segments(url)), ttl or 0)
+
+    def _conditional_headers(self, method, url):
+        if self.conditional is None or method != 'GET':
+            return None
+
+        return self.conditional.headers(url)
+
+    def _decode(self, url, data):
+        if self.conditional is None:
+            return self._jsondec(data)
+
+        if data.status_code == 304:
+            # MISS when the entry was evicted after the request went out, the caller asks again
+            return self.conditional.not_modified(url)
+
+        start = time.perf_counter()
+        result = self._jsondec(data)
+
+        if data.ok:
+            # with the link, a 304 for a page does not carry it again
+            self.conditional.store(url, data.headers, result, len(data.content), time.perf_counter() - start, self._link(data))
+
+        return result
+
+    def _cached(self, method, url, ttl, data):
+        result = self._decode(url, data) if method == 'GET' else self._jsondec(data)
+
+        if self.cache is None:
+            return result
+
+        segments = self._segments(url)
+
+        if ttl:
+            if data.ok and result is not MISS:
+                self.cache.put(url, '/'.join(segments), result, len(data.content), ttl)
+        elif method != 'GET':
+            self.cache.invalidate('/'.join(segments), self._affected(segments))
+
+        return result
+
+    def invalidate(self, path):
+        '''
+        Drop what the response cache and the snapshot hold for a resource
+        written without going through request(), e.g. by an action batch
+        '''
+        segments = self._segments(path)
+
+        if self.cache is not None:
+            self.cache.invalidate('/'.join(segments), self._affected(segments))
+
+        if self.snapshot is not None:
+            self.snapshot.invalidate('/'.join(segments), self._affected(segments))
+
+    def _affected(self, segments):
+        # a network created, changed or deleted also changes its organization's network list
+        if segments[0] == 'networks' and len(segments) == 2:
+            org = self.shards.org(segments)
+            return ('organizations/{}/networks'.format(org),) if org else ()
+
+        return ()
+
+    def _snapshot_key(self, method, url, name=None):
+        '''
+        Snapshot key of a GET the snapshot covers, its path and query string
+        without the shard. None for anything else
+        '''
+        if self.snapshot is None or method != 'GET':
+            return None
+
+        segments = self._segments(url)
+
+        if not self.snapshot.covers(name or endpoint_name(segments)):
+            return None
+
+        query = urlsplit(url).query
+        return '/'.join(segments) + ('?' + query if query else '')
+
+    def _from_snapshot(self, url, key):
+        '''
+        (entry, decoded body) of the snapshot entry for key, (None, MISS) without one
+        '''
+        entry = self.snapshot.get(key)
+
+        if entry is None:
+            return None, MISS
+
+        result = self.codec.loads(entry.body) if entry.body else None
+        self._learn(url, result)
+
+        return entry, result
+
+    def _snapshotted(self, method, url, key, name, data, result=None):
+        '''
+        Store a fetched GET in the snapshot, or drop what a write changed.
+        result is the decoded body, which a 304 answered from the
+        ConditionalCache only has there
+        '''
+        if key is not None:
+            if data.status_code == 304:
+                if result is not None:
+                    self.snapshot.put(key, key.partition('?')[0], name or endpoint_name(self._segments(url)), self.codec.dumps(result), data.headers)
+            elif data.ok:
+                self.snapshot.put(key, key.partition('?')[0], name or endpoint_name(self._segments(url)), data.content, data.headers)
+        elif self.snapshot is not None and method != 'GET' and data.ok:
+            segments = self._segments(url)
+            self.snapshot.invalidate('/'.join(segments), self._affected(segments))
+
+    def _revalidation(self, entry):
+        headers = {}
+
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+
+        if entry.modified:
+            headers['If-Modified-Since'] = entry.modified
+
+        return headers
+
+    def _revalidated(self, url, key, name, data):
+        stats = self.snapshot.stats
+
+        if data.status_code == 304:
+            self.snapshot.touch(key)
+            stats.not_modified += 1
+        elif data.ok:
+            self._jsondec(data)
+            self._snapshotted('GET', url, key, name, data)
+            stats.revalidated += 1
+        else:
+            stats.failed += 1
+
+    def _record(self, record, result):
+        return result if record is None else record.wrap(result)
+
+    def _jsondec(self, data):
+        if data.ok:
+            if self.metrics is None or not data.content:
+                result = self.codec.loads(data.content) if data.content else None
+            else:
+                start = time.perf_counter()
+                result = self.codec.loads(data.content)
+                self._decoded(data, time.perf_counter() - start)
+
+            self._learn(data.url, result)
+            return result
+        else:
+            return {
+                'status': data.status_code,
+                'reason': data.reason
+            }
+
+    def _decoded(self, data, seconds):
+        # the CallStats of the send this body came from, same thread or task
+        stats = last_call()
+
+        if stats is not None:
+            self.metrics.decoded(stats.name or endpoint_name(self._segments(stats.url)), stats.method, seconds)
+
+    def _link(self, data):
+        return data.links.get('next', {}).get('url')
+
+    def _next(self, url, data):
+        if not data.ok:
+            raise APIError(data.status_code, data.reason)
+
+        if self.conditional is not None and data.status_code == 304:
+            result, link = self.conditional.not_modified_page(url)
+        else:
+            result, link = self._decode(url, data), self._link(data)
+
+        return result if result is MISS else result or [], link
+
+
+class Transport(BaseTransport):
+    '''
+    HTTP transport shared by a Dashboard and every endpoint object hanging from it.
+
+    One requests Session and one connection pool per transport, so TCP and TLS
+    connections are reused across endpoints and threads. Requests are paced by
+    the per-organization Scheduler, 429 responses are retried after the
+    server's Retry-After and other failures according to the RetryPolicy.
+
+    PARAMETERS
+        base_url:       API root, defaults to api.meraki.com
+        pool_size:      Number of connections kept alive per host
+        pool_block:     Block callers when every pooled connection is busy instead of opening extra ones
+        keep_alive:     Reuse connections between requests. Set to False to close them after every call
+        rate_limit:     Requests per second per organization, None disables the scheduler
+        retry:          RetryPolicy for failed requests, None disables retries
+        max_throttled:  How many 429 responses a single call waits out before giving up
+        max_redirects:  Shard redirects followed by a single call
+        cache:          ResponseCache for GET responses, None disables caching
+        conditional:    ConditionalCache to revalidate GET responses with ETag / If-Modified-Since
+        codec:          JSON codec name ('auto', 'orjson', 'ujson', 'json') or Codec instance
+        snapshot:       SnapshotStore answering GETs across restarts, revalidated in the background
+        coalesce:       Share one call between identical GETs in flight at the same time
+        metrics:        Metrics registry recording every call by endpoint, None disables it
+    '''
+    asynchronous = False
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=10, pool_block=False, keep_alive=True, rate_limit=5, retry=RetryPolicy(), max_throttled=5, max_redirects=5, cache=None, conditional=None, codec='auto', snapshot=None, coalesce=True, metrics=None):
+        super(Transport, self).__init__(api_key, base_url=base_url, rate_limit=rate_limit, retry=retry, max_throttled=max_throttled, max_redirects=max_redirects, cache=cache, conditional=conditional, codec=codec, snapshot=snapshot, coalesce=coalesce, metrics=metrics)
+
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+
+        adapter = SSLAdapter(
+            ssl.PROTOCOL_SSLv23,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=pool_block
+        )
+
+        self._session = Session()
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        # background snapshot revalidations
+        self._executor = None
+        self._lock = threading.Lock()
+        # GETs in flight by URL
+        self._flights = {}
+
+    def send(self, method, url, data=None, priority=None, headers=None, stream=False, name=None):
+        key, priority = self._schedule(url, priority)
+        stats, start = self._begin(method, url, name)
+        url = self.shards.route(url, key)
+
+        while True:
+            if self.scheduler is not None:
+                stats.waited += self.scheduler.acquire(key, priority)
+
+            try:
+                response = self._session.send(
+                    self._session.prepare_request(
+                        Request(
+                            method,
+                            url,
+                            data=data,
+                            headers=dict(self._headers, **headers) if headers else self._headers
+                        )
+                    ),
+                    verify=False,
+                    allow_redirects=False,
+                    stream=stream
+                )
+            except (RequestsConnectionError, Timeout) as error:
+                stats.attempts += 1
+                wait = self._backoff(key, stats, start, error=error)
+
+                if wait is None:
+                    self._observe(stats, error=error)
+                    raise
+            else:
+                location = self._redirect(key, url, response) if stats.redirects < self.max_redirects else None
+
+                # a redirect is not an attempt, it does not use up the retry policy
+                if location is None:
+                    stats.attempts += 1
+                    wait = self._backoff(key, stats, start, response=response)
+
+                    if wait is None:
+                        self._observe(stats, response, stream=stream)
+                        return response
+
+                # hand the connection back to the pool before sending again
+                if stream:
+                    response.close()
+
+                if location is not None:
+                    stats.redirects += 1
+                    url = location
+                    continue
+
+            time.sleep(wait)
+
+    def request(self, method, url, data=None, priority=None, ttl=None, name=None, record=None):
+        ttl = self._cache_ttl(method, url, ttl, name)
+
+        if ttl:
+            result = self.cache.get(url)
+
+            if result is not MISS:
+                return self._record(record, result)
+
+        key = self._snapshot_key(method, url, name)
+
+        if key is not None:
+            entry, result = self._from_snapshot(url, key)
+
+            if entry is not None:
+                if self.snapshot.stale(entry) and self.snapshot.claim(key):
+                    self._revalidator().submit(self._revalidate, url, key, name, entry)
+
+                return self._record(record, result)
+
+        if method == 'GET' and self.coalesce:
+            return self._record(record, self._single_flight(url, priority, ttl, key, name))
+
+        return self._record(record, self._fetch(method, url, data, priority, ttl, key, name))
+
+    def _fetch(self, method, url, data, priority, ttl, key, name):
+        response = self.send(method, url, data=data, priority=priority, headers=self._conditional_headers(method, url), name=name)
+        result = self._cached(method, url, ttl, response)
+
+        if result is MISS:
+            # a 304 for a validator evicted in the meantime, fetch the body unconditionally
+            response = self.send(method, url, data=data, priority=priority, name=name)
+            result = self._cached(method, url, ttl, response)
+
+        self._snapshotted(method, url, key, name, response, result)
+
+        return result
+
+    def _single_flight(self, url, priority, ttl, key, name):
+        '''
+        Fetch a GET, or wait for the identical one already in flight and share
+        its decoded result or exception
+        '''
+        with self._lock:
+            flight = self._flights.get(url)
+            leader = flight is None
+
+            if leader:
+                flight = self._flights[url] = Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            track(flight.stats)
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            flight.result = self._fetch('GET', url, None, priority, ttl, key, name)
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            flight.stats = last_call()
+
+            with self._lock:
+                del self._flights[url]
+
+            flight.done.set()
+
+        return flight.result
+
+    def _revalidator(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(2)
+
+            return self._executor
+
+    def _revalidate(self, url, key, name, entry):
+        try:
+            self._revalidated(url, key, name, self.send('GET', url, priority=BULK, headers=self._revalidation(entry), name=name))
+        except Exception:
+            self.snapshot.stats.failed += 1
+        finally:
+            self.snapshot.release(key)
+
+    def paginate(self, url, prefetch=False, priority=None, name=None):
+        '''
+        Yield the items of every page, following the rel=next Link header lazily.
+        With prefetch the next page is downloaded in the background while the
+        caller consumes the current one; at most two pages are held in memory.
+        '''
+        executor = ThreadPoolExecutor(1) if prefetch else None
+
+        try:
+            items, url = self._page(url, priority, name)
+
+            while True:
+                if executor is not None and url is not None:
+                    future = executor.submit(self._page, url, priority, name)
+
+                for item in items:
+                    yield item
+
+                if url is None:
+                    break
+
+                items, url = future.result() if executor is not None else self._page(url, priority, name)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def _page(self, url, priority=None, name=None):
+        items, link = self._next(url, self.send('GET', url, priority=priority, headers=self._conditional_headers('GET', url), name=name))
+
+        if items is MISS:
+            items, link = self._next(url, self.send('GET', url, priority=priority, name=name))
+
+        return items, link
+
+    def stream(self, url, priority=None, name=None, chunk_size=65536, record=None):
+        '''
+        Yield the elements of a JSON array response while it downloads, so peak
+        memory depends on the size of one element, not of the whole response.
+        Streamed responses bypass the response and conditional caches. With a
+        record class every element is yielded as one of its records.
+        '''
+        response = self.send('GET', url, priority=priority, stream=True, name=name)
+
+        try:
+            if not response.ok:
+                raise APIError(response.status_code, response.reason)
+
+            parser = ArrayStream()
+
+            for chunk in response.iter_content(chunk_size):
+                items = parser.feed(chunk)
+                self._learn(url, items)
+
+                for item in items:
+                    yield item if record is None else record(item)
+
+            for item in parser.close():
+                yield item if record is None else record(item)
+        finally:
+            response.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        self._session.close()
+
+
+class AsyncResponse(object):
+    '''
+    Fully read aiohttp response exposing the requests.Response attributes the transports use.
+    A streamed response keeps its unread aiohttp response in `raw` instead of `content`
+    '''
+    __slots__ = ('url', 'status_code', 'reason', 'headers', 'links', 'content', 'raw')
+
+    def __init__(self, url, status_code, reason, headers, links, content, raw=None):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.links = links
+        self.content = content
+        self.raw = raw
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+class AsyncTransport(BaseTransport):
+    '''
+    asyncio counterpart of Transport, backed by an aiohttp connection pool.
+
+    request() returns a coroutine, so every endpoint method built on top of it
+    is awaitable. Requires the optional aiohttp dependency.
+
+    PARAMETERS
+        base_url:       API root, defaults to api.meraki.com
+        pool_size:      Maximum number of simultaneous connections
+        pool_block:     Accepted for signature compatibility, aiohttp always queues over the limit
+        keep_alive:     Reuse connections between requests. Set to False to close them after every call
+        rate_limit:     Requests per second per organization, None disables the scheduler
+        retry:          RetryPolicy for failed requests, None disables retries
+        max_throttled:  How many 429 responses a single call waits out before giving up
+        max_redirects:  Shard redirects followed by a single call
+        cache:          ResponseCache for GET responses, None disables caching
+        conditional:    ConditionalCache to revalidate GET responses with ETag / If-Modified-Since
+        codec:          JSON codec name ('auto', 'orjson', 'ujson', 'json') or Codec instance
+        snapshot:       SnapshotStore answering GETs across restarts, revalidated in the background
+        coalesce:       Share one call between identical GETs in flight at the same time
+        metrics:        Metrics registry recording every call by endpoint, None disables it
+    '''
+    asynchronous = True
+
+    def __init__(self, api_key=None, base_url=BASE_URL, pool_size=100, pool_block=True, keep_alive=True, rate_limit=5, retry=RetryPolicy(), max_throttled=5, max_redirects=5, cache=None, conditional=None, codec='auto', snapshot=None, coalesce=True, metrics=None):
+        super(AsyncTransport, self).__init__(api_key, base_url=base_url, rate_limit=rate_limit, retry=retry, max_throttled=max_throttled, max_redirects=max_redirects, cache=cache, conditional=conditional, codec=codec, snapshot=snapshot, coalesce=coalesce, metrics=metrics)
+
+        if aiohttp is None:
+            raise ImportError('AsyncDashboard requires aiohttp: pip install meraki-dashboard-api[async]')
+
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._session = None
+        # background snapshot revalidations, referenced until done
+        self._revalidations = set()
+        # GETs in flight by URL
+        self._flights = {}
+
+    def _get_session(self):
+        # aiohttp sessions must be created inside a running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._pool_size,
+                    force_close=not self._keep_alive,
+                    ssl=False
+                ),
+                headers=self._headers
+            )
+
+        return self._session
+
+    async def send(self, method, url, data=None, priority=None, headers=None, stream=False, name=None):
+        key, priority = self._schedule(url, priority)
+        stats, start = self._begin(method, url, name)
+        url = self.shards.route(url, key)
+
+        while True:
+            if self.scheduler is not None:
+                stats.waited += await self.scheduler.acquire_async(key, priority)
+
+            try:
+                raw = await self._get_session().request(method, url, data=data, headers=headers, allow_redirects=False)
+                link = raw.links.get('next')
+                response = AsyncResponse(
+                    url,
+                    raw.status,
+                    raw.reason,
+                    raw.headers,
+                    {'next': {'url': str(link['url'])}} if link else {},
+                    b''
+                )
+
+                # successful streamed bodies are left for the caller, which releases the connection
+                if stream and raw.status < 300:
+                    response.raw = raw
+                else:
+                    async with raw:
+                        response.content = await raw.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                stats.attempts += 1
+                wait = self._backoff(key, stats, start, error=error)
+
+                if wait is None:
+                    self._observe(stats, error=error)
+                    raise
+            else:
+                location = self._redirect(key, url, response) if stats.redirects < self.max_redirects else None
+
+                if location is not None:
+                    stats.redirects += 1
+                    url = location
+                    continue
+
+                stats.attempts += 1
+                wait = self._backoff(key, stats, start, response=response)
+
+                if wait is None:
+                    self._observe(stats, response, stream=stream)
+                    return response
+
+            await asyncio.sleep(wait)
+
+    async def request(self, method, url, data=None, priority=None, ttl=None, name=None, record=None):
+        ttl = self._cache_ttl(method, url, ttl, name)
+
+        if ttl:
+            result = self.cache.get(url)
+
+            if result is not MISS:
+                return self._record(record, result)
+
+        key = self._snapshot_key(method, url, name)
+
+        if key is not None:
+            entry, result = self._from_snapshot(url, key)
+
+            if entry is not None:
+                if self.snapshot.stale(entry) and self.snapshot.claim(key):
+                    task = asyncio.ensure_future(self._revalidate(url, key, name, entry))
+                    self._revalidations.add(task)
+                    task.add_done_callback(self._revalidations.discard)
+
+                return self._record(record, result)
+
+        if method == 'GET' and self.coalesce:
+            return self._record(record, await self._single_flight(url, priority, ttl, key, name))
+
+        return self._record(record, await self._fetch(method, url, data, priority, ttl, key, name))
+
+    async def _fetch(self, method, url, data, priority, ttl, key, name):
+        response = await self.send(method, url, data=data, priority=priority, headers=self._conditional_headers(method, url), name=name)
+        result = self._cached(method, url, ttl, response)
+
+        if result is MISS:
+            # a 304 for a validator evicted in the meantime, fetch the body unconditionally
+            response = await self.send(method, url, data=data, priority=priority, name=name)
+            result = self._cached(method, url, ttl, response)
+
+        self._snapshotted(method, url, key, name, response, result)
+
+        return result
+
+    async def _flight(self, url, priority, ttl, key, name):
+        try:
+            return await self._fetch('GET', url, None, priority, ttl, key, name), last_call()
+        finally:
+            del self._flights[url]
+
+    async def _single_flight(self, url, priority, ttl, key, name):
+        '''
+        Fetch a GET, or await the identical one already in flight. The call runs
+        in its own task so that cancelling one caller does not cancel the others
+        '''
+        flight = self._flights.get(url)
+
+        if flight is None:
+            flight = self._flights[url] = asyncio.ensure_future(self._flight(url, priority, ttl, key, name))
+        else:
+            self.coalesced += 1
+
+        result, stats = await asyncio.shield(flight)
+        track(stats)
+
+        return result
+
+    async def _revalidate(self, url, key, name, entry):
+        try:
+            self._revalidated(url, key, name, await self.send('GET', url, priority=BULK, headers=self._revalidation(entry), name=name))
+        except Exception:
+            self.snapshot.stats.failed += 1
+        finally:
+            self.snapshot.release(key)
+
+    async def paginate(self, url, prefetch=False, priority=None, name=None):
+        '''
+        Async generator version of Transport.paginate.
+        '''
+        future = None
+
+        try:
+            items, url = await self._page(url, priority, name)
+
+            while True:
+                if prefetch and url is not None:
+                    future = asyncio.ensure_future(self._page(url, priority, name))
+
+                for item in items:
+                    yield item
+
+                if url is None:
+                    break
+
+                items, url = await future if prefetch else await self._page(url, priority, name)
+                future = None
+        finally:
+            if future is not None:
+                future.cancel()
+
+    async def _page(self, url, priority=None, name=None):
+        items, link = self._next(url, await self.send('GET', url, priority=priority, headers=self._conditional_headers('GET', url), name=name))
+
+        if items is MISS:
+            items, link = self._next(url, await self.send('GET', url, priority=priority, name=name))
+
+        return items, link
+
+    async def stream(self, url, priority=None, name=None, chunk_size=65536, record=None):
+        '''
+        Async generator version of Transport.stream.
+        '''
+        response = await self.send('GET', url, priority=priority, stream=True, name=name)
+
+        if not response.ok:
+            raise APIError(response.status_code, response.reason)
+
+        parser = ArrayStream()
+
+        try:
+            if response.raw is not None:
+                async for chunk in response.raw.content.iter_chunked(chunk_size):
+                    items = parser.feed(chunk)
+                    self._learn(url, items)
+
+                    for item in items:
+                        yield item if record is None else record(item)
+
+            for item in parser.close():
+                yield item if record is None else record(item)
+        finally:
+            if response.raw is not None:
+                response.raw.release()
+
+    async def close(self):
+        if self._revalidations:
+            await asyncio.gather(*self._revalidations, return_exceptions=True)
+
+        if self._session is not None:
+            await self._session.close()
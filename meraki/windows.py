@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+from meraki.concurrency import FanOut
+
+
+# longest t0..t1 span the history endpoints accept, 30 days
+MAX_SPAN = 2592000
+
+
+def windows(t0, t1, span=MAX_SPAN, align=1):
+    '''
+    (start, end) pairs covering t0 to t1 in windows of at most span seconds.
+    Inner boundaries fall on multiples of align, the sample resolution, so
+    every window starts on a sample
+    '''
+    if t1 <= t0:
+        return []
+
+    step = span - span % align if span >= align else span
+    origin = t0 - t0 % align
+    result = []
+    start = t0
+
+    while start < t1:
+        # first boundary past start, counted from the aligned origin
+        end = min(t1, origin + ((start - origin) // step + 1) * step)
+        result.append((start, end))
+        start = end
+
+    return result
+
+
+def stitch(parts, key):
+    '''
+    One list of the samples of consecutive windows in timestamp order,
+    dropping the sample both sides of a boundary returned
+    '''
+    samples = [sample for part in parts for sample in part]
+    # stable: samples without a timestamp keep their place among themselves
+    samples.sort(key=lambda sample: (sample.get(key) is not None, sample.get(key)))
+
+    result = []
+    last = None
+
+    for sample in samples:
+        stamp = sample.get(key)
+
+        if stamp is not None and stamp == last:
+            continue
+
+        result.append(sample)
+        last = stamp
+
+    return result
+
+
+class RangeResult(object):
+    '''
+    Samples of every series of a windowed fetch, stitched in timestamp order
+    and keyed by the series' arguments, e.g. (networkId, serial).
+
+    A series with a failed window is left out of the results rather than
+    returned with a hole; its failed Tasks are in `failures` and its key in
+    `incomplete`.
+    '''
+    def __init__(self, key, record=None):
+        self.key = key
+        self.record = record
+        self.series = {}
+        self.failures = []
+        self.incomplete = set()
+        self._parts = {}
+
+    def __len__(self):
+        return len(self.series)
+
+    def __contains__(self, args):
+        return args in self.series
+
+    def __getitem__(self, args):
+        return self.series[args]
+
+    def __iter__(self):
+        return iter(self.series.items())
+
+    @property
+    def ok(self):
+        return not self.failures
+
+    def add(self, task):
+        args, start = task.args[:-2], task.args[-2]
+
+        if not task.ok:
+            self.failures.append(task)
+            self.incomplete.add(args)
+        else:
+            self._parts.setdefault(args, {})[start] = task.result or []
+
+    def _stitch(self):
+        for args, parts in self._parts.items():
+            if args in self.incomplete:
+                continue
+
+            samples = stitch([parts[start] for start in sorted(parts)], self.key)
+            self.series[args] = samples if self.record is None else self.record.wrap(samples)
+
+        self._parts = {}
+        return self
+
+    def collect(self, fanout, asynchronous=False):
+        '''
+        Gather the 'window' tasks of a FanOut and stitch them once all are in.
+        Returns self, or a coroutine resolving to self when asynchronous.
+        '''
+        if asynchronous:
+            return self._acollect(fanout)
+
+        fanout.each(self.add)
+        return self._stitch()
+
+    async def _acollect(self, fanout):
+        await fanout.each(self.add, asynchronous=True)
+        return self._stitch()
+
+    def __repr__(self):
+        return '<RangeResult {} series, {} incomplete>'.format(len(self.series), len(self.incomplete))
+
+
+def fetch_range(func, series, t0, t1, key, span=MAX_SPAN, align=1, workers=8, asynchronous=False, record=None):
+    '''
+    Fetch t0..t1 for every series in windows the server accepts, all windows
+    of all series concurrently, and stitch each series back together.
+
+    PARAMETERS
+        func:           Called as func(*args, start, end) for every window of every series
+        series:         Argument tuples of the series, e.g. (networkId, serial)
+        key:            Timestamp field of a sample, used to order and de-duplicate
+        span:           Longest window in seconds
+        align:          Sample resolution in seconds, inner window boundaries fall on its multiples
+        workers:        Maximum calls in flight
+        record:         Series class to wrap every stitched list of samples in
+    '''
+    calls = [('window', func, tuple(args) + (start, end)) for args in series for start, end in windows(t0, t1, span, align)]
+
+    return RangeResult(key, record).collect(FanOut(calls, workers=workers), asynchronous)
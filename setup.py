@@ -20,6 +20,11 @@ setuptools.setup(
         'requests-toolbelt',
         'urllib3'
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'arrays': ['numpy']
+    },
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: MIT License',
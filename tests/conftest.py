@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import json
+import time
+import threading
+import collections
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from meraki import Dashboard
+from meraki.standin import StandIn
+
+
+class Scripted(object):
+    '''
+    Local server answering each path with the responses queued for it, in
+    order, repeating the last one. A response is (status, headers, body);
+    a body that is not bytes is sent as JSON. Requests are kept in `seen`
+    as (method, path, headers) and answered after `latency` seconds
+    '''
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.responses = collections.defaultdict(list)
+        self.seen = []
+        self._server = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}/api/v0'.format(self._server.server_address[1])
+
+    def add(self, path, status=200, body=None, headers=()):
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf8')
+
+        self.responses['/api/v0/' + path].append((status, dict(headers), body or b''))
+
+    def hits(self, path):
+        return [seen for seen in self.seen if seen[1].split('?')[0] == '/api/v0/' + path]
+
+    def start(self):
+        scripted = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+
+                if length:
+                    self.rfile.read(length)
+
+                path = self.path.split('?')[0]
+                scripted.seen.append((self.command, self.path, dict(self.headers)))
+                queue = scripted.responses.get(path)
+
+                if not queue:
+                    status, headers, body = 404, {}, b''
+                else:
+                    status, headers, body = queue.pop(0) if len(queue) > 1 else queue[0]
+
+                time.sleep(scripted.latency)
+                self.send_response(status)
+
+                for key, value in headers.items():
+                    self.send_header(key, value.replace('{url}', scripted.url))
+
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def scripted():
+    server = Scripted().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def standin():
+    with StandIn(networks=3, devices=4, clients=5, batch_delay=0.05) as api:
+        yield api
+
+
+@pytest.fixture
+def sharded():
+    with StandIn(networks=3, devices=4, clients=5, shards=1, batch_delay=0.05) as api:
+        yield api
+
+
+def dashboard(url, **kwargs):
+    '''
+    Dashboard on a local server, without the rate limiter unless asked
+    '''
+    kwargs.setdefault('rate_limit', None)
+    return Dashboard('test', base_url=url, **kwargs)
+
+
+def org_of(api):
+    return list(api.organizations)[0]
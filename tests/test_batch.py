@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+import pytest
+
+from meraki import AsyncDashboard
+from meraki.cache import ResponseCache
+from meraki.exceptions import APIError
+from meraki.snapshot import SnapshotStore
+
+from conftest import dashboard, org_of
+
+
+def retag(batch, network, devices, tag):
+    for device in devices:
+        batch.networks.devices.update(network, device['serial'], update={'tags': tag})
+
+
+def test_writes_are_recorded_as_actions(scripted):
+    batch = dashboard(scripted.url).batch('1')
+    batch.networks.devices.update('N_1', 'Q2AA', update={'tags': 'lobby'})
+    batch.organizations.claim('1', {'serial': 'Q2BB'})
+
+    assert batch.actions == [
+        {'resource': '/networks/N_1/devices/Q2AA', 'operation': 'update', 'body': {'tags': 'lobby'}},
+        {'resource': '/organizations/1', 'operation': 'claim', 'body': {'serial': 'Q2BB'}}
+    ]
+    assert scripted.seen == []
+
+
+def test_batches_are_polled_until_they_finish(scripted):
+    scripted.add('organizations/1/actionBatches', 201, {'id': 'B1', 'status': {'completed': False, 'failed': False}})
+    scripted.add('organizations/1/actionBatches', 201, {'id': 'B2', 'status': {'completed': False, 'failed': False}})
+    scripted.add('organizations/1/actionBatches/B1', 200, {'id': 'B1', 'status': {'completed': True, 'failed': False}})
+    scripted.add('organizations/1/actionBatches/B2', 200, {'id': 'B2', 'status': {'completed': False, 'failed': True, 'errors': ['bad']}})
+
+    with dashboard(scripted.url).batch('1', size=1, interval=0.01) as batch:
+        batch.networks.update('N_1', {'name': 'a'})
+        batch.networks.update('N_2', {'name': 'b'})
+
+    assert (batch.result.actions, batch.result.completed, batch.result.failed) == (2, 1, 1)
+    assert batch.result.errors == ['bad']
+    assert [seen[0] for seen in scripted.hits('organizations/1/actionBatches')] == ['POST', 'POST']
+
+
+def test_batch_applies_the_writes(standin):
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+
+    with dash.batch(org_of(standin), size=2, interval=0.05) as batch:
+        retag(batch, network, dash.networks.devices.list(network), 'lobby')
+
+    assert batch.result.ok
+    assert (batch.result.actions, batch.result.completed, len(batch.result.batches)) == (4, 2, 2)
+    assert len(batch) == 0
+    assert all(device['tags'] == 'lobby' for device in dash.networks.devices.list(network))
+
+
+@pytest.mark.parametrize('store', ['cache', 'snapshot'])
+def test_batch_invalidates_cached_reads(standin, store):
+    if store == 'cache':
+        dash = dashboard(standin.url, cache=ResponseCache(ttls={'networks.devices': 300}))
+    else:
+        dash = dashboard(standin.url, snapshot=SnapshotStore(':memory:'))
+
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    devices = dash.networks.devices.list(network)
+
+    with dash.batch(org_of(standin), interval=0.05) as batch:
+        retag(batch, network, devices, 'lobby')
+
+    assert batch.result.ok
+    assert all(device['tags'] == 'lobby' for device in dash.networks.devices.list(network))
+
+
+def test_batch_timeout_returns_what_finished(standin):
+    standin.batch_delay = 10
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    batch = dash.batch(org_of(standin), size=1, concurrency=2, interval=0.05, timeout=0.1)
+    retag(batch, network, dash.networks.devices.list(network), 'lobby')
+
+    result = batch.submit()
+
+    assert not result.ok
+    assert len(result.pending) == 2
+    assert result.unsent == 2
+    assert len(batch) == 2
+
+
+def test_batch_without_id_is_a_failure(scripted):
+    scripted.add('organizations/1/actionBatches', 201, {'confirmed': True})
+    dash = dashboard(scripted.url)
+
+    with dash.batch('1', interval=0.01) as batch:
+        batch.networks.update('N_1', {'name': 'x'})
+
+    assert batch.result.failed == 1
+    assert not batch.result.ok
+
+
+def test_sync_with_on_async_dashboard_raises(standin):
+    dash = AsyncDashboard('test', base_url=standin.url)
+
+    with pytest.raises(APIError):
+        with dash.batch(org_of(standin)):
+            pass
+
+
+def test_async_batch(standin):
+    network = next(iter(standin.organizations[org_of(standin)].networks))
+
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None, cache=ResponseCache(ttls={'networks.devices': 300})) as dash:
+            devices = await dash.networks.devices.list(network)
+
+            async with dash.batch(org_of(standin), interval=0.05) as batch:
+                retag(batch, network, devices, 'lobby')
+
+            return batch.result, await dash.networks.devices.list(network)
+
+    result, devices = asyncio.run(main())
+    assert result.ok
+    assert all(device['tags'] == 'lobby' for device in devices)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+from meraki import AsyncDashboard
+
+from conftest import dashboard, org_of
+
+
+def test_bulk_update_reports_every_item(scripted):
+    for serial in ('Q2AA', 'Q2BB', 'Q2CC'):
+        scripted.add('networks/N_1/devices/' + serial, 200, {'serial': serial, 'tags': ' bulk '})
+
+    dash = dashboard(scripted.url)
+    items = [('N_1', serial, {'tags': ' bulk '}) for serial in ('Q2AA', 'Q2BB', 'Q2CC', 'Q2XX-MISSING')]
+
+    result = dash.networks.devices.bulk_update(items, workers=4)
+
+    assert (len(result), len(result.successes), len(result.failures)) == (4, 3, 1)
+    assert result.failures[0].args[1] == 'Q2XX-MISSING'
+    assert sorted(success.result['serial'] for success in result.successes) == ['Q2AA', 'Q2BB', 'Q2CC']
+
+
+def test_retry_failed_sends_only_the_failures(scripted):
+    scripted.add('networks/N_1/ssids/0', 200, {'number': 0, 'name': 'a'})
+    dash = dashboard(scripted.url)
+    result = dash.networks.ssids.bulk_update([('N_1', '0', {'name': 'a'}), ('N_1', '99', {'name': 'b'})])
+    seen = len(scripted.seen)
+
+    again = result.retry_failed()
+
+    assert len(scripted.seen) == seen + 1
+    assert (len(again.successes), len(again.failures)) == (0, 1)
+
+
+def test_async_bulk_update(standin):
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None) as dash:
+            network = (await dash.organizations.networks(org_of(standin)))[0]['id']
+            serials = [device['serial'] for device in await dash.networks.devices.list(network)]
+            return await dash.networks.devices.bulk_update([(network, serial, {'name': 'x'}) for serial in serials])
+
+    result = asyncio.run(main())
+
+    assert result.ok
+    assert len(result) == 4
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+
+from meraki.cache import ResponseCache, MISS
+
+from conftest import dashboard, org_of
+
+
+def test_repeated_reads_are_answered_from_the_cache(scripted):
+    scripted.add('organizations/1/licenseState', 200, {'status': 'OK'})
+    cache = ResponseCache()
+    dash = dashboard(scripted.url, cache=cache)
+
+    assert dash.organizations.license_state('1') == dash.organizations.license_state('1') == {'status': 'OK'}
+    assert len(scripted.seen) == 1
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+
+
+def test_ttl_override_of_zero_disables_caching(scripted):
+    scripted.add('organizations/1/licenseState', 200, {'status': 'OK'})
+    dash = dashboard(scripted.url, cache=ResponseCache(ttls={'organizations.licenseState': 0}))
+
+    dash.organizations.license_state('1')
+    dash.organizations.license_state('1')
+
+    assert len(scripted.seen) == 2
+
+
+def test_entries_expire():
+    cache = ResponseCache()
+    cache.put('https://api/networks/N_1', 'networks/N_1', {'id': 'N_1'}, 10, 0.05)
+
+    assert cache.get('https://api/networks/N_1') == {'id': 'N_1'}
+
+    time.sleep(0.06)
+
+    assert cache.get('https://api/networks/N_1') is MISS
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_go_first():
+    cache = ResponseCache(max_entries=2)
+    cache.put('a', 'networks/A', 1, 1, 60)
+    cache.put('b', 'networks/B', 2, 1, 60)
+    cache.get('a')
+    cache.put('c', 'networks/C', 3, 1, 60)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, MISS, 3)
+    assert cache.stats.evictions == 1
+
+
+def test_bodies_larger_than_the_cache_are_not_stored():
+    cache = ResponseCache(max_bytes=100)
+    cache.put('a', 'networks/A', 1, 101, 60)
+    cache.put('b', 'networks/B', 2, 60, 60)
+    cache.put('c', 'networks/C', 3, 60, 60)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (MISS, MISS, 3)
+    assert cache.size == 60
+
+
+def test_write_drops_the_path_its_parents_and_children():
+    cache = ResponseCache()
+    cache.put('1', 'networks/N_1', 1, 1, 60)
+    cache.put('2', 'networks/N_1/devices', 2, 1, 60)
+    cache.put('3', 'networks/N_1/devices/Q2XX', 3, 1, 60)
+    cache.put('4', 'networks/N_2/devices', 4, 1, 60)
+
+    cache.invalidate('networks/N_1/devices')
+
+    assert [cache.get(url) for url in '1234'] == [MISS, MISS, MISS, 4]
+
+
+def test_write_invalidates_cached_reads(scripted):
+    scripted.add('networks/N_1/devices', 200, [{'serial': 'Q2AA', 'name': 'a'}])
+    scripted.add('networks/N_1/devices', 200, [{'serial': 'Q2AA', 'name': 'renamed'}])
+    scripted.add('networks/N_1/devices/Q2AA', 200, {'serial': 'Q2AA', 'name': 'renamed'})
+    dash = dashboard(scripted.url, cache=ResponseCache(ttls={'networks.devices': 300}))
+
+    assert dash.networks.devices.list('N_1')[0]['name'] == 'a'
+    assert dash.networks.devices.list('N_1')[0]['name'] == 'a'
+
+    dash.networks.devices.update('N_1', 'Q2AA', {'name': 'renamed'})
+
+    assert dash.networks.devices.list('N_1')[0]['name'] == 'renamed'
+    assert len(scripted.hits('networks/N_1/devices')) == 2
+
+
+def test_network_write_invalidates_the_organization_network_list(standin):
+    dash = dashboard(standin.url, cache=ResponseCache(ttls={'organizations.networks': 300}))
+    org = org_of(standin)
+    network = dash.organizations.networks(org)[0]['id']
+
+    dash.networks.update(network, name='renamed')
+
+    assert dash.organizations.networks(org)[0]['name'] == 'renamed'
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+from meraki import AsyncDashboard
+from meraki.census import ClientCensus
+
+from conftest import dashboard, org_of
+
+
+def test_census_merges_clients_seen_by_several_devices(standin):
+    dash = dashboard(standin.url)
+    census = dash.organizations.client_census(org_of(standin), workers=4)
+
+    # 3 networks of 4 devices with 5 clients each, one of which every device of the network sees
+    assert (census.devices, census.rows, len(census)) == (12, 60, 3 * (4 * 4 + 1))
+    assert sorted(client.devices for client in census)[-3:] == [4, 4, 4]
+    assert census.failures == []
+
+
+def test_census_of_an_organization(scripted):
+    scripted.add('organizations/1/inventory', 200, [{'serial': 'Q2AA', 'networkId': 'N_1'}, {'serial': 'Q2BB', 'networkId': 'N_1'}, {'serial': 'Q2CC', 'networkId': None}])
+    scripted.add('devices/Q2AA/clients', 200, [{'mac': 'aa', 'usage': {'sent': 1.0, 'recv': 1.0}}, {'mac': 'bb', 'usage': {'sent': 1.0, 'recv': 1.0}}])
+    scripted.add('devices/Q2BB/clients', 200, [{'mac': 'AA', 'usage': {'sent': 2.0, 'recv': 2.0}}])
+    dash = dashboard(scripted.url)
+
+    census = dash.organizations.client_census('1', workers=2)
+
+    # the unassigned device is not asked for clients
+    assert (census.devices, census.rows, len(census)) == (2, 3, 2)
+    assert census['aa'].usage == {'sent': 3.0, 'recv': 3.0}
+    assert census.failures == []
+
+
+def test_census_adds_up_usage_and_keeps_the_busiest_device():
+    census = ClientCensus()
+    census.add('Q2AA', [{'mac': 'F0:18:00:00:00:01', 'ip': '10.0.0.1', 'usage': {'sent': 1.0, 'recv': 2.0}}])
+    census.add('Q2BB', [{'mac': 'f0:18:00:00:00:01', 'ip': '10.0.0.2', 'usage': {'sent': 10.0, 'recv': 20.0}}, {'mac': None}])
+
+    client = census['F0:18:00:00:00:01']
+
+    assert len(census) == 1
+    assert client.usage == {'sent': 11.0, 'recv': 22.0}
+    assert (client.serial, client.ip, client.devices) == ('Q2BB', '10.0.0.2', 2)
+
+
+def test_census_prefers_the_latest_sighting():
+    census = ClientCensus()
+    census.add('Q2AA', [{'mac': 'aa', 'lastSeen': 200, 'usage': {'sent': 1.0}}])
+    census.add('Q2BB', [{'mac': 'aa', 'lastSeen': 100, 'usage': {'sent': 100.0}}])
+
+    assert census['aa'].serial == 'Q2AA'
+
+
+def test_async_census(standin):
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None) as dash:
+            return await dash.organizations.client_census(org_of(standin), workers=4)
+
+    assert len(asyncio.run(main())) == 51
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from meraki import AsyncDashboard
+
+from conftest import Scripted, dashboard
+
+INVENTORY = [{'serial': 'Q2XX-{:04d}'.format(i)} for i in range(12)]
+
+
+@pytest.fixture
+def slow():
+    server = Scripted(latency=0.2).start()
+    server.add('organizations/1/inventory', 200, INVENTORY)
+    yield server
+    server.stop()
+
+
+def test_identical_reads_in_flight_share_one_call(slow):
+    dash = dashboard(slow.url)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda i: dash.organizations.inventory('1'), range(8)))
+
+    assert len(slow.seen) == 1
+    assert dash._transport.coalesced == 7
+    assert all(result == INVENTORY for result in results)
+
+
+def test_coalescing_can_be_turned_off(slow):
+    dash = dashboard(slow.url, coalesce=False)
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda i: dash.organizations.inventory('1'), range(4)))
+
+    assert len(slow.seen) == 4
+
+
+def test_errors_are_shared_too(slow):
+    dash = dashboard(slow.url)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda i: dash.organizations.inventory('000000'), range(4)))
+
+    assert len(slow.seen) == 1
+    assert [result['status'] for result in results] == [404] * 4
+
+
+def test_async_reads_in_flight_share_one_call(slow):
+    async def main():
+        async with AsyncDashboard('test', base_url=slow.url, rate_limit=None) as dash:
+            results = await asyncio.gather(*[dash.organizations.inventory('1') for i in range(8)])
+            return results, dash._transport.coalesced
+
+    results, coalesced = asyncio.run(main())
+
+    assert len(slow.seen) == 1
+    assert coalesced == 7
+    assert all(result == INVENTORY for result in results)
+
+
+def test_cancelling_one_async_caller_does_not_cancel_the_others(slow):
+    async def main():
+        async with AsyncDashboard('test', base_url=slow.url, rate_limit=None) as dash:
+            first = asyncio.ensure_future(dash.organizations.inventory('1'))
+            second = asyncio.ensure_future(dash.organizations.inventory('1'))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            return await second
+
+    assert asyncio.run(main()) == INVENTORY
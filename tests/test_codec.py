@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pytest
+
+from meraki.codec import CODECS, Codec, get_codec
+
+from conftest import dashboard, org_of
+
+INSTALLED = sorted(name for name, codec in CODECS.items() if codec is not None)
+
+
+@pytest.mark.parametrize('name', INSTALLED)
+def test_round_trip(name):
+    codec = get_codec(name)
+    value = [{'serial': 'Q2XX-0001', 'name': 'café ☕', 'lat': 37.418095101036, 'tags': None, 'ok': True, 'n': -3}]
+
+    assert codec.loads(codec.dumps(value)) == value
+    assert codec.loads(Codec().dumps(value)) == value
+
+
+@pytest.mark.parametrize('name', INSTALLED)
+def test_falls_back_on_what_the_backend_rejects(name):
+    codec = get_codec(name)
+    big = 2 ** 70
+
+    assert codec.loads(b'{"id": 1180591620717411303424}') == {'id': big}
+    assert codec.loads(codec.dumps({'id': big})) == {'id': big}
+
+
+def test_auto_picks_the_fastest_installed_codec():
+    assert get_codec('auto').name == [name for name in ('orjson', 'ujson', 'json') if name in INSTALLED][0]
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+@pytest.mark.parametrize('name', INSTALLED)
+def test_every_codec_decodes_the_same_responses(standin, name):
+    org = org_of(standin)
+
+    assert dashboard(standin.url, codec=name).organizations.inventory(org) == dashboard(standin.url, codec='json').organizations.inventory(org)
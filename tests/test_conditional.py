@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+from meraki import AsyncDashboard
+from meraki.cache import ConditionalCache
+
+from conftest import dashboard, org_of
+
+EVENTS = 'networks/N_1/clients/k1/events'
+
+
+class EvictingCache(ConditionalCache):
+    '''
+    Drops every entry right after handing out its validators, as a full
+    cache would between sending a request and reading its 304
+    '''
+    def headers(self, url):
+        headers = super(EvictingCache, self).headers(url)
+        self.clear()
+        return headers
+
+
+def test_not_modified_answers_from_the_cache(scripted):
+    body = [{'serial': 'Q2AA'}]
+    scripted.add('organizations/1/inventory', 200, body, {'ETag': '"a"'})
+    scripted.add('organizations/1/inventory', 304, headers={'ETag': '"a"'})
+    conditional = ConditionalCache()
+    dash = dashboard(scripted.url, conditional=conditional)
+
+    assert dash.organizations.inventory('1') == body
+    assert dash.organizations.inventory('1') == body
+
+    hits = scripted.hits('organizations/1/inventory')
+    assert hits[1][2]['If-None-Match'] == '"a"'
+    assert conditional.stats.not_modified == 1
+
+
+def test_not_modified_after_eviction_fetches_again(scripted):
+    body = [{'id': 'N_1'}]
+    scripted.add('organizations/1/networks', 200, body, {'ETag': '"a"'})
+    scripted.add('organizations/1/networks', 304, headers={'ETag': '"a"'})
+    scripted.add('organizations/1/networks', 200, body, {'ETag': '"a"'})
+    dash = dashboard(scripted.url, conditional=EvictingCache())
+
+    assert dash.organizations.networks('1') == body
+    assert dash.organizations.networks('1') == body
+
+    hits = scripted.hits('organizations/1/networks')
+    assert len(hits) == 3
+    assert 'If-None-Match' in hits[1][2]
+    assert 'If-None-Match' not in hits[2][2]
+
+
+def test_not_modified_page_after_eviction_fetches_again(scripted):
+    body = [{'occurredAt': 1}]
+    scripted.add('networks/N_1/clients/k1/events', 200, body, {'ETag': '"a"'})
+    scripted.add('networks/N_1/clients/k1/events', 304, headers={'ETag': '"a"'})
+    scripted.add('networks/N_1/clients/k1/events', 200, body, {'ETag': '"a"'})
+    dash = dashboard(scripted.url, conditional=EvictingCache())
+
+    assert list(dash.networks.clients.iter_events('N_1', 'k1')) == body
+    assert list(dash.networks.clients.iter_events('N_1', 'k1')) == body
+    assert len(scripted.hits('networks/N_1/clients/k1/events')) == 3
+
+
+def test_async_not_modified_after_eviction_fetches_again(scripted):
+    body = [{'id': 'N_1'}]
+    scripted.add('organizations/1/networks', 200, body, {'ETag': '"a"'})
+    scripted.add('organizations/1/networks', 304, headers={'ETag': '"a"'})
+    scripted.add('organizations/1/networks', 200, body, {'ETag': '"a"'})
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None, conditional=EvictingCache()) as dash:
+            return [await dash.organizations.networks('1') for i in range(2)]
+
+    assert asyncio.run(main()) == [body, body]
+
+
+def pages(scripted):
+    '''
+    Three linked pages with validators, then a 304 for each of them
+    '''
+    items = []
+
+    for page in range(3):
+        body = [{'occurredAt': page * 2 + i} for i in range(2)]
+        headers = {'ETag': '"{}"'.format(page)}
+
+        if page < 2:
+            headers['Link'] = '<{{url}}/{}?perPage=2&startingAfter={}>; rel=next'.format(EVENTS, (page + 1) * 2)
+
+        scripted.add(EVENTS, 200, body, headers)
+        items += body
+
+    scripted.add(EVENTS, 304)
+    return items
+
+
+def test_not_modified_pages_keep_their_next_link(scripted):
+    items = pages(scripted)
+    conditional = ConditionalCache()
+    dash = dashboard(scripted.url, conditional=conditional)
+
+    assert list(dash.networks.clients.iter_events('N_1', 'k1', per_page=2)) == items
+    assert list(dash.networks.clients.iter_events('N_1', 'k1', per_page=2)) == items
+    assert conditional.stats.not_modified == 3
+    assert len(scripted.hits(EVENTS)) == 6
+
+
+def test_async_not_modified_pages_keep_their_next_link(scripted):
+    items = pages(scripted)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None, conditional=ConditionalCache()) as dash:
+            return [[item async for item in dash.networks.clients.iter_events('N_1', 'k1', per_page=2)] for i in range(2)]
+
+    assert asyncio.run(main()) == [items, items]
+
+
+def test_paginating_twice_on_the_standin(standin):
+    dash = dashboard(standin.url, conditional=ConditionalCache())
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    serial = dash.networks.devices.list(network)[0]['serial']
+    client = dash.networks.devices.clients.list(serial)[0]['id']
+
+    first = list(dash.networks.clients.iter_events(network, client, per_page=3))
+    second = list(dash.networks.clients.iter_events(network, client, per_page=3))
+
+    assert len(first) == 120
+    assert second == first
+    assert standin.statuses[304] == 40
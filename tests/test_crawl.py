@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+import collections
+
+from meraki import AsyncDashboard
+from meraki.concurrency import FanOut
+
+from conftest import dashboard, org_of
+
+
+def test_crawl_expands_each_level(scripted):
+    scripted.add('organizations/1/networks', 200, [{'id': 'N_1'}, {'id': 'N_2'}])
+    scripted.add('networks/N_1/devices', 200, [{'serial': 'Q2AA'}, {'serial': 'Q2BB'}])
+    scripted.add('networks/N_2/devices', 200, [])
+    scripted.add('networks/N_1/devices/Q2AA/uplink', 200, [{'interface': 'WAN 1'}])
+    scripted.add('networks/N_1/devices/Q2BB/uplink', 200, [])
+    dash = dashboard(scripted.url)
+
+    tasks = list(dash.organizations.crawl('1', depth=3, workers=2))
+    uplinks = dict((task.args, task.result) for task in tasks if task.kind == 'uplink')
+
+    assert collections.Counter(task.kind for task in tasks) == {'networks': 1, 'devices': 2, 'uplink': 2}
+    assert uplinks[('N_1', 'Q2AA')] == [{'interface': 'WAN 1'}]
+
+
+def test_crawl_reaches_every_device_uplink(standin):
+    dash = dashboard(standin.url)
+    crawl = dash.organizations.crawl(org_of(standin), depth=3, workers=4)
+    kinds = collections.Counter(task.kind for task in crawl)
+
+    assert kinds == {'networks': 1, 'devices': 3, 'uplink': 12}
+    assert crawl.failures == []
+    assert crawl.completed == 16
+
+
+def test_crawl_depth_stops_the_expansion(standin):
+    dash = dashboard(standin.url)
+
+    assert [task.kind for task in dash.organizations.crawl(org_of(standin), depth=1)] == ['networks']
+
+
+def test_async_crawl(standin):
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None) as dash:
+            return [task.kind async for task in dash.organizations.crawl(org_of(standin), depth=2, workers=4)]
+
+    assert collections.Counter(asyncio.run(main())) == {'networks': 1, 'devices': 3}
+
+
+def test_failed_calls_are_yielded_and_the_rest_goes_on():
+    def call(value):
+        if value == 2:
+            raise ValueError(value)
+
+        return value
+
+    fanout = FanOut([('call', call, (value,)) for value in range(4)], workers=2)
+    tasks = sorted(fanout, key=lambda task: task.args)
+
+    assert [task.ok for task in tasks] == [True, True, False, True]
+    assert isinstance(tasks[2].error, ValueError)
+    assert fanout.failures == [tasks[2]]
+
+
+def test_http_errors_are_failures(scripted):
+    dash = dashboard(scripted.url)
+    crawl = dash.organizations.crawl('000000', depth=3)
+
+    tasks = list(crawl)
+
+    assert len(tasks) == 1
+    assert crawl.failures == tasks
+    assert tasks[0].error['status'] == 404
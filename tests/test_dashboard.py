@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+import pytest
+
+from meraki import Dashboard, AsyncDashboard, ApiKeyMissing
+
+from conftest import dashboard, org_of
+
+
+def test_every_endpoint_shares_one_transport():
+    dash = Dashboard('test')
+
+    assert dash.organizations._transport is dash.networks._transport
+    assert dash.networks.devices._transport is dash.networks._transport
+    assert dash.organizations.admins._transport is dash.networks._transport
+    assert dash.networks is dash.networks
+
+
+def test_api_key_is_sent(scripted):
+    scripted.add('organizations', 200, [])
+    dashboard(scripted.url).organizations.list()
+
+    assert scripted.hits('organizations')[0][2]['X-Cisco-Meraki-API-Key'] == 'test'
+
+
+def test_keep_alive_can_be_turned_off(scripted):
+    scripted.add('organizations', 200, [])
+    dashboard(scripted.url, keep_alive=False).organizations.list()
+
+    assert scripted.hits('organizations')[0][2]['Connection'] == 'close'
+
+
+def test_api_key_is_required():
+    with pytest.raises(ApiKeyMissing):
+        Dashboard()
+
+
+def test_unknown_endpoint():
+    with pytest.raises(AttributeError):
+        Dashboard('test').nothing
+
+
+def test_async_calls_share_the_session(scripted):
+    scripted.add('organizations/1/networks', 200, [{'id': 'N_1'}, {'id': 'N_2'}])
+    scripted.add('networks/N_1/devices', 200, [{'serial': 'Q2AA'}])
+    scripted.add('networks/N_2/devices', 200, [{'serial': 'Q2BB'}])
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url) as dash:
+            networks = await dash.organizations.networks('1')
+            devices = await asyncio.gather(*[dash.networks.devices.list(network['id']) for network in networks])
+            return dash.networks.devices._transport is dash.organizations._transport, devices
+
+    shared, devices = asyncio.run(main())
+
+    assert shared
+    assert devices == [[{'serial': 'Q2AA'}], [{'serial': 'Q2BB'}]]
+
+
+def test_async_dashboard_has_the_same_endpoints(standin):
+    org = org_of(standin)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None) as dash:
+            networks = await dash.organizations.networks(org)
+            devices = await asyncio.gather(*[dash.networks.devices.list(network['id']) for network in networks])
+            return networks, devices
+
+    networks, devices = asyncio.run(main())
+    sync = dashboard(standin.url)
+
+    assert networks == sync.organizations.networks(org)
+    assert devices == [sync.networks.devices.list(network['id']) for network in networks]
+
+
+def test_throttle_and_redirect_limits(scripted):
+    scripted.add('organizations/1/networks', 429, headers={'Retry-After': '0.01'})
+    scripted.add('organizations/1/licenseState', 302, headers={'Location': '{url}/organizations/1/licenseState'})
+    dash = dashboard(scripted.url, max_throttled=2, max_redirects=3)
+
+    assert dash.organizations.networks('1')['status'] == 429
+    dash.organizations.license_state('1')
+
+    assert len(scripted.hits('organizations/1/networks')) == 3
+    assert len(scripted.hits('organizations/1/licenseState')) == 4
+
+
+def test_async_throttle_and_redirect_limits(scripted):
+    scripted.add('organizations/1/networks', 429, headers={'Retry-After': '0.01'})
+    scripted.add('organizations/1/licenseState', 302, headers={'Location': '{url}/organizations/1/licenseState'})
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None, max_throttled=1, max_redirects=1) as dash:
+            await dash.organizations.license_state('1')
+            return await dash.organizations.networks('1')
+
+    assert asyncio.run(main())['status'] == 429
+    assert len(scripted.hits('organizations/1/networks')) == 2
+    assert len(scripted.hits('organizations/1/licenseState')) == 2
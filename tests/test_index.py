@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+from meraki.index import InventoryIndex
+
+from conftest import dashboard, org_of
+
+
+def test_index_joins_the_sources(scripted):
+    scripted.add('organizations/1/inventory', 200, [{'serial': 'Q2AA', 'mac': 'aa:bb', 'networkId': 'N_1', 'model': 'MR42'}, {'serial': 'Q2BB', 'mac': 'cc:dd', 'networkId': None}])
+    scripted.add('organizations/1/deviceStatuses', 200, [{'serial': 'Q2AA', 'status': 'online'}])
+    scripted.add('organizations/1/networks', 200, [{'id': 'N_1', 'name': 'Lab'}])
+    scripted.add('networks/N_1/devices', 200, [{'serial': 'Q2AA', 'tags': ' lobby '}])
+    dash = dashboard(scripted.url)
+
+    index = dash.organizations.index('1', workers=2)
+
+    assert len(index) == 2
+    assert index['Q2AA']['status'] == 'online'
+    assert index.serials('tag', 'lobby') == {'Q2AA'}
+    assert index.network_of('Q2AA')['name'] == 'Lab'
+    assert index.by_mac('AA:BB')['serial'] == 'Q2AA'
+
+
+def test_index_merges_every_source(standin):
+    dash = dashboard(standin.url)
+    index = dash.organizations.index(org_of(standin), workers=4)
+    network = sorted(index.networks)[0]
+    serial = sorted(index.serials('network', network))[0]
+
+    assert len(index) == 12
+    assert index.failures == []
+    assert index.network_of(serial)['id'] == network
+    assert index.by_mac(index[serial]['mac'].upper())['serial'] == serial
+    # status comes from deviceStatuses, tags from the network device list
+    assert index[serial]['status'] in ('online', 'offline', 'alerting')
+    assert [entry['serial'] for entry in index.find(network=network, tag='floor0')] == [serial]
+
+
+def test_refresh_reports_only_what_changed(standin):
+    dash = dashboard(standin.url)
+    index = dash.organizations.index(org_of(standin), workers=4)
+    network = sorted(index.networks)[0]
+    serial = sorted(index.serials('network', network))[0]
+
+    assert index.refresh().changed == set()
+
+    dash.networks.devices.update(network, serial, {'tags': ' lobby '})
+
+    assert index.refresh().changed == {serial}
+    assert index.serials('tag', 'lobby') == {serial}
+    assert serial not in index.serials('tag', 'floor0')
+
+
+def test_devices_missing_from_the_inventory_are_dropped():
+    index = InventoryIndex()
+    index.update_inventory([{'serial': 'Q2AA', 'mac': 'aa', 'model': 'MR42'}, {'serial': 'Q2BB', 'mac': 'bb', 'model': 'MR42'}])
+
+    assert index.update_inventory([{'serial': 'Q2AA', 'mac': 'aa', 'model': 'MR42'}]) == {'Q2BB'}
+    assert index.serials('model', 'MR42') == {'Q2AA'}
+    assert index.by_mac('bb') is None
+
+
+def test_statuses_of_unknown_devices_are_ignored_once_the_inventory_is_known():
+    index = InventoryIndex()
+    index.update_inventory([{'serial': 'Q2AA', 'mac': 'aa'}])
+
+    assert index.update_statuses([{'serial': 'Q2AA', 'status': 'online'}, {'serial': 'Q2ZZ', 'status': 'online'}]) == {'Q2AA'}
+    assert 'Q2ZZ' not in index
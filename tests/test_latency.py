@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from meraki.latency import bucket_percentiles, merge, LatencyReport
+from meraki.series import LatencyHistory
+
+from conftest import dashboard, org_of
+
+
+def history(t0, counts):
+    return LatencyHistory.from_samples([
+        {'t0': t0 + 300 * i, 't1': t0 + 300 * (i + 1), 'latencyBinsByCategory': {'voiceTraffic': bins}} for i, bins in enumerate(counts)
+    ])
+
+
+def test_bucket_percentiles():
+    bins = [1.0, 2.0, 4.0]
+    result = bucket_percentiles(bins, [[50, 45, 5], [0, 0, 0], [0, 0, 10]], (50, 95, 99))
+
+    assert result[0].tolist() == [1.0, 2.0, 4.0]
+    assert numpy.isnan(result[1]).all()
+    assert result[2].tolist() == [4.0, 4.0, 4.0]
+
+
+def test_merge_sums_series_on_a_common_grid():
+    first = history(0, [{'1.0': 1, '2.0': 1}, {'1.0': 2, '2.0': 0}])
+    second = history(300, [{'2.0': 5, '4.0': 1}])
+
+    bins, times, categories = merge([first, second])
+
+    assert bins.tolist() == [1.0, 2.0, 4.0]
+    assert len(times) == 2
+    assert categories['voiceTraffic'].tolist() == [[1, 1, 0], [2, 5, 1]]
+
+
+def test_report_by_network():
+    report = LatencyReport((50, 99))
+    report.add('N_1', history(0, [{'1.0': 99, '8.0': 1}]))
+    report.add('N_2', history(0, [{'8.0': 10}]))
+    report.add('N_2', None)
+
+    assert report.clients == 3
+    assert report.percentiles('N_1') == {'voiceTraffic': {50: 1.0, 99: 1.0}}
+    assert report.percentiles('N_2') == {'voiceTraffic': {50: 8.0, 99: 8.0}}
+    assert report.percentiles() == {'voiceTraffic': {50: 1.0, 99: 8.0}}
+
+
+def test_network_latency_report(standin):
+    dash = dashboard(standin.url)
+    networks = [network['id'] for network in dash.organizations.networks(org_of(standin))]
+
+    report = dash.networks.latency_report(networks[:2], timespan=3600, workers=4)
+
+    # 4 devices with 5 clients, one of which every device of the network sees
+    assert report.clients == 2 * (4 * 4 + 1)
+    assert report.failures == []
+    assert sorted(report.by_network()) == sorted(networks[:2])
+    assert sorted(report.percentiles()) == ['backgroundTraffic', 'bestEffortTraffic', 'videoTraffic', 'voiceTraffic']
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import socket
+
+from urllib.request import urlopen
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from meraki.metrics import Metrics
+
+from conftest import dashboard
+
+
+def test_calls_are_recorded_by_endpoint(scripted):
+    scripted.add('organizations/1/inventory', 200, [{'serial': 'Q2AA'}])
+    metrics = Metrics()
+    dash = dashboard(scripted.url, metrics=metrics)
+
+    dash.organizations.inventory('1')
+    dash.organizations.inventory('000000')
+
+    endpoint = metrics.get('organizations.inventory')
+
+    assert endpoint.requests == 2
+    assert endpoint.statuses == {200: 1, 404: 1}
+    assert endpoint.bytes > 0
+    # the 404 body is not decoded
+    assert endpoint.decodes == 1
+    assert sum(endpoint.durations) == 2
+
+
+def test_throttled_calls_are_counted(scripted):
+    metrics = Metrics()
+    scripted.add('organizations', 429, headers={'Retry-After': '0.01'})
+    scripted.add('organizations', 200, [])
+    dashboard(scripted.url, metrics=metrics).organizations.list()
+
+    endpoint = metrics.get('organizations')
+
+    assert (endpoint.requests, endpoint.throttled, endpoint.retries) == (1, 1, 1)
+
+
+def test_exceptions_are_counted_by_type():
+    metrics = Metrics()
+    # a port nothing listens on
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    dash = dashboard('http://127.0.0.1:{}/api/v0'.format(port), metrics=metrics, retry=None)
+
+    with pytest.raises(ConnectionError):
+        dash.organizations.license_state('549236')
+
+    assert metrics.get('organizations.licenseState').errors == {'ConnectionError': 1}
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.observe('networks', 'GET', status=200, seconds=0.05)
+    metrics.observe('networks', 'GET', status=200, seconds=0.5)
+    metrics.observe('networks', 'GET', status=500, seconds=5.0)
+    text = metrics.prometheus()
+
+    assert 'meraki_request_duration_seconds_bucket{endpoint="networks",method="GET",le="0.1"} 1' in text
+    assert 'meraki_request_duration_seconds_bucket{endpoint="networks",method="GET",le="1.0"} 2' in text
+    assert 'meraki_request_duration_seconds_bucket{endpoint="networks",method="GET",le="+Inf"} 3' in text
+    assert 'meraki_request_duration_seconds_count{endpoint="networks",method="GET"} 3' in text
+    assert 'meraki_requests_total{endpoint="networks",method="GET",status="500"} 1' in text
+
+
+def test_labels_are_escaped():
+    metrics = Metrics()
+    metrics.observe('a"b\\c', 'GET', status=200)
+
+    assert 'endpoint="a\\"b\\\\c"' in metrics.prometheus()
+
+
+def test_serve():
+    metrics = Metrics()
+    metrics.observe('networks', 'GET', status=200)
+    server = metrics.serve(port=0)
+
+    try:
+        body = urlopen('http://127.0.0.1:{}/metrics'.format(server.server_address[1])).read().decode('utf8')
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert body == metrics.prometheus()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+from meraki import AsyncDashboard
+
+from conftest import dashboard, org_of
+
+EVENTS = 'networks/N_1/clients/k1/events'
+
+
+def pages(scripted, count, size=2):
+    '''
+    Queue count pages of size events, each linking to the next
+    '''
+    items = []
+
+    for page in range(count):
+        body = [{'occurredAt': page * size + i} for i in range(size)]
+        headers = {'Link': '<{{url}}/{}?perPage={}&startingAfter={}>; rel=next'.format(EVENTS, size, (page + 1) * size)} if page < count - 1 else {}
+        scripted.add(EVENTS, 200, body, headers)
+        items += body
+
+    return items
+
+
+def test_iter_follows_every_page(scripted):
+    items = pages(scripted, 3)
+    dash = dashboard(scripted.url)
+
+    assert list(dash.networks.clients.iter_events('N_1', 'k1', per_page=2)) == items
+    assert [seen[1].split('?')[1] for seen in scripted.hits(EVENTS)] == ['perPage=2', 'perPage=2&startingAfter=2', 'perPage=2&startingAfter=4']
+
+
+def test_iter_fetches_a_page_only_when_it_is_reached(scripted):
+    pages(scripted, 3)
+    dash = dashboard(scripted.url)
+    events = dash.networks.clients.iter_events('N_1', 'k1', per_page=2)
+
+    next(events)
+    next(events)
+
+    assert len(scripted.hits(EVENTS)) == 1
+
+    next(events)
+
+    assert len(scripted.hits(EVENTS)) == 2
+
+
+def test_prefetch_yields_the_same_items(scripted):
+    items = pages(scripted, 4)
+    dash = dashboard(scripted.url)
+
+    assert list(dash.networks.clients.iter_events('N_1', 'k1', per_page=2, prefetch=True)) == items
+
+
+def test_iter_on_the_standin(standin):
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    serial = dash.networks.devices.list(network)[0]['serial']
+    client = dash.networks.devices.clients.list(serial)[0]['id']
+
+    history = list(dash.networks.clients.iter_traffic_history(network, client, per_page=50))
+
+    # 240 hours in 5 pages of 50
+    assert len(history) == 240
+    assert len(set((row['ts'], row['application']) for row in history)) == 240
+
+
+def test_async_iter_follows_every_page(scripted):
+    items = pages(scripted, 3)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None) as dash:
+            return [item async for item in dash.networks.clients.iter_events('N_1', 'k1', per_page=2, prefetch=True)]
+
+    assert asyncio.run(main()) == items
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import asyncio
+
+import pytest
+
+from meraki.poller import diff, ADDED, REMOVED, CHANGED
+
+from meraki import AsyncDashboard
+
+from conftest import dashboard, org_of
+
+
+def test_diff():
+    previous = {'Q2AA': {'serial': 'Q2AA', 'status': 'online'}, 'Q2BB': {'serial': 'Q2BB', 'status': 'online'}}
+    current = {'Q2AA': {'serial': 'Q2AA', 'status': 'offline'}, 'Q2CC': {'serial': 'Q2CC', 'status': 'online'}}
+
+    changes = dict((change.serial, change) for change in diff(previous, current))
+
+    assert dict((serial, change.kind) for serial, change in changes.items()) == {'Q2AA': CHANGED, 'Q2BB': REMOVED, 'Q2CC': ADDED}
+    assert changes['Q2AA'].changes == {'status': ('online', 'offline')}
+    assert changes['Q2BB'].status == previous['Q2BB']
+
+
+def test_poll_returns_the_changes_since_the_last_one(scripted):
+    scripted.add('organizations/1/deviceStatuses', 200, [{'serial': 'Q2AA', 'status': 'online'}])
+    scripted.add('organizations/1/deviceStatuses', 200, [{'serial': 'Q2AA', 'status': 'online'}])
+    scripted.add('organizations/1/deviceStatuses', 200, [{'serial': 'Q2AA', 'status': 'offline'}, {'serial': 'Q2BB', 'status': 'online'}])
+    poller = dashboard(scripted.url).organizations.status_poller('1')
+
+    assert poller.poll() == []
+    assert poller.poll() == []
+
+    changes = dict((change.serial, change) for change in poller.poll())
+
+    assert (changes['Q2AA'].kind, changes['Q2BB'].kind) == (CHANGED, ADDED)
+    assert changes['Q2AA'].changes == {'status': ('online', 'offline')}
+
+
+def test_polls_emit_only_what_changed(standin):
+    dash = dashboard(standin.url)
+    org = org_of(standin)
+    poller = dash.organizations.status_poller(org, interval=30.0, min_interval=10.0, max_interval=300.0)
+    serial = sorted(standin.organizations[org].devices)[0]
+
+    assert poller.poll() == []
+    assert poller.poll() == []
+    assert poller.interval == 67.5
+
+    standin.organizations[org].devices[serial]['status'] = 'alerting' if standin.organizations[org].devices[serial]['status'] != 'alerting' else 'online'
+    changes = poller.poll()
+
+    assert [(change.kind, change.serial, list(change.changes)) for change in changes] == [(CHANGED, serial, ['status'])]
+    assert poller.interval == 33.75
+
+
+def test_ignored_fields_are_not_changes(standin):
+    dash = dashboard(standin.url)
+    org = org_of(standin)
+    poller = dash.organizations.status_poller(org, ignore=('lanIp',))
+    serial = sorted(standin.organizations[org].devices)[0]
+
+    poller.poll()
+    standin.organizations[org].devices[serial]['lanIp'] = '10.9.9.9'
+
+    assert poller.poll() == []
+
+
+def test_background_poller_drops_the_oldest_changes(standin):
+    dash = dashboard(standin.url)
+    poller = dash.organizations.status_poller(org_of(standin), interval=0.01, min_interval=0.01, queue_size=4, initial=True).start()
+
+    while poller.polls < 2:
+        time.sleep(0.01)
+
+    poller.stop()
+    changes = list(poller)
+
+    assert len(changes) == 4
+    assert all(change.kind == ADDED for change in changes)
+    assert poller.dropped == 12 - 4
+
+
+def test_a_poller_that_was_not_started(scripted):
+    poller = dashboard(scripted.url).organizations.status_poller('1')
+
+    poller.stop()
+
+    with pytest.raises(RuntimeError):
+        poller.get(timeout=0)
+
+    with pytest.raises(RuntimeError):
+        iter(poller)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None) as dash:
+            poller = dash.organizations.status_poller('1')
+            await poller.stop()
+
+            with pytest.raises(RuntimeError):
+                poller.__aiter__()
+
+    asyncio.run(main())
+    assert scripted.seen == []
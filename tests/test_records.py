@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pickle
+import sys
+
+import pytest
+
+from meraki.records import Device, DeviceStatus, Network
+
+from conftest import dashboard
+
+
+STATUS = {
+    'serial': 'Q2XX-AAAA-BBBB',
+    'status': 'online',
+    'networkId': 'N_1',
+    'publicIp': '203.0.113.1',
+    'extraKey': 1
+}
+
+
+def test_fields_and_dict_access():
+    status = DeviceStatus(STATUS)
+
+    assert status.serial == 'Q2XX-AAAA-BBBB'
+    assert status.network_id == status['networkId'] == 'N_1'
+    assert status.model is None
+    assert status.get('model', 'none') == 'none'
+    assert 'extraKey' in status and 'model' not in status
+    assert status.raw == STATUS
+    assert pickle.loads(pickle.dumps(status)) == status
+
+
+def test_records_are_read_only():
+    status = DeviceStatus(STATUS)
+
+    with pytest.raises(AttributeError):
+        status.status = 'offline'
+
+    with pytest.raises(AttributeError):
+        status.anything = 1
+
+    with pytest.raises(AttributeError):
+        del status.serial
+
+    assert status.status == 'online'
+
+
+def test_lazy_fields_decode_on_access():
+    network = Network({'id': 'N_1', 'productTypes': ['switch', 'wireless']})
+
+    assert network.product_types == ['switch', 'wireless']
+    assert network['productTypes'] == ['switch', 'wireless']
+
+
+def test_only_repeated_values_are_interned():
+    address = ''.join(['1 Main', ' St'])
+    device = Device({'serial': 'Q2AA', 'model': ''.join(['MR', '42']), 'address': address})
+
+    assert device.model is sys.intern('MR42')
+    assert device.address is address
+
+
+def test_endpoints_return_records(scripted):
+    scripted.add('organizations/1/inventory', 200, [{'serial': 'Q2AA', 'mac': 'aa', 'networkId': 'N_1'}, {'serial': 'Q2BB', 'mac': 'bb', 'networkId': None}])
+    dash = dashboard(scripted.url)
+    devices = dash.organizations.inventory('1', records=True)
+
+    assert [type(device) for device in devices] == [Device, Device]
+    assert [device.network_id for device in devices] == ['N_1', None]
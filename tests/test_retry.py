@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import socket
+import asyncio
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from meraki import AsyncDashboard
+from meraki.retry import RetryPolicy, retrying, last_call
+
+from conftest import dashboard, org_of
+
+
+def closed_port():
+    '''
+    URL of a local port nothing listens on
+    '''
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    return 'http://127.0.0.1:{}/api/v0'.format(port)
+
+
+def test_server_errors_are_retried(scripted):
+    scripted.add('organizations', 503)
+    scripted.add('organizations', 200, [])
+    dash = dashboard(scripted.url, retry=RetryPolicy(backoff=0.01))
+
+    assert dash.organizations.list() == []
+    assert (last_call().attempts, last_call().retries, last_call().status) == (2, 1, 200)
+
+
+def test_post_is_only_retried_inside_retrying(scripted):
+    scripted.add('organizations/1/claim', 503)
+    scripted.add('organizations/1/claim', 503)
+    scripted.add('organizations/1/claim', 200, {'serials': ['Q2AA']})
+    dash = dashboard(scripted.url, retry=RetryPolicy(backoff=0.01))
+
+    assert dash.organizations.claim('1', {'serial': 'Q2AA'})['status'] == 503
+    assert last_call().attempts == 1
+
+    with retrying():
+        assert dash.organizations.claim('1', {'serial': 'Q2AA'}) == {'serials': ['Q2AA']}
+
+    assert last_call().attempts == 2
+    assert len(scripted.hits('organizations/1/claim')) == 3
+
+
+def test_attempts_are_bounded(scripted):
+    scripted.add('organizations', 500)
+    dash = dashboard(scripted.url, retry=RetryPolicy(max_attempts=3, backoff=0.01))
+
+    assert dash.organizations.list()['status'] == 500
+    assert last_call().attempts == 3
+    assert len(scripted.hits('organizations')) == 3
+
+
+def test_retries_stop_at_the_time_budget(scripted):
+    scripted.add('organizations', 503)
+    dash = dashboard(scripted.url, retry=RetryPolicy(max_attempts=10, backoff=0.05, jitter=False, budget=0.2))
+    start = time.monotonic()
+
+    assert dash.organizations.list()['status'] == 503
+    # waits 0.05 and 0.1, the next 0.2 would go past the budget
+    assert last_call().attempts == 3
+    assert time.monotonic() - start < 0.5
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = RetryPolicy(backoff=0.5, max_backoff=3.0, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_jitter_stays_within_the_backoff():
+    policy = RetryPolicy(backoff=0.5, max_backoff=3.0)
+    delays = [policy.delay(3) for i in range(200)]
+
+    assert all(0 <= delay <= 2.0 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(0 <= policy.delay(10) <= 3.0 for i in range(200))
+
+
+def test_connection_errors_are_retried():
+    dash = dashboard(closed_port(), retry=RetryPolicy(max_attempts=3, backoff=0.01))
+
+    with pytest.raises(ConnectionError):
+        dash.organizations.list()
+
+    assert last_call().attempts == 3
+    assert isinstance(last_call().error, ConnectionError)
+
+
+def test_connection_errors_are_raised_at_once_without_a_policy():
+    dash = dashboard(closed_port(), retry=None)
+
+    with pytest.raises(ConnectionError):
+        dash.organizations.list()
+
+    assert last_call().attempts == 1
+
+
+def test_throttled_calls_wait_and_count_as_retries(scripted):
+    scripted.add('organizations', 429, headers={'Retry-After': '0.01'})
+    scripted.add('organizations', 200, [])
+    dash = dashboard(scripted.url)
+
+    assert dash.organizations.list() == []
+    assert (last_call().throttled, last_call().retries) == (1, 1)
+
+
+def test_redirect_is_not_an_attempt(sharded):
+    dash = dashboard(sharded.url)
+    serial = next(iter(sharded.organizations[org_of(sharded)].devices))
+
+    assert len(dash.networks.devices.clients.list(serial)) == 5
+
+    stats = last_call()
+    assert stats.redirects == 1
+    assert stats.attempts == 1
+    assert stats.retries == 0
+
+
+def test_redirect_does_not_use_up_attempts(scripted):
+    scripted.add('devices/Q2XX/clients', 302, headers={'Location': '{url}/shard/devices/Q2XX/clients'})
+    scripted.add('shard/devices/Q2XX/clients', 503)
+    scripted.add('shard/devices/Q2XX/clients', 200, [])
+    dash = dashboard(scripted.url, retry=RetryPolicy(max_attempts=2, backoff=0.01))
+
+    assert dash.networks.devices.clients.list('Q2XX') == []
+
+    stats = last_call()
+    assert (stats.attempts, stats.redirects, stats.retries) == (2, 1, 1)
+
+
+def test_async_redirect_is_not_an_attempt(sharded):
+    serial = next(iter(sharded.organizations[org_of(sharded)].devices))
+
+    async def main():
+        async with AsyncDashboard('test', base_url=sharded.url, rate_limit=None) as dash:
+            await dash.networks.devices.clients.list(serial)
+            return last_call()
+
+    stats = asyncio.run(main())
+    assert (stats.attempts, stats.redirects) == (1, 1)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pytest
+
+from meraki.exceptions import ParameterMissing, ParameterUnknown
+from meraki.routes import Route
+
+
+BASE = 'https://api.meraki.com/api/v0'
+UPLINK = Route('networks/{network}/devices/{serial}/uplink')
+HISTORY = Route('networks/{network}/clients/{client}/events', params=('perPage', 'timespan'))
+
+
+def test_url():
+    assert UPLINK.name == 'networks.devices.uplink'
+    assert UPLINK.url(BASE, ('N_1', 'Q2XX-AAAA-BBBB')) == BASE + '/networks/N_1/devices/Q2XX-AAAA-BBBB/uplink'
+    assert UPLINK.url(BASE, ['N_1', 'Q2XX']) == BASE + '/networks/N_1/devices/Q2XX/uplink'
+
+
+def test_values_are_encoded():
+    assert HISTORY.url(BASE, ('N_1', 'aa:bb:cc:dd:ee:ff')) == BASE + '/networks/N_1/clients/aa%3Abb%3Acc%3Add%3Aee%3Aff/events'
+    assert HISTORY.url(BASE, ('N/1', 10)) == BASE + '/networks/N%2F1/clients/10/events'
+
+
+def test_query():
+    url = HISTORY.url(BASE, ('N_1', 'k1'), {'perPage': 10, 'timespan': None})
+    assert url == BASE + '/networks/N_1/clients/k1/events?perPage=10'
+
+    # served from the query cache the second time
+    assert HISTORY.url(BASE, ('N_1', 'k2'), {'perPage': 10, 'timespan': None}) == BASE + '/networks/N_1/clients/k2/events?perPage=10'
+    assert HISTORY.query({'perPage': True}) == 'perPage=true'
+
+
+def test_unhashable_query_value():
+    assert HISTORY.query({'perPage': ['a b']}) == 'perPage=%5B%27a%20b%27%5D'
+
+
+def test_missing_and_unknown():
+    with pytest.raises(ParameterMissing):
+        UPLINK.url(BASE, ('N_1', None))
+
+    with pytest.raises(ParameterMissing):
+        UPLINK.url(BASE, ('N_1',))
+
+    with pytest.raises(ParameterUnknown):
+        HISTORY.url(BASE, ('N_1', 'k1'), {'t0': 1})
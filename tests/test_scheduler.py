@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from meraki.retry import last_call
+from meraki.scheduler import Scheduler, INTERACTIVE, DEFAULT, BULK, lane, current_lane
+from meraki.standin import StandIn
+
+from conftest import dashboard, org_of
+
+
+def test_burst_then_rate():
+    scheduler = Scheduler(rate=20, burst=2)
+    start = time.monotonic()
+
+    for i in range(4):
+        scheduler.acquire('549236')
+
+    # two at once, then two more at 20 per second
+    assert 0.08 <= time.monotonic() - start < 0.5
+
+
+def test_organizations_have_their_own_buckets():
+    scheduler = Scheduler(rate=1, burst=1)
+    scheduler.acquire('549236')
+
+    assert scheduler.acquire('549237') < 0.05
+
+
+def test_interactive_overtakes_bulk():
+    scheduler = Scheduler(rate=10, burst=1)
+    scheduler.acquire('549236')
+    order = []
+
+    def call(name, priority):
+        scheduler.acquire('549236', priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=call, args=('bulk', BULK)) for i in range(3)]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.03)
+    threads.append(threading.Thread(target=call, args=('interactive', INTERACTIVE)))
+    threads[-1].start()
+
+    for thread in threads:
+        thread.join()
+
+    assert order[0] == 'interactive'
+
+
+def test_lane_sets_the_priority_of_the_block():
+    assert current_lane() == DEFAULT
+
+    with lane('bulk'):
+        assert current_lane() == BULK
+
+    assert current_lane() == DEFAULT
+
+
+def test_explicit_priority_wins_over_the_lane():
+    transport = dashboard('https://api.meraki.com/api/v0')._transport
+    url = 'https://api.meraki.com/api/v0/organizations/549236/inventory'
+
+    with lane('bulk'):
+        assert transport._schedule(url, INTERACTIVE) == ('549236', INTERACTIVE)
+        assert transport._schedule(url, None) == ('549236', BULK)
+
+    assert transport._schedule(url, None) == ('549236', DEFAULT)
+
+
+def test_throttle_pauses_the_organization():
+    scheduler = Scheduler(rate=100)
+    scheduler.throttle('549236', 0.2)
+
+    assert scheduler.acquire('549236') >= 0.15
+
+
+def test_interrupted_waiter_leaves_the_queue(monkeypatch):
+    scheduler = Scheduler(rate=5, burst=1)
+    scheduler.acquire('549236')
+
+    def interrupt(timeout=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(scheduler._changed, 'wait', interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.acquire('549236')
+
+    monkeypatch.undo()
+
+    assert scheduler._waiters['549236'] == []
+    assert scheduler.acquire('549236') < 0.5
+
+
+def test_waiters_behind_the_first_do_not_poll():
+    scheduler = Scheduler(rate=10, burst=1)
+    scheduler.acquire('549236')
+    turns = []
+    turn = scheduler._turn
+
+    def counted(key, entry):
+        turns.append(entry)
+        return turn(key, entry)
+
+    scheduler._turn = counted
+    threads = [threading.Thread(target=scheduler.acquire, args=('549236',)) for i in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # 0.4 seconds of waiting, polling every 5 ms would be hundreds of turns
+    assert len(turns) < 40
+
+
+def test_async_waiters_are_woken_in_order():
+    scheduler = Scheduler(rate=20, burst=1)
+    order = []
+
+    async def call(name, priority):
+        await scheduler.acquire_async('549236', priority)
+        order.append(name)
+
+    async def main():
+        await scheduler.acquire_async('549236')
+        bulk = [asyncio.ensure_future(call('bulk', BULK)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        interactive = asyncio.ensure_future(call('interactive', INTERACTIVE))
+        await asyncio.gather(interactive, *bulk)
+
+    start = time.monotonic()
+    asyncio.run(main())
+
+    assert order[0] == 'interactive'
+    assert len(order) == 4
+    assert time.monotonic() - start < 0.5
+
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    scheduler = Scheduler(rate=5, burst=1)
+
+    async def main():
+        await scheduler.acquire_async('549236')
+        waiter = asyncio.ensure_future(scheduler.acquire_async('549236'))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(main())
+
+    assert scheduler._waiters['549236'] == []
+
+
+def test_throttled_call_is_sent_again(scripted):
+    scripted.add('organizations/1/networks', 429, headers={'Retry-After': '0.1'})
+    scripted.add('organizations/1/networks', 200, [])
+    dash = dashboard(scripted.url)
+    start = time.monotonic()
+
+    assert dash.organizations.networks('1') == []
+    assert len(scripted.hits('organizations/1/networks')) == 2
+    assert time.monotonic() - start >= 0.08
+
+
+def test_every_call_succeeds_past_the_server_rate():
+    with StandIn(networks=2, devices=2, clients=2, rate=20) as api:
+        dash = dashboard(api.url)
+        org = org_of(api)
+
+        for i in range(40):
+            assert len(dash.organizations.networks(org)) == 2
+
+        assert api.statuses.get(429)
+        assert api.statuses[200] == 40
+
+
+def test_scheduler_keeps_under_the_server_rate():
+    with StandIn(networks=2, devices=2, clients=2, rate=20) as api:
+        dash = dashboard(api.url, rate_limit=10)
+        org = org_of(api)
+        dash.organizations.list()
+
+        for i in range(15):
+            dash.organizations.networks(org)
+
+        assert 429 not in api.statuses
+        assert last_call().waited > 0
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from meraki import AsyncDashboard
+from meraki.series import LossAndLatency, LatencyHistory, times
+
+from conftest import dashboard
+
+
+def test_columns_by_attribute_and_api_key():
+    series = LossAndLatency.from_samples([
+        {'startTs': '2020-01-01T00:00:00Z', 'endTs': '2020-01-01T00:01:00Z', 'lossPercent': 0.0, 'latencyMs': 18.5},
+        {'startTs': '2020-01-01T00:01:00Z', 'endTs': '2020-01-01T00:02:00Z', 'lossPercent': None, 'latencyMs': 19.0}
+    ])
+
+    assert len(series) == 2
+    assert series.start[1] == numpy.datetime64('2020-01-01T00:01:00', 'ms')
+    assert series['latencyMs'] is series.latency_ms
+    assert numpy.isnan(series.loss_percent[1])
+
+    with pytest.raises(KeyError):
+        series['jitter']
+
+
+def test_epoch_seconds_with_gaps():
+    result = times([1577836800, None, 1577836860.5])
+
+    assert result[0] == numpy.datetime64('2020-01-01T00:00:00', 'ms')
+    assert numpy.isnat(result[1])
+    assert result[2] == numpy.datetime64('2020-01-01T00:01:00.500', 'ms')
+
+
+def test_errors_are_not_wrapped():
+    error = {'status': 404, 'reason': 'Not Found'}
+
+    assert LossAndLatency.wrap(error) is error
+
+
+def test_latency_histograms_with_different_buckets():
+    series = LatencyHistory.from_samples([
+        {'t0': 0, 't1': 300, 'latencyBinsByCategory': {'voiceTraffic': {'1.0': 3, '2.0': 1}}},
+        {'t0': 300, 't1': 600, 'latencyBinsByCategory': {'voiceTraffic': {'2.0': 4, '4.0': 2}, 'videoTraffic': {'1.0': 1}}}
+    ])
+
+    assert series.bins.tolist() == [1.0, 2.0, 4.0]
+    assert numpy.array_equal(series['voiceTraffic'], numpy.array([[3, 1, numpy.nan], [numpy.nan, 4, 2]]), equal_nan=True)
+    assert numpy.isnan(series['videoTraffic'][0]).all()
+
+
+def test_as_arrays_holds_the_same_samples(scripted):
+    samples = [{'startTs': 1700000000 + 60 * i, 'endTs': 1700000060 + 60 * i, 'lossPercent': 0.0, 'latencyMs': 18.0 + i} for i in range(60)]
+    scripted.add('networks/N_1/devices/Q2AA/lossAndLatencyHistory', 200, samples)
+    dash = dashboard(scripted.url)
+
+    series = dash.networks.devices.loss_and_latency('N_1', 'Q2AA', 1700000000, 1700003600, ip='8.8.8.8', as_arrays=True)
+
+    assert len(series) == 60
+    assert series.latency_ms.tolist() == [sample['latencyMs'] for sample in samples]
+    assert series.start[1] == numpy.datetime64(1700000060, 's')
+
+
+def test_samples_are_read_one_at_a_time():
+    read = []
+
+    def samples():
+        for i in range(3):
+            read.append(i)
+            yield {'t0': i, 't1': i + 1, 'latencyBinsByCategory': {'voiceTraffic': {'1.0': i}}}
+
+    series = LatencyHistory.from_samples(samples())
+
+    assert read == [0, 1, 2]
+    assert series['voiceTraffic'].tolist() == [[0], [1], [2]]
+
+
+def test_stream_errors_are_returned(scripted):
+    scripted.add('networks/N_1/devices/Q2AA/lossAndLatencyHistory', 404)
+    dash = dashboard(scripted.url)
+
+    assert dash.networks.devices.loss_and_latency('N_1', 'Q2AA', ip='8.8.8.8', as_arrays=True) == {'status': 404, 'reason': 'Not Found'}
+
+
+def test_async_as_arrays(scripted):
+    samples = [{'startTs': 1700000000 + 60 * i, 'endTs': 1700000060 + 60 * i, 'lossPercent': 0.0, 'latencyMs': 18.0 + i} for i in range(60)]
+    scripted.add('networks/N_1/devices/Q2AA/lossAndLatencyHistory', 200, samples)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=scripted.url, rate_limit=None) as dash:
+            return await dash.networks.devices.loss_and_latency('N_1', 'Q2AA', ip='8.8.8.8', as_arrays=True)
+
+    assert asyncio.run(main()).latency_ms.tolist() == [sample['latencyMs'] for sample in samples]
+
+
+def test_traffic_history_as_arrays_follows_every_page(scripted):
+    path = 'networks/N_1/clients/k1/trafficHistory'
+
+    for page in range(3):
+        headers = {'Link': '<{{url}}/{}?perPage=30&startingAfter={}>; rel=next'.format(path, page + 1)} if page < 2 else {}
+        scripted.add(path, 200, [{'ts': 1700000000 + 30 * page + i, 'application': 'DNS', 'sent': 1, 'recv': 2} for i in range(30)], headers)
+
+    dash = dashboard(scripted.url)
+    series = dash.networks.clients.traffic_history('N_1', 'k1', as_arrays=True)
+
+    assert len(series) == 90
+    assert series.application[89] == 'DNS'
+    assert len(scripted.hits(path)) == 3
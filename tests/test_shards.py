@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pytest
+
+from meraki.retry import last_call
+from meraki.shards import ShardMap
+
+from conftest import Scripted, dashboard, org_of
+
+
+@pytest.fixture
+def shard():
+    server = Scripted().start()
+    yield server
+    server.stop()
+
+
+def test_calls_go_to_the_learned_shard(scripted, shard):
+    scripted.add('organizations/1/networks', 302, headers={'Location': shard.url + '/organizations/1/networks'})
+    shard.add('organizations/1/networks', 200, [{'id': 'N_1', 'organizationId': '1'}])
+    shard.add('organizations/1/licenseState', 200, {'status': 'OK'})
+    shard.add('networks/N_1/devices', 200, [])
+    dash = dashboard(scripted.url)
+
+    assert dash.organizations.networks('1') == [{'id': 'N_1', 'organizationId': '1'}]
+    assert dash.organizations.license_state('1') == {'status': 'OK'}
+    # networks of the organization follow it to the shard
+    assert dash.networks.devices.list('N_1') == []
+    assert len(scripted.seen) == 1
+    assert len(shard.seen) == 3
+
+
+def test_redirect_keeps_method_and_body(scripted, shard):
+    scripted.add('organizations/1/claim', 307, headers={'Location': shard.url + '/organizations/1/claim'})
+    shard.add('organizations/1/claim', 200, {'serials': ['Q2AA']})
+    dash = dashboard(scripted.url)
+
+    assert dash.organizations.claim('1', {'serial': 'Q2AA'}) == {'serials': ['Q2AA']}
+    assert shard.seen[0][0] == 'POST'
+
+
+def test_device_calls_go_to_the_shard_once_the_inventory_is_known(sharded):
+    dash = dashboard(sharded.url)
+    org = org_of(sharded)
+    dash.organizations.list()
+    inventory = dash.organizations.inventory(org)
+
+    dash.networks.devices.clients.list(inventory[0]['serial'])
+
+    assert last_call().redirects == 0
+    assert dash.shards.org(['devices', inventory[0]['serial'], 'clients']) == org
+
+
+def test_device_calls_go_to_the_shard_once_the_network_devices_are_known(sharded):
+    dash = dashboard(sharded.url)
+    org = org_of(sharded)
+    network = dash.organizations.networks(org)[0]['id']
+    devices = dash.networks.devices.list(network)
+
+    dash.networks.devices.clients.list(devices[-1]['serial'])
+
+    assert last_call().redirects == 0
+
+
+def test_a_listing_is_walked_once(scripted):
+    scripted.add('organizations/1/deviceStatuses', 200, [{'serial': 'Q2AA', 'networkId': 'N_1'}, {'serial': 'Q2BB'}])
+    dash = dashboard(scripted.url)
+    bound = []
+    bind_device = dash.shards.bind_device
+    dash.shards.bind_device = lambda serial, *args: bound.append(serial) or bind_device(serial, *args)
+
+    for i in range(3):
+        dash.organizations.device_statuses('1')
+
+    assert bound == ['Q2AA', 'Q2BB']
+    assert dash.shards.org(['devices', 'Q2BB']) == '1'
+
+
+def test_devices_share_their_organization_rate_bucket():
+    shards = ShardMap('https://api.meraki.com/api/v0')
+    shards.bind_device('Q2AA', network='N_1')
+    shards.bind_device('Q2BB', org='549236')
+
+    assert shards.org(['devices', 'Q2AA', 'clients']) is None
+
+    shards.bind('N_1', '549236')
+
+    assert shards.org(['devices', 'Q2AA', 'clients']) == '549236'
+    assert shards.org(['devices', 'Q2BB', 'clients']) == '549236'
+
+    # a device list, which only carries the network, keeps the known organization
+    shards.bind_device('Q2BB', network='N_2')
+    assert shards.org(['devices', 'Q2BB', 'clients']) == '549236'
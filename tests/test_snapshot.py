@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import asyncio
+
+from meraki import AsyncDashboard
+from meraki.cache import ConditionalCache
+from meraki.snapshot import SnapshotStore
+
+from conftest import dashboard, org_of
+
+
+def network_of(api):
+    return next(iter(api.organizations[org_of(api)].networks))
+
+
+def test_snapshot_answers_then_revalidates(scripted):
+    body = [{'id': 'N_1'}]
+    scripted.add('organizations/1/networks', 200, body, {'ETag': '"a"'})
+    scripted.add('organizations/1/networks', 304, headers={'ETag': '"a"'})
+    snapshot = SnapshotStore(':memory:', refresh=0)
+    dash = dashboard(scripted.url, snapshot=snapshot)
+
+    first = dash.organizations.networks('1')
+    second = dash.organizations.networks('1')
+    dash.close()
+
+    assert first == second == body
+    assert snapshot.stats.served == 1
+    # answered from the snapshot, then revalidated in the background with a 304
+    assert snapshot.stats.not_modified == 1
+    assert scripted.hits('organizations/1/networks')[1][2]['If-None-Match'] == '"a"'
+
+
+def test_snapshot_survives_a_new_dashboard(scripted, tmp_path):
+    scripted.add('organizations/1/networks', 200, [{'id': 'N_1'}])
+    path = str(tmp_path / 'snapshot.db')
+
+    dashboard(scripted.url, snapshot=SnapshotStore(path)).organizations.networks('1')
+    snapshot = SnapshotStore(path)
+
+    assert dashboard(scripted.url, snapshot=snapshot).organizations.networks('1') == [{'id': 'N_1'}]
+    assert snapshot.stats.served == 1
+
+
+def test_not_modified_keeps_the_snapshot_body(standin):
+    snapshot = SnapshotStore(':memory:')
+    conditional = ConditionalCache()
+    dash = dashboard(standin.url, conditional=conditional, snapshot=snapshot)
+    network = network_of(standin)
+
+    expected = dash.networks.list(network)
+    # drops networks/N from the snapshot, the conditional cache still has it
+    dash.ssids.update(network, 0, update={'name': 'renamed'})
+
+    assert dash.networks.list(network) == expected
+    assert conditional.stats.not_modified == 1
+    assert all(size > 0 for key, name, fetched, size in snapshot.resources())
+    assert dash.networks.list(network) == expected
+
+
+def test_async_not_modified_keeps_the_snapshot_body(standin):
+    snapshot = SnapshotStore(':memory:')
+    network = network_of(standin)
+
+    async def main():
+        async with AsyncDashboard('test', base_url=standin.url, rate_limit=None, conditional=ConditionalCache(), snapshot=snapshot) as dash:
+            first = await dash.networks.list(network)
+            await dash.ssids.update(network, 0, update={'name': 'renamed'})
+            return first, await dash.networks.list(network), await dash.networks.list(network)
+
+    first, second, third = asyncio.run(main())
+    assert first == second == third
+
+
+def test_writes_invalidate_the_snapshot(scripted):
+    scripted.add('networks/N_1', 200, {'id': 'N_1', 'name': 'a'})
+    scripted.add('networks/N_1', 200, {'id': 'N_1', 'name': 'renamed'})
+    snapshot = SnapshotStore(':memory:')
+    dash = dashboard(scripted.url, snapshot=snapshot)
+
+    dash.networks.list('N_1')
+    dash.networks.update('N_1', name='renamed')
+
+    assert dash.networks.list('N_1')['name'] == 'renamed'
+    assert snapshot.stats.invalidations >= 1
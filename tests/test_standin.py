@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+from meraki.cache import ConditionalCache
+from meraki.standin import declared
+
+from conftest import dashboard, org_of
+
+DAY = 86400
+
+
+def ids(dash, api):
+    org = org_of(api)
+    network = dash.organizations.networks(org)[0]['id']
+    serial = dash.networks.devices.list(network)[0]['serial']
+    client = dash.networks.devices.clients.list(serial)[0]['id']
+
+    return org, network, serial, client
+
+
+def test_every_declared_route_has_a_handler(standin):
+    assert 'networks/{network}/clients/{client}/securityEvents' in declared()
+    assert standin.generic == []
+
+
+def test_client_routes(standin):
+    dash = dashboard(standin.url)
+    org, network, serial, client = ids(dash, standin)
+    clients = dash.networks.clients
+
+    assert clients.security_events(network, client, timespan=7200)[0]['eventType'] == 'IDS Alert'
+    assert clients.policy(network, client, device_policy='Blocked')['type'] == 'Blocked'
+    assert clients.splash_auth_status(network, client) == {'ssids': {}}
+
+    status = clients.splash_auth_status(network, client, ssid='0', is_authorized=True)
+
+    assert status['ssids']['0']['isAuthorized'] is True
+    assert clients.splash_auth_status(network, client)['ssids']['0']['isAuthorized'] is True
+    assert clients.provision(network, mac='00:11:22:33:44:55', device_policy='Normal')['mac'] == '00:11:22:33:44:55'
+
+
+def test_network_routes(standin):
+    dash = dashboard(standin.url)
+    org, network, serial, client = ids(dash, standin)
+    networks = dash.networks
+
+    assert [row['application'] for row in networks.traffic(network, timespan=7200)][0] == 'Google HTTPS'
+    assert networks.air_marshal(network)[0]['bssids'][0]['detectedBy'][0]['device'] == serial
+    assert networks.access_polices(network)[0]['number'] == 1
+    assert networks.bluetooth_settings(network)['scanningEnabled'] is False
+    assert networks.bluetooth_settings(network, scanning_enabled=True)['scanningEnabled'] is True
+    assert networks.bluetooth_settings(network)['scanningEnabled'] is True
+    assert networks.alert_settings(network)['alerts'] == []
+
+    beacon = networks.bluetooth_clients(network)[0]
+
+    assert networks.bluetooth_clients(network, beacon['id'], include_connectivity_history=True)['connectivityHistory']
+
+    created = networks.create('Lab', type=['wireless'], org=org)
+
+    assert networks.list(created['id'])['name'] == 'Lab'
+
+    networks.bind_template(created['id'], config_template='L_1')
+    assert networks.list(created['id'])['configTemplateId'] == 'L_1'
+
+    networks.delete(created['id'])
+    assert created['id'] not in [found['id'] for found in dash.organizations.networks(org)]
+
+
+def test_device_routes(standin):
+    dash = dashboard(standin.url)
+    org, network, serial, client = ids(dash, standin)
+    devices = dash.networks.devices
+
+    assert devices.lldp_cdp(network, serial)['sourceMac'] == devices.list(network, serial)['mac']
+
+    devices.remove(network, serial)
+    assert serial not in [device['serial'] for device in devices.list(network)]
+
+    devices.claim(network, serial)
+    assert serial in [device['serial'] for device in devices.list(network)]
+
+
+def test_organization_routes(standin):
+    dash = dashboard(standin.url)
+    org = org_of(standin)
+    organizations = dash.organizations
+
+    assert organizations.claim(org, {'serial': 'Q2XX-0000-0001'})['serials'] == ['Q2XX-0000-0001']
+    assert organizations.update(org, {'name': 'Renamed'})['name'] == 'Renamed'
+
+    clone = organizations.clone(org, {'name': 'Clone'})
+
+    assert clone['name'] == 'Clone'
+    assert len(organizations.networks(clone['id'])) == len(organizations.networks(org))
+
+
+def test_security_events_are_paged(standin):
+    dash = dashboard(standin.url)
+    org, network, serial, client = ids(dash, standin)
+
+    events = list(dash.networks.clients.iter_security_events(network, client, timespan=86400, per_page=7))
+
+    assert len(events) in (23, 24)
+    assert len(dash.networks.clients.security_events(network, client, timespan=86400, per_page=7)) == 7
+    assert events == sorted(events, key=lambda event: event['ts'])
+
+
+def test_bluetooth_clients_are_paged(standin):
+    dash = dashboard(standin.url)
+    org, network, serial, client = ids(dash, standin)
+
+    beacons = list(dash.networks.iter_bluetooth_clients(network, per_page=7))
+
+    # clients_per_device for every device of the network
+    assert len(beacons) == 4 * 5
+    assert len(set(beacon['id'] for beacon in beacons)) == len(beacons)
+    assert len(dash.networks.bluetooth_clients(network, per_page=7)) == 7
+
+
+def test_organization_of_the_requested_size(standin):
+    dash = dashboard(standin.url)
+    org = org_of(standin)
+    networks = dash.organizations.networks(org)
+
+    assert len(networks) == 3
+    assert [len(dash.networks.devices.list(network['id'])) for network in networks] == [4, 4, 4]
+    assert len(dash.organizations.inventory(org)) == 12
+
+
+def test_reads_are_revalidated_with_their_etag(standin):
+    conditional = ConditionalCache()
+    dash = dashboard(standin.url, conditional=conditional)
+    org = org_of(standin)
+
+    first = dash.organizations.inventory(org)
+    second = dash.organizations.inventory(org)
+
+    assert second == first
+    assert conditional.stats.not_modified == 1
+    assert standin.statuses == {200: 1, 304: 1}
+
+
+def test_history_longer_than_the_server_span_is_rejected(standin):
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    serial = dash.networks.devices.list(network)[0]['serial']
+    t1 = 1700000000
+
+    assert dash.networks.devices.loss_and_latency(network, serial, t1 - 31 * DAY, t1, ip='8.8.8.8')['status'] == 400
+    assert len(dash.networks.devices.loss_and_latency(network, serial, t1 - 3600, t1, ip='8.8.8.8')) == 60
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import json
+
+import pytest
+
+from meraki.records import Device
+from meraki.streaming import ArrayStream
+
+from conftest import dashboard, org_of
+
+
+def parse(content, size):
+    parser = ArrayStream()
+    items = []
+
+    for start in range(0, len(content), size):
+        items += parser.feed(content[start:start + size])
+
+    return items + parser.close()
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, 4096])
+def test_any_chunking_gives_the_whole_array(size):
+    value = [{'name': 'café ☕', 'tags': [1, 2]}, 12345, -0.5, 'x', None, True, [], {}]
+    content = json.dumps(value, ensure_ascii=False).encode('utf8')
+
+    assert parse(content, size) == value
+
+
+def test_numbers_cut_by_a_chunk_are_not_shortened():
+    parser = ArrayStream()
+
+    assert parser.feed(b'[12') == []
+    assert parser.feed(b'34, 5') == [1234]
+    assert parser.feed(b'6]') == [56]
+    assert parser.close() == []
+
+
+def test_empty_body_is_an_empty_array():
+    assert parse(b'', 10) == []
+    assert parse(b' [ ] ', 1) == []
+
+
+@pytest.mark.parametrize('content', [b'[1, 2', b'{"a": 1}', b'[1] 2'])
+def test_malformed_arrays_raise(content):
+    with pytest.raises(ValueError):
+        parse(content, 3)
+
+
+def test_iter_inventory_streams_the_response(scripted):
+    inventory = [{'serial': 'Q2XX-{:04d}'.format(i), 'networkId': 'N_1', 'tags': ' a b '} for i in range(500)]
+    scripted.add('organizations/1/inventory', 200, inventory)
+    dash = dashboard(scripted.url)
+
+    assert list(dash.organizations.iter_inventory('1')) == inventory
+
+
+def test_streamed_inventory_matches_the_decoded_one(standin):
+    dash = dashboard(standin.url)
+    org = org_of(standin)
+    inventory = dash.organizations.inventory(org)
+
+    assert list(dash.organizations.iter_inventory(org)) == inventory
+    assert [device.serial for device in dash.organizations.iter_inventory(org, records=True)] == [device['serial'] for device in inventory]
+    assert all(isinstance(device, Device) for device in dash.organizations.iter_inventory(org, records=True))
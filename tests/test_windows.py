@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from __future__ import print_function
+
+import pytest
+
+from meraki.windows import windows, stitch, MAX_SPAN
+
+from conftest import dashboard, org_of
+
+DAY = 86400
+
+
+@pytest.mark.parametrize('t0, t1, span, align', [
+    (0, 70 * DAY, MAX_SPAN, 1),
+    (1000, 70 * DAY + 7, MAX_SPAN, 600),
+    (59, 3 * 3600, 3600, 7),
+    (5, 6, MAX_SPAN, 60)
+])
+def test_windows_cover_the_range(t0, t1, span, align):
+    result = windows(t0, t1, span, align)
+
+    assert result[0][0] == t0 and result[-1][1] == t1
+    assert all(end == start for (_, end), (start, _) in zip(result, result[1:]))
+    assert all(0 < end - start <= span for start, end in result)
+    assert all(end % align == 0 for start, end in result[:-1])
+
+
+def test_empty_range():
+    assert windows(10, 10) == []
+
+
+def test_stitch_drops_boundary_duplicates_and_orders():
+    parts = [[{'ts': 2}, {'ts': 3}], [{'ts': 1}], [{'ts': 3}, {'ts': 4}]]
+
+    assert [sample['ts'] for sample in stitch(parts, 'ts')] == [1, 2, 3, 4]
+
+
+def test_range_past_the_server_limit(standin):
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    devices = [(network, device['serial']) for device in dash.networks.devices.list(network)[:2]]
+    t0 = 1700000000 - 1700000000 % 3600
+    t1 = t0 + 70 * DAY
+
+    result = dash.networks.devices.loss_and_latency_range(devices, t0, t1, resolution=3600, ip='8.8.8.8', workers=4)
+
+    assert result.ok
+    assert len(result) == 2
+
+    for device in devices:
+        stamps = [sample['startTs'] for sample in result[device]]
+
+        # one sample an hour, none lost or repeated at a window boundary
+        assert len(stamps) == 70 * 24
+        assert stamps == sorted(set(stamps))
+
+
+def test_series_with_a_failed_window_is_left_out(standin):
+    dash = dashboard(standin.url)
+    network = dash.organizations.networks(org_of(standin))[0]['id']
+    serial = dash.networks.devices.list(network)[0]['serial']
+    now = 1700000000
+
+    result = dash.networks.devices.loss_and_latency_range([(network, serial), (network, 'Q2XX-MISSING')], now - 40 * DAY, now, resolution=3600, ip='8.8.8.8')
+
+    assert not result.ok
+    assert (network, serial) in result
+    assert result.incomplete == {(network, 'Q2XX-MISSING')}